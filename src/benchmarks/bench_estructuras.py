@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from Estructuras import ListaOrdenada, ColaPrioridad, Cola, Pila
+
+TAMANOS = [100, 1000, 3000]
+
+def datos_aleatorios(n: int):
+    rng = random.Random(n)
+    return [rng.randrange(10 * n) for _ in range(n)]
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_lista_ordenada_add(benchmark, n):
+    datos = datos_aleatorios(n)
+
+    def construir():
+        lista = ListaOrdenada.of(lambda x: x)
+        for e in datos:
+            lista.add(e)
+        return lista
+    lista = benchmark(construir)
+    assert lista.size == n
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_cola_prioridad_add(benchmark, n):
+    datos = datos_aleatorios(n)
+
+    def construir():
+        cola = ColaPrioridad()
+        for i, p in enumerate(datos):
+            cola.add(i, p)
+        return cola
+    cola = benchmark(construir)
+    assert cola.size == n
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_cola_prioridad_remove(benchmark, n):
+    datos = datos_aleatorios(n)
+
+    def preparar():
+        cola = ColaPrioridad()
+        for i, p in enumerate(datos):
+            cola.add(i, p)
+        return (cola,), {}
+    eliminados = benchmark.pedantic(lambda cola: cola.remove_all(), setup=preparar, rounds=20)
+    assert len(eliminados) == n
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_cola_prioridad_decrease_priority(benchmark, n):
+    datos = datos_aleatorios(n)
+
+    def preparar():
+        cola = ColaPrioridad()
+        for i, p in enumerate(datos):
+            cola.add(i, p)
+        return (cola,), {}
+
+    def disminuir(cola):
+        for i in range(0, n, 10):
+            cola.decrease_priority(i, -i)
+        return cola
+    cola = benchmark.pedantic(disminuir, setup=preparar, rounds=20)
+    assert cola.size == n
+
+@pytest.mark.parametrize("clase", [Cola, Pila], ids=["Cola", "Pila"])
+@pytest.mark.parametrize("n", TAMANOS)
+def test_agregado_add_remove(benchmark, clase, n):
+    datos = datos_aleatorios(n)
+
+    def llenar_y_vaciar():
+        agregado = clase.of()
+        agregado.add_all(datos)
+        return agregado.remove_all()
+    eliminados = benchmark(llenar_y_vaciar)
+    assert len(eliminados) == n
@@ -0,0 +1,102 @@
+import os
+import random
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from funciones.newton import newton_raphson
+from funciones.frecuencias import contar_palabras, contar_palabras_paralelo, mas_comunes
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS, TOKENIZADOR_PALABRAS, TOKENIZADOR_UNICODE
+
+PUNTOS_INICIALES = [10**4, 10**5, 10**6]
+
+@pytest.mark.parametrize("n", PUNTOS_INICIALES)
+def test_newton_raphson_throughput(benchmark, n):
+    x0 = np.random.default_rng(n).uniform(-10, 10, n)
+    resultado = benchmark.pedantic(newton_raphson, args=(lambda x: 2*x**2 + 2*x - 3, x0, lambda x: 4*x + 2),
+                                   rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["puntos_por_segundo"] = n / benchmark.stats.stats.mean
+    assert resultado.todas_convergidas
+
+@pytest.mark.parametrize("n", PUNTOS_INICIALES)
+def test_newton_raphson_derivada_numerica_throughput(benchmark, n):
+    x0 = np.random.default_rng(n).uniform(0, 3, n)
+    resultado = benchmark.pedantic(newton_raphson, args=(np.cos, x0), kwargs={"intervalo": (0, 3)}, rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["puntos_por_segundo"] = n / benchmark.stats.stats.mean
+    assert resultado.todas_convergidas
+
+TAMANOS_MB = [1, 10, 50]
+VOCABULARIO = ["codigo", "python", "software", "salud", "proyecto", "futuro", "tecnología", "¿qué?", "año,", "Niño."]
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """
+    Devuelve una función que genera (una sola vez por tamaño) un fichero de texto de unos n MB.
+    """
+    generados = {}
+
+    def generar(mb: int) -> str:
+        if mb not in generados:
+            ruta = str(tmp_path_factory.mktemp("corpus") / f"corpus_{mb}mb.txt")
+            rng = random.Random(mb)
+            linea_por_mb = (1 << 20) // 80
+            with open(ruta, "w", encoding="utf-8") as file:
+                for _ in range(mb * linea_por_mb):
+                    file.write(" ".join(rng.choices(VOCABULARIO, k=10)) + "\n")
+            generados[mb] = ruta
+        return generados[mb]
+    return generar
+
+def memoria_maxima_mb(codigo: str) -> float:
+    """
+    Ejecuta el código en un proceso nuevo y devuelve su pico de memoria residente en MB.
+    """
+    src = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    programa = codigo + "\nimport resource; print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+    salida = subprocess.run([sys.executable, "-c", programa], cwd=src, capture_output=True, text=True, check=True)
+    return int(salida.stdout.split()[-1]) / 1024
+
+@pytest.mark.parametrize("mb", TAMANOS_MB)
+def test_contar_palabras_streaming(benchmark, corpus, mb):
+    ruta = corpus(mb)
+    contador = benchmark.pedantic(contar_palabras, args=(ruta,), rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["mb_por_segundo"] = os.path.getsize(ruta) / (1 << 20) / benchmark.stats.stats.mean
+    benchmark.extra_info["pico_rss_mb"] = memoria_maxima_mb(
+        f"from funciones.frecuencias import contar_palabras; contar_palabras({ruta!r})")
+    benchmark.extra_info["pico_rss_mb_fichero_completo"] = memoria_maxima_mb(
+        f"import string; from collections import Counter; "
+        f"Counter(open({ruta!r}, encoding='utf-8').read().lower()"
+        f".translate(str.maketrans('', '', string.punctuation)).split())")
+    assert mas_comunes(contador, 5)
+
+@pytest.mark.parametrize("procesos", sorted({1, 2, 4, os.cpu_count() or 1}))
+def test_contar_palabras_paralelo_escalado(benchmark, corpus, procesos):
+    ruta = corpus(50)
+    contador = benchmark.pedantic(contar_palabras_paralelo, args=(ruta, procesos), kwargs={"tam_trozo": 4 << 20},
+                                  rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["mb_por_segundo"] = os.path.getsize(ruta) / (1 << 20) / benchmark.stats.stats.mean
+    benchmark.extra_info["nucleos"] = os.cpu_count()
+    assert mas_comunes(contador, 5) == mas_comunes(contar_palabras(ruta), 5)
+
+TOKENIZADORES = {"espacios": TOKENIZADOR_ESPACIOS, "palabras": TOKENIZADOR_PALABRAS, "unicode": TOKENIZADOR_UNICODE}
+
+@pytest.mark.parametrize("nombre", TOKENIZADORES)
+def test_tokenizador_tokens_por_segundo(benchmark, corpus, nombre):
+    ruta = corpus(10)
+
+    def contar_tokens() -> int:
+        with open(ruta, "r", encoding="utf-8") as file:
+            return sum(len(palabras) for palabras in TOKENIZADORES[nombre].bloques(file))
+    num_tokens = benchmark.pedantic(contar_tokens, rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["tokens_por_segundo"] = num_tokens / benchmark.stats.stats.mean
+        benchmark.extra_info["mb_por_segundo"] = os.path.getsize(ruta) / (1 << 20) / benchmark.stats.stats.mean
+    assert num_tokens > 0
@@ -0,0 +1,297 @@
+import threading
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from cache import CacheCaminos
+from concurrente import GrafoConcurrente
+from distribuido import GrafoDistribuido
+from externo import GrafoExterno
+from grafo import Grafo
+from instrumentacion import Instrumentacion
+from recorridos import bfs
+import recorridos
+from red_social import Red_social
+from defensa_3 import RedGenica
+
+TAMANOS = [1000, 10000, 100000]
+
+@pytest.fixture(scope="module")
+def redes(ficheros_red_social):
+    """
+    Redes sociales ya cargadas, una por tamaño, compartidas por los benchmarks de consulta.
+    """
+    cargadas = {}
+
+    def red(num_aristas: int) -> Red_social:
+        if num_aristas not in cargadas:
+            cargadas[num_aristas] = Red_social.parse(*ficheros_red_social(num_aristas))
+        return cargadas[num_aristas]
+    return red
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_grafo_add_edge(benchmark, n):
+    aristas = [(i % (n // 10), (i * 7) % (n // 10), i) for i in range(n)]
+
+    def construir():
+        grafo = Grafo.of(es_dirigido=True)
+        for origen, destino, peso in aristas:
+            grafo.add_edge(origen, destino, peso)
+        return grafo
+    grafo = benchmark(construir)
+    assert len(grafo.vertices()) > 0
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_grafo_predecessors(benchmark, redes, n):
+    red = redes(n)
+    vertice = next(iter(red.adyacencias))
+    predecesores = benchmark(red.predecessors, vertice)
+    assert predecesores == red.successors(vertice)  # La red es no dirigida
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_grafo_subgraph(benchmark, redes, n):
+    red = redes(n)
+    vertices = set(list(red.adyacencias)[:len(red.adyacencias) // 2])
+    subgrafo = benchmark(red.subgraph, vertices)
+    assert subgrafo.vertices() == vertices
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_bfs(benchmark, redes, n):
+    red = redes(n)
+    usuarios = list(red.adyacencias)
+    camino = benchmark(bfs, red, usuarios[0], usuarios[-1])
+    assert not camino or camino[0] == usuarios[0]
+
+def consultas_populares(red: Red_social, num_consultas: int = 60) -> list:
+    """
+    Pares (origen, destino) en los que unos pocos usuarios populares aparecen casi siempre.
+    """
+    usuarios = list(red.adyacencias)
+    populares = usuarios[:5]
+    return [(populares[i % len(populares)], usuarios[(i * 7919) % len(usuarios)] if i % 3 else populares[(i + 1) % 5])
+            for i in range(num_consultas)]
+
+@pytest.mark.parametrize("n", TAMANOS)
+@pytest.mark.parametrize("modo", ["sin_cache", "cache", "cache_sin_arboles"])
+def test_bfs_consultas_repetidas(benchmark, redes, n, modo):
+    red = redes(n)
+    pares = consultas_populares(red)
+
+    def consultar():
+        if modo == "sin_cache":
+            return [bfs(red, origen, destino) for origen, destino in pares]
+        cache = CacheCaminos.of(red, umbral_arbol=3 if modo == "cache" else None)
+        caminos = [cache.camino(origen, destino) for origen, destino in pares]
+        benchmark.extra_info["estadisticas"] = cache.estadisticas
+        return caminos
+    caminos = benchmark.pedantic(consultar, rounds=3)
+    assert caminos[:10] == [bfs(red, origen, destino) for origen, destino in pares[:10]]
+
+@pytest.mark.parametrize("particionador", ["hash", "propagacion"])
+@pytest.mark.parametrize("num_procesos", [1, 2, 4])
+def test_bfs_distribuido(benchmark, redes, num_procesos, particionador):
+    red = redes(100000)
+    usuarios = list(red.adyacencias)
+    with GrafoDistribuido.of(red, num_procesos, particionador) as grafo:
+        camino = benchmark(grafo.bfs, usuarios[0], usuarios[-1])
+        assert camino == bfs(red, usuarios[0], usuarios[-1])
+        benchmark.extra_info["aristas_cortadas"] = grafo.aristas_cortadas
+        benchmark.extra_info["niveles"] = [(nivel.frontera, nivel.candidatos_remotos, nivel.bytes_enviados)
+                                           for nivel in grafo.niveles]
+
+# Instrumentación desactivada (creada pero sin sustituir nada), activa midiendo todas las llamadas y
+# activa midiendo una de cada 100
+MODOS_INSTRUMENTACION = {"desactivada": None, "activa": 1, "muestreo": 100}
+
+def instrumentacion(modo: str) -> Instrumentacion:
+    muestreo = MODOS_INSTRUMENTACION[modo]
+    medida = Instrumentacion.of(muestreo or 1)
+    if muestreo is not None:
+        medida.activar()
+    return medida
+
+@pytest.mark.parametrize("modo", MODOS_INSTRUMENTACION)
+def test_instrumentacion_bfs(benchmark, redes, modo):
+    red = redes(100000)
+    usuarios = list(red.adyacencias)
+    medida = instrumentacion(modo)
+    try:
+        camino = benchmark(recorridos.bfs, red, usuarios[0], usuarios[-1])
+    finally:
+        medida.desactivar()
+    assert camino == bfs(red, usuarios[0], usuarios[-1])
+    if modo != "desactivada":
+        consulta = medida.snapshot()['consultas']['bfs']
+        assert consulta['vertices_expandidos'] > 0
+        benchmark.extra_info["vertices_expandidos_por_consulta"] = consulta['vertices_expandidos'] / consulta['consultas']
+
+@pytest.mark.parametrize("modo", MODOS_INSTRUMENTACION)
+def test_instrumentacion_parse(benchmark, ficheros_red_social, modo):
+    f_usuarios, f_relaciones = ficheros_red_social(100000)
+    medida = instrumentacion(modo)
+    try:
+        red = benchmark.pedantic(Red_social.parse, args=(f_usuarios, f_relaciones), rounds=3)
+    finally:
+        medida.desactivar()
+    assert len(red.usuarios_dni) == 10000
+    llamadas = medida.snapshot().get('Red_social.parse', {'llamadas': 0})['llamadas']
+    assert llamadas == 0 if modo == "desactivada" else llamadas >= 1
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_red_social_parse(benchmark, ficheros_red_social, n):
+    f_usuarios, f_relaciones = ficheros_red_social(n)
+    red = benchmark.pedantic(Red_social.parse, args=(f_usuarios, f_relaciones), rounds=3)
+    assert len(red.usuarios_dni) == n // 10
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_red_genica_parse(benchmark, ficheros_red_genica, n):
+    f_genes, f_relaciones = ficheros_red_genica(n)
+    red = benchmark.pedantic(RedGenica.parse, args=(f_genes, f_relaciones), rounds=3)
+    assert len(red.genes_por_nombre) == n // 10
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_grafo_externo_construir(benchmark, ficheros_red_social, tmp_path, n):
+    f_usuarios, f_relaciones = ficheros_red_social(n)
+    grafo = benchmark.pedantic(GrafoExterno.construir, args=(f_relaciones, str(tmp_path), f_usuarios),
+                               kwargs={'memoria_mb': 1}, rounds=3)
+    assert grafo.num_vertices == n // 10
+    vertices = grafo.vertices()
+    assert len(vertices) == n // 10 and next(iter(vertices)) in vertices
+
+@pytest.mark.parametrize("n", TAMANOS)
+def test_grafo_externo_bfs(benchmark, redes, ficheros_red_social, tmp_path, n):
+    red = redes(n)
+    f_usuarios, f_relaciones = ficheros_red_social(n)
+    grafo = GrafoExterno.construir(f_relaciones, str(tmp_path), f_usuarios)
+    usuarios = list(red.adyacencias)
+    camino = benchmark(bfs, grafo, usuarios[0].dni, usuarios[-1].dni)
+    assert len(camino) == len(bfs(red, usuarios[0], usuarios[-1]))
+    benchmark.extra_info["tasa_aciertos_cache"] = grafo.estadisticas_cache['tasa_aciertos']
+
+TAMANOS_DAG = [10000, 1000000]
+
+@pytest.fixture(scope="module")
+def redes_dag(ficheros_red_genica):
+    """
+    Redes génicas dirigidas y sin ciclos, una por tamaño.
+    """
+    cargadas = {}
+
+    def red(num_aristas: int) -> RedGenica:
+        if num_aristas not in cargadas:
+            cargadas[num_aristas] = RedGenica.parse(*ficheros_red_genica(num_aristas, aciclica=True), es_dirigido=True)
+        return cargadas[num_aristas]
+    return red
+
+@pytest.mark.parametrize("n", TAMANOS_DAG)
+def test_orden_topologico(benchmark, redes_dag, n):
+    red = redes_dag(n)
+
+    def ordenar():
+        return red.analisis_dag().orden_topologico()
+    orden = benchmark.pedantic(ordenar, rounds=3)
+    posiciones = {gen: i for i, gen in enumerate(orden)}
+    assert all(posiciones[origen] < posiciones[destino] for origen in red.adyacencias for destino in red.adyacencias[origen])
+
+@pytest.mark.parametrize("n", TAMANOS_DAG)
+@pytest.mark.parametrize("consulta", ["camino_mas_largo", "cascada_mas_fuerte", "ciclo"])
+def test_consultas_dag(benchmark, redes_dag, n, consulta):
+    red = redes_dag(n)
+    dag = red.analisis_dag()
+    origen = dag.orden_topologico()[0]
+    if consulta == "camino_mas_largo":
+        peso, camino = benchmark(dag.camino_mas_largo)
+        assert peso >= 0 and camino
+    elif consulta == "cascada_mas_fuerte":
+        benchmark(dag.cascada_mas_fuerte, origen)
+    else:
+        # Una relación del final al principio del camino más largo cierra un ciclo; se añade a una
+        # copia para no tocar la red compartida
+        _, camino = dag.camino_mas_largo()
+        copia = red.subgraph(set(red.adyacencias))
+        copia.add_edge(camino[-1], camino[0], red.adyacencias[camino[0]][camino[1]])
+        ciclo = benchmark(lambda: copia.analisis_dag().ciclo())
+        assert ciclo[0] == ciclo[-1] and len(ciclo) > 2
+
+def usuarios_con_relaciones_activas_recorrido(red: Red_social, dias: int) -> set:
+    return {usuario for origen, destinos in red.adyacencias.items() for destino, relacion in destinos.items()
+            if relacion.dias_activa >= dias for usuario in (origen, destino)}
+
+@pytest.mark.parametrize("n", TAMANOS)
+@pytest.mark.parametrize("con_indice", [True, False])
+def test_usuarios_con_relaciones_activas(benchmark, redes, n, con_indice):
+    red = redes(n)
+    red.relaciones_por_dias_activa()  # El índice se ordena en la primera consulta
+    dias = 360  # Los días activa generados están entre 1 y 365
+    if con_indice:
+        usuarios = benchmark(red.usuarios_con_relaciones_activas, dias)
+    else:
+        usuarios = benchmark(usuarios_con_relaciones_activas_recorrido, red, dias)
+    assert usuarios == usuarios_con_relaciones_activas_recorrido(red, dias)
+
+CONSULTAS_POR_LECTOR = 50
+TAM_LOTE = 1000
+
+def lectores_y_escritor(red: Red_social, num_lectores: int, modo: str) -> int:
+    """
+    Lanza num_lectores hilos que hacen bfs entre pares de usuarios mientras un hilo escritor añade
+    un lote de TAM_LOTE relaciones cada 5 ms hasta que los lectores terminan. Con modo 'instantaneas'
+    se usa GrafoConcurrente; con modo 'cerrojo', un Grafo protegido por un único cerrojo, que los
+    lectores tienen que esperar mientras se escribe un lote.
+
+    :return: Número de lotes publicados por el escritor.
+    """
+    usuarios = list(red.adyacencias)
+    pares = [(usuarios[i % len(usuarios)], usuarios[(i * 7919) % len(usuarios)]) for i in range(CONSULTAS_POR_LECTOR)]
+    nuevas = [(usuarios[i % len(usuarios)], usuarios[(i * 104729) % len(usuarios)], 1) for i in range(100 * TAM_LOTE)]
+    terminado = threading.Event()
+    lotes = [0]
+    if modo == 'instantaneas':
+        grafo = GrafoConcurrente.of(red)
+
+        def leer():
+            for origen, destino in pares:
+                bfs(grafo.instantanea(), origen, destino)
+
+        def escribir():
+            while not terminado.wait(0.005):
+                inicio = lotes[0] * TAM_LOTE % len(nuevas)
+                grafo.add_edges(nuevas[inicio:inicio + TAM_LOTE])
+                lotes[0] += 1
+    else:
+        grafo = red.subgraph(set(usuarios))
+        cerrojo = threading.Lock()
+
+        def leer():
+            for origen, destino in pares:
+                with cerrojo:
+                    bfs(grafo, origen, destino)
+
+        def escribir():
+            while not terminado.wait(0.005):
+                inicio = lotes[0] * TAM_LOTE % len(nuevas)
+                with cerrojo:
+                    for origen, destino, arista in nuevas[inicio:inicio + TAM_LOTE]:
+                        grafo.add_edge(origen, destino, arista)
+                lotes[0] += 1
+
+    escritor = threading.Thread(target=escribir)
+    lectores = [threading.Thread(target=leer) for _ in range(num_lectores)]
+    escritor.start()
+    for lector in lectores:
+        lector.start()
+    for lector in lectores:
+        lector.join()
+    terminado.set()
+    escritor.join()
+    return lotes[0]
+
+@pytest.mark.parametrize("num_lectores", [1, 4, 16])
+@pytest.mark.parametrize("modo", ["instantaneas", "cerrojo"])
+def test_lectores_concurrentes(benchmark, redes, num_lectores, modo):
+    red = redes(10000)
+    lotes = benchmark.pedantic(lectores_y_escritor, args=(red, num_lectores, modo), rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["consultas_por_segundo"] = num_lectores * CONSULTAS_POR_LECTOR / benchmark.stats.stats.mean
+    benchmark.extra_info["lotes_escritos"] = lotes
@@ -0,0 +1,80 @@
+from collections import Counter
+import os
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from funciones.frecuencias import contar_palabras
+from lecturas.estadisticas import estadisticas_lineas
+from lecturas.pipeline import EtapaBusqueda, EtapaConteoPalabras, SistemaFicherosLento, procesar_ficheros
+
+TAMANOS_MB = [10, 100]
+PALABRAS = ["python", "codigo", "niño", "tecnología", "salud", "futuro"]
+
+@pytest.fixture(scope="module")
+def csv_lineas(tmp_path_factory):
+    """
+    Devuelve una función que genera (una sola vez por tamaño) un CSV de palabras de unos n MB.
+    """
+    generados = {}
+
+    def generar(mb: int) -> str:
+        if mb not in generados:
+            ruta = str(tmp_path_factory.mktemp("csv") / f"palabras_{mb}mb.csv")
+            rng = random.Random(mb)
+            with open(ruta, "w", encoding="utf-8") as file:
+                while file.tell() < mb << 20:
+                    file.write("\n".join(",".join(rng.choices(PALABRAS, k=rng.randint(1, 12)))
+                                         for _ in range(10000)) + "\n")
+            generados[mb] = ruta
+        return generados[mb]
+    return generar
+
+def longitud_media_por_lineas(fichero: str) -> float:
+    total_longitud = total_lineas = 0
+    with open(fichero, "r", encoding="utf-8") as archivo:
+        for linea in archivo:
+            total_longitud += len(linea.strip())
+            total_lineas += 1
+    return total_longitud / total_lineas
+
+@pytest.mark.parametrize("mb", TAMANOS_MB)
+@pytest.mark.parametrize("procesos", sorted({1, os.cpu_count() or 1}))
+def test_estadisticas_lineas_mmap(benchmark, csv_lineas, mb, procesos):
+    ruta = csv_lineas(mb)
+    estadisticas = benchmark.pedantic(estadisticas_lineas, args=(ruta,), kwargs={"procesos": procesos}, rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["mb_por_segundo"] = os.path.getsize(ruta) / (1 << 20) / benchmark.stats.stats.mean
+    assert estadisticas.media == longitud_media_por_lineas(ruta)
+
+@pytest.mark.parametrize("mb", TAMANOS_MB)
+def test_estadisticas_lineas_bucle_python(benchmark, csv_lineas, mb):
+    ruta = csv_lineas(mb)
+    benchmark.pedantic(longitud_media_por_lineas, args=(ruta,), rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info["mb_por_segundo"] = os.path.getsize(ruta) / (1 << 20) / benchmark.stats.stats.mean
+
+@pytest.fixture(scope="module")
+def ficheros_pequenos(tmp_path_factory):
+    """
+    Veinte ficheros de unos 256 KB, como los de un directorio de textos en un disco de red.
+    """
+    directorio = tmp_path_factory.mktemp("textos")
+    rng = random.Random(0)
+    rutas = []
+    for i in range(20):
+        ruta = directorio / f"texto_{i:02d}.txt"
+        ruta.write_text("\n".join(" ".join(rng.choices(PALABRAS, k=10)) for _ in range(4000)) + "\n", encoding="utf-8")
+        rutas.append(str(ruta))
+    return rutas
+
+@pytest.mark.parametrize("max_abiertos", [1, 4, 16])
+def test_pipeline_almacenamiento_lento(benchmark, ficheros_pequenos, max_abiertos):
+    etapas = [EtapaConteoPalabras(), EtapaBusqueda("salud")]
+    opciones = dict(max_abiertos=max_abiertos, tam_bloque=64 << 10, ejecutor="hilos")
+    resultados = benchmark.pedantic(
+        lambda: procesar_ficheros(ficheros_pequenos, etapas, sistema=SistemaFicherosLento(0.005, 50), **opciones),
+        rounds=3)
+    assert resultados["conteo_palabras"] == sum(map(contar_palabras, ficheros_pequenos), Counter())
@@ -0,0 +1,75 @@
+"""
+Compara dos ficheros JSON de resultados de pytest-benchmark y marca las regresiones.
+
+Para guardar una línea base y compararla después (desde el directorio src):
+    python -m pytest benchmarks/bench_*.py --benchmark-json=benchmarks/base.json
+    python -m pytest benchmarks/bench_*.py --benchmark-json=benchmarks/nuevo.json
+    python benchmarks/comparar.py benchmarks/base.json benchmarks/nuevo.json --umbral 0.10
+
+El programa termina con código 1 si algún benchmark es más lento que la línea base en más del umbral.
+Los benchmarks sin un tiempo válido en alguno de los ficheros (sin estadísticas, por ejemplo con
+--benchmark-disable, o con tiempo base 0) no se comparan y se indican aparte.
+"""
+from typing import Dict, List, Optional, Tuple
+import argparse
+import json
+import sys
+
+def cargar(fichero: str, estadistico: str = "median") -> Dict[str, Optional[float]]:
+    """
+    Lee un fichero de resultados de pytest-benchmark.
+
+    :param fichero: Fichero JSON generado con --benchmark-json.
+    :param estadistico: Estadístico de tiempo a comparar (min, mean, median...).
+    :return: Diccionario nombre completo del benchmark -> tiempo en segundos, o None si no tiene.
+    """
+    with open(fichero, "r", encoding="utf-8") as file:
+        datos = json.load(file)
+    return {b["fullname"]: (b.get("stats") or {}).get(estadistico) for b in datos["benchmarks"]}
+
+def no_comparables(base: Dict[str, Optional[float]], nuevo: Dict[str, Optional[float]]) -> List[str]:
+    """
+    Benchmarks presentes en ambos resultados que no se pueden comparar: sin tiempo en alguno de los
+    dos o con tiempo base 0 (la variación relativa no está definida).
+    """
+    return [nombre for nombre in sorted(base.keys() & nuevo.keys())
+            if base[nombre] is None or nuevo[nombre] is None or base[nombre] <= 0]
+
+def comparar(base: Dict[str, Optional[float]], nuevo: Dict[str, Optional[float]],
+             umbral: float) -> List[Tuple[str, float, float, float]]:
+    """
+    Compara los tiempos de los benchmarks presentes en ambos resultados, salvo los no comparables.
+
+    :param base: Tiempos de la línea base.
+    :param nuevo: Tiempos nuevos.
+    :param umbral: Aumento relativo a partir del cual se considera regresión (0.10 = 10 %).
+    :return: Lista de (nombre, tiempo base, tiempo nuevo, variación relativa) de las regresiones.
+    """
+    regresiones = []
+    omitidos = set(no_comparables(base, nuevo))
+    for nombre in sorted(base.keys() & nuevo.keys() - omitidos):
+        variacion = nuevo[nombre] / base[nombre] - 1
+        if variacion > umbral:
+            regresiones.append((nombre, base[nombre], nuevo[nombre], variacion))
+    return regresiones
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compara resultados de pytest-benchmark con una línea base.")
+    parser.add_argument("base", help="JSON de la línea base")
+    parser.add_argument("nuevo", help="JSON con los resultados nuevos")
+    parser.add_argument("--umbral", type=float, default=0.10, help="Aumento relativo tolerado (por defecto 0.10)")
+    parser.add_argument("--estadistico", default="median", help="Estadístico a comparar (por defecto median)")
+    args = parser.parse_args()
+
+    base = cargar(args.base, args.estadistico)
+    nuevo = cargar(args.nuevo, args.estadistico)
+    for nombre in sorted(base.keys() ^ nuevo.keys()):
+        print(f"Solo en uno de los ficheros: {nombre}")
+    omitidos = no_comparables(base, nuevo)
+    for nombre in omitidos:
+        print(f"Sin tiempo válido para comparar: {nombre} (base {base[nombre]}, nuevo {nuevo[nombre]})")
+    regresiones = comparar(base, nuevo, args.umbral)
+    for nombre, t_base, t_nuevo, variacion in regresiones:
+        print(f"REGRESIÓN {nombre}: {t_base * 1000:.3f} ms -> {t_nuevo * 1000:.3f} ms ({variacion:+.1%})")
+    print(f"{len(regresiones)} regresiones de {len(base.keys() & nuevo.keys()) - len(omitidos)} benchmarks comparados.")
+    sys.exit(1 if regresiones else 0)
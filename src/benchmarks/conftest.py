@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos del proyecto se importan como scripts desde su propio directorio
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directorio in ("generador", "defensa_3", "grafos", "Estructuras"):
+    sys.path.insert(0, os.path.join(SRC, directorio))
+sys.path.insert(0, SRC)
+
+from generador import generar_red_social, generar_red_genica  # noqa: E402
+
+@pytest.fixture(scope="session")
+def ficheros_red_social(tmp_path_factory):
+    """
+    Devuelve una función que genera (una sola vez por tamaño) los ficheros de una red social sintética.
+    """
+    generados = {}
+
+    def generar(num_aristas: int, topologia: str = 'erdos_renyi'):
+        clave = (num_aristas, topologia)
+        if clave not in generados:
+            directorio = tmp_path_factory.mktemp(f"red_social_{num_aristas}_{topologia}")
+            f_usuarios, f_relaciones = str(directorio / "usuarios.txt"), str(directorio / "relaciones.txt")
+            generar_red_social(f_usuarios, f_relaciones, num_aristas, topologia=topologia, semilla=1)
+            generados[clave] = (f_usuarios, f_relaciones)
+        return generados[clave]
+    return generar
+
+@pytest.fixture(scope="session")
+def ficheros_red_genica(tmp_path_factory):
+    """
+    Devuelve una función que genera (una sola vez por tamaño) los ficheros de una red génica sintética.
+    """
+    generados = {}
+
+    def generar(num_aristas: int, topologia: str = 'erdos_renyi', aciclica: bool = False):
+        clave = (num_aristas, topologia, aciclica)
+        if clave not in generados:
+            directorio = tmp_path_factory.mktemp(f"red_genica_{num_aristas}_{topologia}{'_dag' if aciclica else ''}")
+            f_genes, f_relaciones = str(directorio / "genes.txt"), str(directorio / "red_genes.txt")
+            generar_red_genica(f_genes, f_relaciones, num_aristas, topologia=topologia, semilla=1, aciclica=aciclica)
+            generados[clave] = (f_genes, f_relaciones)
+        return generados[clave]
+    return generar
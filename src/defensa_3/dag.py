@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import TypeVar, Generic, Callable, Dict, List, Optional, Tuple
+
+from grafo import Grafo
+
+V = TypeVar('V')  # Tipo de los vértices
+E = TypeVar('E')  # Tipo de las aristas
+
+class AnalisisDag(Generic[V]):
+    """
+    Orden topológico, ciclos y caminos más largos de un grafo dirigido.
+
+    Al crearlo se numeran los vértices (en el orden de grafo.adyacencias) y se copian los sucesores y
+    los pesos de las aristas a listas de enteros y de números, así que cada consulta es lineal en
+    vértices más aristas y no usa recursión. El orden topológico se calcula con el algoritmo de Kahn
+    sobre un array de grados de entrada y se reutiliza en las demás consultas. Cambios posteriores
+    en el grafo no se reflejan.
+
+    Uso:
+        dag = AnalisisDag.of(red, peso=lambda relacion: relacion.conexion)
+        dag.orden_topologico()
+        dag.camino_mas_largo()  # (peso total, camino) de la cascada más pesada
+    """
+    def __init__(self, grafo: Grafo[V, E], peso: Optional[Callable[[E], float]] = None):
+        if not grafo.es_dirigido:
+            raise ValueError("El orden topológico solo tiene sentido en un grafo dirigido.")
+        self.vertices: List[V] = list(grafo.adyacencias)
+        self.ids: Dict[V, int] = {vertice: i for i, vertice in enumerate(self.vertices)}
+        ids = self.ids
+        self.sucesores: List[List[int]] = [[ids[destino] for destino in destinos]
+                                           for destinos in grafo.adyacencias.values()]
+        # pesos[i][k] es el peso de la arista de i a sucesores[i][k]; sin función de peso, todas pesan 1
+        if peso is None:
+            self.pesos: List[List[float]] = [[1.0] * len(destinos) for destinos in self.sucesores]
+        else:
+            self.pesos = [[peso(arista) for arista in destinos.values()] for destinos in grafo.adyacencias.values()]
+        self._orden: Optional[List[int]] = None
+        self._grados: List[int] = []
+
+    @staticmethod
+    def of(grafo: Grafo[V, E], peso: Optional[Callable[[E], float]] = None) -> AnalisisDag[V]:
+        """
+        Método de factoría para analizar un grafo dirigido.
+
+        :param grafo: Grafo dirigido.
+        :param peso: Función que da el peso de una arista para camino_mas_largo; si es None cada
+            arista pesa 1 y el camino más largo es el de más aristas.
+        :return: Análisis del grafo.
+        :raise ValueError: Si el grafo no es dirigido.
+        """
+        return AnalisisDag(grafo, peso)
+
+    def _kahn(self) -> List[int]:
+        """
+        Algoritmo de Kahn: saca los vértices de grado de entrada 0 y resta uno al grado de sus
+        sucesores. Si hay ciclos, sus vértices (y los que solo se alcanzan desde ellos) se quedan
+        fuera del orden con grado positivo.
+        """
+        if self._orden is None:
+            grados = [0] * len(self.vertices)
+            for destinos in self.sucesores:
+                for j in destinos:
+                    grados[j] += 1
+            orden = [i for i, grado in enumerate(grados) if grado == 0]
+            k = 0
+            while k < len(orden):
+                for j in self.sucesores[orden[k]]:
+                    grados[j] -= 1
+                    if grados[j] == 0:
+                        orden.append(j)
+                k += 1
+            self._orden, self._grados = orden, grados
+        return self._orden
+
+    def es_aciclico(self) -> bool:
+        return len(self._kahn()) == len(self.vertices)
+
+    def orden_topologico(self) -> List[V]:
+        """
+        Devuelve los vértices en un orden en el que cada arista va de un vértice a otro posterior.
+
+        :return: Lista con todos los vértices.
+        :raise ValueError: Si el grafo tiene algún ciclo; el mensaje incluye uno.
+        """
+        if not self.es_aciclico():
+            raise ValueError(f"El grafo tiene un ciclo: {self.ciclo()}")
+        return [self.vertices[i] for i in self._orden]
+
+    def ciclo(self) -> List[V]:
+        """
+        Devuelve un ciclo del grafo, con el primer vértice repetido al final, o [] si no hay ninguno.
+
+        Los vértices que el algoritmo de Kahn deja fuera tienen todos algún predecesor que también
+        queda fuera; retrocediendo por esos predecesores se acaba repitiendo un vértice, y el tramo
+        entre las dos apariciones es un ciclo.
+        """
+        if self.es_aciclico():
+            return []
+        grados = self._grados
+        predecesor = [-1] * len(self.vertices)
+        for i, destinos in enumerate(self.sucesores):
+            if grados[i] > 0:
+                for j in destinos:
+                    if predecesor[j] == -1:
+                        predecesor[j] = i
+        posicion: Dict[int, int] = {}
+        recorrido: List[int] = []
+        vertice = next(i for i, grado in enumerate(grados) if grado > 0)
+        while vertice not in posicion:
+            posicion[vertice] = len(recorrido)
+            recorrido.append(vertice)
+            vertice = predecesor[vertice]
+        # El recorrido va hacia atrás por las aristas: se da la vuelta al tramo del ciclo
+        ciclo = recorrido[posicion[vertice]:][::-1]
+        return [self.vertices[i] for i in ciclo + ciclo[:1]]
+
+    def camino_mas_largo(self, origen: Optional[V] = None, destino: Optional[V] = None) -> Tuple[float, List[V]]:
+        """
+        Camino de mayor peso total, por programación dinámica en orden topológico: el mejor camino
+        que llega a un vértice es el mejor de los que llegan a sus predecesores más la arista.
+
+        :param origen: Si se indica, solo caminos que empiezan en él; si no, desde cualquier vértice.
+        :param destino: Si se indica, solo caminos que terminan en él; si no, el mejor de todos.
+        :return: Par (peso total, camino); (0.0, []) si no hay ningún camino que cumpla las condiciones.
+        :raise ValueError: Si el grafo tiene algún ciclo.
+        """
+        def sumar(acumulado: float, peso: float) -> float:
+            return acumulado + peso
+        return self._mejor_camino(origen, destino, 0.0, sumar)
+
+    def cascada_mas_fuerte(self, origen: V, destino: Optional[V] = None) -> Tuple[float, List[V]]:
+        """
+        Camino desde origen en el que es mayor el producto de los valores absolutos de los pesos
+        (la fuerza con la que el efecto de origen llega al final de la cascada si los pesos están
+        entre -1 y 1, como RelacionGenAGen.conexion).
+
+        :param origen: Vértice donde empieza la cascada.
+        :param destino: Si se indica, solo cascadas que terminan en él; si no, la más fuerte de todas
+            las que tienen al menos una arista.
+        :return: Par (fuerza, camino); (0.0, []) si no hay ninguna cascada que cumpla las condiciones.
+        :raise ValueError: Si el grafo tiene algún ciclo.
+        """
+        def multiplicar(acumulado: float, peso: float) -> float:
+            return acumulado * abs(peso)
+        return self._mejor_camino(origen, destino, 1.0, multiplicar, con_aristas=True)
+
+    def _mejor_camino(self, origen: Optional[V], destino: Optional[V], neutro: float,
+                      combinar: Callable[[float, float], float], con_aristas: bool = False) -> Tuple[float, List[V]]:
+        """
+        Programación dinámica común a camino_mas_largo y cascada_mas_fuerte. combinar tiene que ser
+        creciente en el valor acumulado para que el mejor camino se forme con mejores caminos.
+        """
+        if not self.es_aciclico():
+            raise ValueError(f"El grafo tiene un ciclo: {self.ciclo()}")
+        n = len(self.vertices)
+        if (origen is not None and origen not in self.ids) or (destino is not None and destino not in self.ids):
+            return 0.0, []
+        mejor: List[Optional[float]] = [None] * n  # None: ningún camino válido llega al vértice
+        anterior = [-1] * n
+        if origen is None:
+            mejor = [neutro] * n
+        else:
+            mejor[self.ids[origen]] = neutro
+        for i in self._orden:
+            valor = mejor[i]
+            if valor is None:
+                continue
+            for j, peso in zip(self.sucesores[i], self.pesos[i]):
+                nuevo = combinar(valor, peso)
+                if mejor[j] is None or nuevo > mejor[j]:
+                    mejor[j], anterior[j] = nuevo, i
+        if destino is not None:
+            final = self.ids[destino]
+            if mejor[final] is None or (con_aristas and anterior[final] == -1):
+                return 0.0, []
+        else:
+            candidatos = [i for i in range(n) if mejor[i] is not None and not (con_aristas and anterior[i] == -1)]
+            if not candidatos:
+                return 0.0, []
+            final = max(candidatos, key=mejor.__getitem__)
+        camino = [final]
+        while anterior[camino[-1]] != -1:
+            camino.append(anterior[camino[-1]])
+        return mejor[final], [self.vertices[i] for i in reversed(camino)]
@@ -1,9 +1,18 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Dict, Set, List
+from operator import attrgetter
+from typing import TypeVar, Generic, Dict, Set, List, Optional, Tuple
+import re
+import sys
 import matplotlib.pyplot as plt
 import networkx as nx
+from dag import AnalisisDag
 from grafo import Grafo
+from indices import IndiceHash, IndiceOrdenado
+
+# Localización citogenética: cromosoma, brazo, banda y subbanda, por ejemplo 17p13.1. Se admiten
+# localizaciones parciales (17, 17q, 17q21) como límites de un rango.
+LOC_CROMOSOMA = re.compile(r'(\d+|X|Y)(?:([pq])(?:(\d+)(?:\.(\d+))?)?)?')
 @dataclass(frozen=True)
 class Gen:
     nombre: str
@@ -29,6 +38,41 @@ class RelacionGenAGen:
             raise ValueError("La conexión debe estar entre -1 y 1.")
         return RelacionGenAGen(nombre_gen1, nombre_gen2, conexion)
 
+def clave_loc_cromosoma(loc: str) -> Tuple[int, ...]:
+    """
+    Clave para ordenar localizaciones cromosómicas: por cromosoma (1-22, X, Y), brazo (p antes que q),
+    banda y subbanda. Bandas y subbandas se comparan dígito a dígito, porque q21 es la banda 1 de
+    la región 2 y va antes que q3, y 21.31 está dentro de 21.3 y va antes que 21.4.
+
+    :param loc: Localización, por ejemplo '17p13.1'.
+    :return: Tupla de enteros; la de una localización parcial es prefijo de las que contiene.
+    :raise ValueError: Si la localización no tiene ese formato.
+    """
+    encontrada = LOC_CROMOSOMA.fullmatch(loc)
+    if encontrada is None:
+        raise ValueError(f"Localización cromosómica no válida: {loc}")
+    cromosoma, brazo, banda, subbanda = encontrada.groups()
+    clave = [{'X': 23, 'Y': 24}.get(cromosoma) or int(cromosoma)]
+    if brazo is not None:
+        clave.append(0 if brazo == 'p' else 1)
+    if banda is not None:
+        clave.extend(int(digito) for digito in banda)
+    if subbanda is not None:
+        clave.append(-1)  # Separa la banda de la subbanda: 1.2 no es la banda 12
+        clave.extend(int(digito) for digito in subbanda)
+    return tuple(clave)
+
+def _clave_gen_loc(gen: Gen) -> Tuple:
+    """
+    Clave del índice por localización. Un rango como '17q21-q22' se ordena por su comienzo y las
+    localizaciones con otro formato ('MT', 'unknown'...) van al final, ordenadas como texto, para
+    que cualquier gen se pueda añadir a la red.
+    """
+    try:
+        return clave_loc_cromosoma(gen.loc_cromosoma.split('-', 1)[0].strip())
+    except ValueError:
+        return (sys.maxsize, gen.loc_cromosoma)
+
 # Clase RedGenica que hereda de Grafo
 class RedGenica(Grafo[Gen, RelacionGenAGen]):
     """
@@ -37,6 +81,8 @@ class RedGenica(Grafo[Gen, RelacionGenAGen]):
     def __init__(self, es_dirigido: bool = False) -> None:
         super().__init__(es_dirigido)
         self.genes_por_nombre: Dict[str, Gen] = {}  # Mapa de nombres a genes
+        self.add_index('nombre', IndiceHash(attrgetter('nombre')))
+        self.add_index('loc_cromosoma', IndiceOrdenado(_clave_gen_loc))
 
     @staticmethod
     def of(es_dirigido: bool = False) -> RedGenica:
@@ -47,6 +93,42 @@ class RedGenica(Grafo[Gen, RelacionGenAGen]):
         """
         return RedGenica(es_dirigido)
 
+    def add_vertex(self, gen: Gen) -> None:
+        if gen not in self.adyacencias:
+            super().add_vertex(gen)
+            self.genes_por_nombre[gen.nombre] = gen
+
+    def gen(self, nombre: str) -> Optional[Gen]:
+        """
+        Devuelve el gen con un nombre, o None si no está en la red.
+        """
+        return self.index('nombre').get(nombre)
+
+    def genes_en_rango(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> List[Gen]:
+        """
+        Genes cuya localización cromosómica está entre dos localizaciones, ambas incluidas, ordenados
+        por localización. Una localización parcial abarca todas las que empiezan por ella: de '17' a
+        '17' devuelve los genes del cromosoma 17 y de '3p' a '7' los del 3p al 7q.
+
+        :param desde: Primera localización; None si no hay límite.
+        :param hasta: Última localización; None si no hay límite.
+        :return: Lista de genes.
+        :raise ValueError: Si alguna localización no es válida.
+        """
+        inicio = None if desde is None else clave_loc_cromosoma(desde)
+        fin = None if hasta is None else clave_loc_cromosoma(hasta) + (float('inf'),)
+        return self.index('loc_cromosoma').rango(inicio, fin)
+
+    def analisis_dag(self) -> AnalisisDag[Gen]:
+        """
+        Orden topológico, ciclos y cascadas de una red génica dirigida, con la conexión de cada
+        relación como peso (ver dag.py). Refleja la red en el momento de llamarlo.
+
+        :return: Análisis de la red.
+        :raise ValueError: Si la red no es dirigida.
+        """
+        return AnalisisDag.of(self, peso=attrgetter('conexion'))
+
     @staticmethod
     def parse(f1: str, f2: str, es_dirigido: bool = False) -> RedGenica:
         """
@@ -63,8 +145,7 @@ class RedGenica(Grafo[Gen, RelacionGenAGen]):
             for linea in archivo_genes:
                 nombre, tipo, num_mutaciones, loc_cromosoma = linea.strip().split(',')
                 gen = Gen.of(nombre, tipo, int(num_mutaciones), loc_cromosoma)
-                red.add_vertex(gen)  # Agregar el gen como vértice al grafo
-                red.genes_por_nombre[nombre] = gen  # Guardar el gen en el diccionario por su nombre
+                red.add_vertex(gen)  # Agregar el gen como vértice al grafo (y a sus índices)
 
         # Leer las relaciones desde el archivo f2 (red_genes.txt)
         with open(f2, 'r') as archivo_relaciones:
@@ -150,8 +231,8 @@ def main():
     red_genica = RedGenica.parse(f1, f2, es_dirigido=False)
     
     # Buscar los vértices correspondientes a los genes KRAS y PIK3CA
-    gen_kras = next((gen for gen in red_genica.vertices() if gen.nombre == "KRAS"), None)
-    gen_pik3ca = next((gen for gen in red_genica.vertices() if gen.nombre == "PIK3CA"), None)
+    gen_kras = red_genica.gen("KRAS")
+    gen_pik3ca = red_genica.gen("PIK3CA")
     
     if gen_kras is None or gen_pik3ca is None:
         print("Uno o ambos genes no se encontraron.")
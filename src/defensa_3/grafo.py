@@ -1,9 +1,17 @@
 from __future__ import annotations
 
-from typing import TypeVar, Generic, Dict, Set, Optional, Callable
+from typing import TypeVar, Generic, Any, Dict, Set, Optional, Callable
+import os
+import sys
 import matplotlib.pyplot as plt
 import networkx as nx
 
+try:
+    from indices import Indice
+except ImportError: # Ejecutado desde defensa_3: los índices son los de grafos/, que se añade al final de la ruta
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'grafos'))
+    from indices import Indice
+
 # Definición de tipos genéricos
 V = TypeVar('V')  # Tipo para vértices
 E = TypeVar('E')  # Tipo para aristas
@@ -15,6 +23,8 @@ class Grafo(Generic[V, E]):
     def __init__(self, es_dirigido: bool = True):
         self.es_dirigido: bool = es_dirigido
         self.adyacencias: Dict[V, Dict[V, E]] = {}  # Diccionario de adyacencia
+        self.indices: Dict[str, Indice[Any, V]] = {}  # Índices secundarios de los vértices, por nombre
+        self.version: int = 0  # Aumenta con cada cambio; las cachés de consultas (cache.py) la comparan
     
     @staticmethod
     def of(es_dirigido: bool = True) -> Grafo[V, E]:
@@ -34,6 +44,36 @@ class Grafo(Generic[V, E]):
         """
         if vertice not in self.adyacencias:
             self.adyacencias[vertice] = {}
+            self.version += 1
+            for indice in self.indices.values():
+                indice.anadir(vertice)
+
+    def add_index(self, nombre: str, indice: Indice[Any, V]) -> None:
+        """
+        Declara un índice secundario de los vértices (ver indices.py). Se rellena con los vértices que
+        ya hay y add_vertex lo mantiene al añadir vértices nuevos.
+
+        :param nombre: Nombre con el que se consulta el índice.
+        :param indice: Índice vacío.
+        :raise ValueError: Si ya hay un índice con ese nombre.
+        """
+        if nombre in self.indices:
+            raise ValueError(f"Ya existe un índice llamado {nombre}.")
+        for vertice in self.adyacencias:
+            indice.anadir(vertice)
+        self.indices[nombre] = indice
+
+    def index(self, nombre: str) -> Indice[Any, V]:
+        """
+        Devuelve un índice secundario declarado con add_index.
+
+        :param nombre: Nombre del índice.
+        :return: Índice de los vértices.
+        :raise ValueError: Si no hay ningún índice con ese nombre.
+        """
+        if nombre not in self.indices:
+            raise ValueError(f"No existe ningún índice llamado {nombre}.")
+        return self.indices[nombre]
 
     def add_edge(self, origen: V, destino: V, arista: E) -> None:
         """
@@ -50,6 +90,7 @@ class Grafo(Generic[V, E]):
             self.add_vertex(destino)
         
         self.adyacencias[origen][destino] = arista
+        self.version += 1
         
         if not self.es_dirigido:
             self.adyacencias[destino][origen] = arista
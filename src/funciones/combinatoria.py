@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+def binomial(n: int, k: int) -> int:
+    """
+    Número combinatorio C(n, k) calculado con aritmética entera exacta.
+
+    :param n: Número de elementos (n >= 0).
+    :param k: Tamaño de la combinación.
+    :return: C(n, k), o 0 si k < 0 o k > n.
+    :raise ValueError: Si n es negativo.
+    """
+    if n < 0:
+        raise ValueError("n tiene que ser mayor o igual que 0.")
+    if k < 0 or k > n:
+        return 0
+    return math.comb(n, k)
+
+def factorial_descendente(n: int, k: int) -> int:
+    """
+    Factorial descendente n·(n-1)·...·(n-k+1), calculado sin dividir factoriales.
+
+    :param n: Primer factor (n >= 0).
+    :param k: Número de factores (k >= 0).
+    :return: Producto de los k factores, o 0 si k > n.
+    :raise ValueError: Si n o k son negativos.
+    """
+    if n < 0 or k < 0:
+        raise ValueError("n y k tienen que ser mayores o iguales que 0.")
+    if k > n:
+        return 0
+    return math.perm(n, k)
+
+# Por debajo de este tamaño S(n, k) se obtiene de la tabla de programación dinámica cacheada
+LIMITE_TABLA_STIRLING = 300
+
+@lru_cache(maxsize=None)
+def _fila_stirling(n: int) -> List[int]:
+    """
+    Fila n del triángulo de Stirling de segunda especie: [S(n, 0), ..., S(n, n)].
+    """
+    if n == 0:
+        return [1]
+    anterior = _fila_stirling(n - 1)
+    fila = [0] * (n + 1)
+    for k in range(1, n):
+        fila[k] = k * anterior[k] + anterior[k - 1]
+    fila[n] = 1
+    return fila
+
+def stirling2(n: int, k: int) -> int:
+    """
+    Número de Stirling de segunda especie S(n, k): formas de repartir n elementos en k grupos no vacíos.
+
+    Para n pequeños se usa la recurrencia S(n, k) = k·S(n-1, k) + S(n-1, k-1) con las filas cacheadas;
+    para n grandes, la fórmula de inclusión-exclusión con enteros exactos:
+        S(n, k) = 1/k! · Σ_{i=0..k} (-1)^i · C(k, i) · (k-i)^n
+
+    :param n: Número de elementos (n >= 0).
+    :param k: Número de grupos.
+    :return: S(n, k), o 0 si k < 0 o k > n.
+    :raise ValueError: Si n es negativo.
+    """
+    if n < 0:
+        raise ValueError("n tiene que ser mayor o igual que 0.")
+    if k < 0 or k > n:
+        return 0
+    if k == n:
+        return 1
+    if k == 0:
+        return 0
+    if n <= LIMITE_TABLA_STIRLING:
+        if n > _fila_stirling.cache_info().currsize:
+            # Rellenamos las filas en orden para no agotar la pila con la recursión
+            for m in range(_fila_stirling.cache_info().currsize, n):
+                _fila_stirling(m)
+        return _fila_stirling(n)[k]
+    suma = 0
+    combinatorio = 1  # C(k, i), actualizado en cada paso sin recalcular factoriales
+    for i in range(k):
+        termino = combinatorio * pow(k - i, n)
+        suma += -termino if i % 2 else termino
+        combinatorio = combinatorio * (k - i) // (i + 1)
+    return suma // math.factorial(k)
+
+class TablaCombinatoria:
+    """
+    Triángulos de Pascal y de Stirling de segunda especie construidos fila a fila.
+
+    Cada fila se obtiene de la anterior con las recurrencias
+        C(n, k) = C(n-1, k-1) + C(n-1, k)
+        S(n, k) = k·S(n-1, k) + S(n-1, k-1)
+    y se guarda en una caché LRU de tamaño limitado. Opcionalmente las filas se truncan a las columnas
+    k <= k_max y los valores se reducen módulo un número cuando no hace falta el entero exacto.
+    """
+    def __init__(self, max_filas: int = 1024, k_max: Optional[int] = None, modulo: Optional[int] = None):
+        if max_filas < 1:
+            raise ValueError("La caché tiene que poder guardar al menos una fila.")
+        if modulo is not None and modulo < 2:
+            raise ValueError("El módulo tiene que ser mayor que 1.")
+        self.max_filas: int = max_filas
+        self.k_max: Optional[int] = k_max
+        self.modulo: Optional[int] = modulo
+        self._filas: Dict[str, OrderedDict[int, List[int]]] = {'pascal': OrderedDict(), 'stirling': OrderedDict()}
+
+    @staticmethod
+    def of(max_filas: int = 1024, k_max: Optional[int] = None, modulo: Optional[int] = None) -> TablaCombinatoria:
+        """
+        Método de factoría para crear una tabla combinatoria.
+
+        :param max_filas: Número máximo de filas guardadas por triángulo; se descartan las menos usadas.
+        :param k_max: Si se indica, solo se calculan las columnas k <= k_max.
+        :param modulo: Si se indica, todos los valores se devuelven módulo este número.
+        :return: Nueva tabla vacía.
+        """
+        return TablaCombinatoria(max_filas, k_max, modulo)
+
+    def binomial(self, n: int, k: int) -> int:
+        """
+        Número combinatorio C(n, k) leído de la fila n del triángulo de Pascal.
+        """
+        return self._consultar('pascal', n, k)
+
+    def stirling2(self, n: int, k: int) -> int:
+        """
+        Número de Stirling de segunda especie S(n, k) leído de la fila n de su triángulo.
+        """
+        return self._consultar('stirling', n, k)
+
+    def binomiales(self, pares: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        Responde a un lote de consultas C(n, k), recorriendo las filas en orden creciente para
+        que cada fila se construya una sola vez a partir de la anterior.
+
+        :param pares: Pares (n, k).
+        :return: Valores en el mismo orden que los pares.
+        """
+        return self._consultar_lote('pascal', pares)
+
+    def stirlings(self, pares: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        Responde a un lote de consultas S(n, k) (ver binomiales).
+
+        :param pares: Pares (n, k).
+        :return: Valores en el mismo orden que los pares.
+        """
+        return self._consultar_lote('stirling', pares)
+
+    def _consultar_lote(self, triangulo: str, pares: Iterable[Tuple[int, int]]) -> List[int]:
+        pares = list(pares)
+        resultados: List[int] = [0] * len(pares)
+        for posicion in sorted(range(len(pares)), key=lambda i: pares[i]):
+            n, k = pares[posicion]
+            resultados[posicion] = self._consultar(triangulo, n, k)
+        return resultados
+
+    def _consultar(self, triangulo: str, n: int, k: int) -> int:
+        if n < 0:
+            raise ValueError("n tiene que ser mayor o igual que 0.")
+        if self.k_max is not None and k > self.k_max:
+            raise ValueError(f"k = {k} supera el k_max = {self.k_max} de la tabla.")
+        if k < 0 or k > n:
+            return 0
+        return self._fila(triangulo, n)[k]
+
+    def _fila(self, triangulo: str, n: int) -> List[int]:
+        filas = self._filas[triangulo]
+        if n in filas:
+            filas.move_to_end(n)
+            return filas[n]
+        # Partimos de la fila guardada más cercana por debajo, o de la fila 0
+        m = max((i for i in filas if i < n), default=None)
+        fila = filas[m] if m is not None else [1]
+        for i in range((m if m is not None else 0) + 1, n + 1):
+            fila = self._siguiente(triangulo, fila, i)
+            self._guardar(filas, i, fila)
+        return fila
+
+    def _guardar(self, filas: OrderedDict[int, List[int]], n: int, fila: List[int]) -> None:
+        filas[n] = fila
+        filas.move_to_end(n)
+        while len(filas) > self.max_filas:
+            filas.popitem(last=False)
+
+    def _siguiente(self, triangulo: str, anterior: List[int], n: int) -> List[int]:
+        """
+        Construye la fila n a partir de la fila n-1.
+        """
+        ancho = n + 1 if self.k_max is None else min(n, self.k_max) + 1
+        fila = [0] * ancho
+        if triangulo == 'pascal':
+            fila[0] = 1
+            for k in range(1, ancho):
+                fila[k] = (anterior[k - 1] + anterior[k]) if k < len(anterior) else anterior[k - 1]
+        else:
+            for k in range(1, ancho):
+                fila[k] = (k * anterior[k] + anterior[k - 1]) if k < len(anterior) else anterior[k - 1]
+        if self.modulo is not None:
+            fila = [valor % self.modulo for valor in fila]
+        return fila
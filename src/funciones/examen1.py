@@ -1,7 +1,47 @@
-import math
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
 from collections import Counter
-import string
+from fractions import Fraction
+try:
+    from funciones.combinatoria import binomial
+    from funciones.productos import producto_rango
+    from funciones.frecuencias import contar_palabras, contar_palabras_paralelo, mas_comunes
+except ImportError: # examen1.py ejecutado como script desde su propio directorio
+    from combinatoria import binomial
+    from productos import producto_rango
+    from frecuencias import contar_palabras, contar_palabras_paralelo, mas_comunes
+def p2(k: int, n: int, i: int) -> int: #Versión pura de P2: recibe los valores y lanza ValueError si no son válidos.
+    if k > n:
+        raise ValueError("n tiene que ser mayor o igual que k")
+    if n < 0:
+        raise ValueError("n y k tienen que ser números positivos")
+    if i <= 0:
+        raise ValueError("i tiene que ser positivo mayor que 0")
+    if i >= k + 1:
+        raise ValueError("i tiene que ser menor a k + 1")
+
+    resultado: int = producto_rango(n - k + 3, n - i + 1) # (n-i+1)·...·(n-k+3), vacío si i > k-2
+
+    return resultado
+def c2(n: int, k: int) -> int:
+    if n <= k:
+        raise ValueError("n tiene que ser mayor que k")
+    if n <= 0:
+        raise ValueError("n y k tienen que ser positivos")
+    return binomial(n, k+1)
+def s2(n: int, k: int) -> Union[float, Fraction]: #float si cabe; si no (n en los cientos), el valor exacto como Fraction
+    if n < k:
+        raise ValueError("n tiene que ser mayor o igual que k")
+    if n <= 0:
+        raise ValueError("n y k tienen que ser positivos mayores que 0")
+    i:int = 1
+    s:int = 0
+    for i in range(i,k+1):
+        s = s + (-1)**i * binomial(k, i) * (k-i)**(n+1)
+    resultado:Fraction = Fraction(s, n*(k+1)*(k+2)) # k!/(k+2)! = 1/((k+1)(k+2)), sin dividir factoriales
+    try:
+        return float(resultado) # Redondeada una sola vez
+    except OverflowError:
+        return resultado
 def P2(): #En esta función y en todas las funciones están contempladas todas las posibles casuísticas que se puedan dar, lanzando el mensaje de error correspondiente. Para poder visualizar todas las casuísticas se debe dar los respectivos valores que las contemplen.
     while True:
         try:
@@ -9,83 +49,63 @@ def P2(): #En esta función y en todas las funciones están contempladas todas l
             k:int = int(input("k = "))
             n:int = int(input("n = "))
             i:int = int(input("i = "))
-
-            assert k <= n, "n tiene que ser mayor o igual que k"
-            assert n >= 0, "n y k tienen que ser números positivos"
-            assert i > 0, "i tiene que ser positivo mayor que 0"
-            assert i < k + 1, "i tiene que ser menor a k + 1"
-
-            resultado: int = 1
-            for i in range(i, k - 1):
-                resultado = resultado * (n - i + 1)
-
-            return resultado
-
-        except AssertionError as error:
-            print(f"Error: {error}.")
         except ValueError:
             print("Error: n, k e i tienen que ser números enteros.")
+            continue
+        try:
+            return p2(k, n, i)
+        except ValueError as error:
+            print(f"Error: {error}.")
 def C2():
     while True:
         try:
             print("Dale valores a n y a k")
             k:int = int(input("k = "))
             n:int = int(input("n = "))
-            
-            assert n > k, "n tiene que ser mayor que k"
-            assert n > 0, "n y k tienen que ser positivos"
-            
-            resultado:int = int(factorial(n)/(factorial(k+1)*factorial(n-k-1)))
-            return resultado
-        except AssertionError as error:
-            print(f"Error: {error}.")
         except ValueError:
             print("Error: n y k tienen que ser números enteros.")
-def S2() -> float:
+            continue
+        try:
+            return c2(n, k)
+        except ValueError as error:
+            print(f"Error: {error}.")
+def S2() -> Union[float, Fraction]:
     while True:
         try:
             print("Dale valores a k y a n")
             k:int = int(input("k = "))
             n:int = int(input("n = "))
-            i:int = 1
-            assert n>=k, "n tiene que ser mayor o igual que k"
-            assert n>0, "n y k tienen que ser positivos mayores que 0"
-            s:float = 0.0
-            for i in range(i,k+1):
-                s = s + (-1)**i * (math.factorial(k)/(math.factorial(i)*math.factorial(k-i))) * (k-i)**(n+1)
-            resultado:float = math.factorial(k)*s/(n*math.factorial(k+2))
-            return resultado
-        except AssertionError as error:
-            print(f"Error: {error}")
         except ValueError:
             print("Error: n y k tienen que ser números enteros.")
-def palabrasMasComunes(fichero: str, n: int = 5) -> List[Tuple[str, int]]:
+            continue
+        try:
+            return s2(n, k)
+        except ValueError as error:
+            print(f"Error: {error}")
+def palabrasMasComunes(fichero: str, n: int = 5, procesos: Optional[int] = 1) -> List[Tuple[str, int]]: #Con procesos distinto de 1 'fichero' puede ser también un directorio
     if n <= 1:
         raise ValueError("El valor de 'n' debe ser mayor que 1")
     
     try:
-        contenido: str
-        with open(fichero, 'r', encoding='utf-8') as file:
-            contenido = file.read()
-        contenido_minusculas: str = contenido.lower()
-        contenido_sin_puntuacion: str = contenido_minusculas.translate(
-            str.maketrans('', '', string.punctuation)
-        )
-        palabras: List[str] = contenido_sin_puntuacion.split()
-        contador: Counter = Counter(palabras)
-        palabras_comunes: List[Tuple[str, int]] = contador.most_common(n)
+        # El fichero se lee por bloques: la memoria depende del vocabulario, no del tamaño del fichero
+        if procesos == 1:
+            contador: Counter = contar_palabras(fichero)
+        else: # Trozos de los ficheros repartidos entre procesos y contadores fusionados en árbol
+            contador = contar_palabras_paralelo(fichero, procesos)
+        palabras_comunes: List[Tuple[str, int]] = mas_comunes(contador, n)
         return palabras_comunes
     except FileNotFoundError:
         print(f"El archivo '{fichero}' no se encontró.")
     except Exception as e:
         print(f"Ocurrió un error: {e}")
-print("¿Qué ejercicio quieres hacer?")
-Ejercicio:str = input("")
-if Ejercicio == "P2":
-    print(P2())
-elif Ejercicio == "C2":
-    print(C2())
-elif Ejercicio == "S2":
-    print(S2())
-elif Ejercicio == "palabrasMasComunes":
-    print(palabrasMasComunes("archivo_palabras.txt"))
\ No newline at end of file
+if __name__ == "__main__":
+    print("¿Qué ejercicio quieres hacer?")
+    Ejercicio:str = input("")
+    if Ejercicio == "P2":
+        print(P2())
+    elif Ejercicio == "C2":
+        print(C2())
+    elif Ejercicio == "S2":
+        print(S2())
+    elif Ejercicio == "palabrasMasComunes":
+        print(palabrasMasComunes("archivo_palabras.txt"))
\ No newline at end of file
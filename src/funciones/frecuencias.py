@@ -0,0 +1,244 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, TypeVar, Union
+import heapq
+import os
+import re
+
+try:
+    from funciones.sketches import CountMinSketch, ResultadoAproximado, SpaceSaving
+    from funciones.tokenizador import TOKENIZADOR_PALABRAS, Tokenizador
+except ImportError:  # Ejecutado desde el propio directorio funciones
+    from sketches import CountMinSketch, ResultadoAproximado, SpaceSaving
+    from tokenizador import TOKENIZADOR_PALABRAS, Tokenizador
+
+# Tamaño en bytes de los trozos en los que se reparten los ficheros grandes entre procesos
+TAM_TROZO = 8 << 20
+ESPACIO_BYTES = re.compile(rb'[ \n\t\r\x0b\x0c]')
+
+Trozo = Tuple[str, int, int]  # (fichero, byte inicial, byte final)
+Resumen = TypeVar('Resumen')  # Counter o sketch que se fusiona con otro del mismo tipo
+
+METODOS_APROXIMADOS = ('space_saving', 'count_min')
+
+def contar_palabras(fichero: str, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS,
+                    contador: Optional[Counter] = None) -> Counter:
+    """
+    Cuenta las palabras de un fichero leyéndolo por bloques, de modo que la memoria usada depende del
+    tamaño del vocabulario y no del tamaño del fichero.
+
+    :param fichero: Ruta del fichero (UTF-8).
+    :param tokenizador: Tokenizador que define las palabras. Por defecto, minúsculas y sin los signos
+        de string.punctuation.
+    :param contador: Contador al que sumar las palabras; si no se indica se crea uno nuevo.
+    :return: Contador de palabras.
+    """
+    contador = Counter() if contador is None else contador
+    with open(fichero, 'r', encoding='utf-8') as file:
+        for palabras in tokenizador.bloques(file):
+            contador.update(palabras)
+    return contador
+
+def mas_comunes(contador: Counter, n: int) -> List[Tuple[str, int]]:
+    """
+    Devuelve las n palabras más frecuentes usando un montículo de tamaño n, sin ordenar todo el
+    vocabulario. A igual frecuencia se mantiene el orden de primera aparición, como Counter.most_common.
+
+    :param contador: Contador de palabras.
+    :param n: Número de palabras a devolver.
+    :return: Lista de pares (palabra, frecuencia) de mayor a menor frecuencia.
+    """
+    return heapq.nlargest(n, contador.items(), key=itemgetter(1))
+
+def trozos_fichero(fichero: str, tam_trozo: int = TAM_TROZO) -> List[Trozo]:
+    """
+    Divide un fichero en trozos de unos tam_trozo bytes que terminan justo después de un espacio en
+    blanco ASCII. Así ninguna palabra queda partida y cada trozo se puede decodificar por separado,
+    porque los bytes ASCII nunca forman parte de un carácter UTF-8 multibyte.
+
+    :param fichero: Ruta del fichero.
+    :param tam_trozo: Tamaño aproximado de cada trozo en bytes.
+    :return: Lista de trozos (fichero, inicio, fin) que cubren el fichero en orden.
+    :raise ValueError: Si tam_trozo no es positivo.
+    """
+    if tam_trozo < 1:
+        raise ValueError("El tamaño de los trozos tiene que ser positivo.")
+    tamano = os.path.getsize(fichero)
+    trozos: List[Trozo] = []
+    inicio = 0
+    with open(fichero, 'rb') as file:
+        while inicio < tamano:
+            fin = inicio + tam_trozo
+            if fin >= tamano:
+                fin = tamano
+            else:
+                # Avanzamos hasta el siguiente espacio en blanco (o el final del fichero)
+                file.seek(fin)
+                while True:
+                    bloque = file.read(1 << 16)
+                    if not bloque:
+                        fin = tamano
+                        break
+                    espacio = ESPACIO_BYTES.search(bloque)
+                    if espacio:
+                        fin += espacio.end()
+                        break
+                    fin += len(bloque)
+            trozos.append((fichero, inicio, fin))
+            inicio = fin
+    return trozos
+
+def palabras_trozo(trozo: Trozo, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS) -> List[str]:
+    """
+    Lee un trozo de fichero (ver trozos_fichero) y devuelve sus palabras.
+
+    :param trozo: Terna (fichero, inicio, fin).
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Palabras del trozo en orden.
+    """
+    fichero, inicio, fin = trozo
+    with open(fichero, 'rb') as file:
+        file.seek(inicio)
+        datos = file.read(fin - inicio)
+    return tokenizador.tokenizar(datos.decode('utf-8'))
+
+def contar_trozo(trozo: Trozo, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS) -> Counter:
+    """
+    Cuenta las palabras de un trozo de fichero (ver trozos_fichero).
+
+    :param trozo: Terna (fichero, inicio, fin).
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Contador de palabras del trozo, en orden de primera aparición.
+    """
+    return Counter(palabras_trozo(trozo, tokenizador))
+
+def fusionar_en_arbol(resumenes: List[Resumen],
+                      fusionar: Callable[[Resumen, Resumen], object] = Counter.update) -> Resumen:
+    """
+    Fusiona una lista de resúmenes por parejas de vecinos, nivel a nivel, como un árbol binario.
+
+    Cada fusión conserva el orden de las claves del resumen de la izquierda y añade detrás las nuevas
+    del de la derecha, así que el resultado tiene las palabras en el mismo orden de primera aparición
+    que si se hubieran contado los trozos uno detrás de otro.
+
+    :param resumenes: Contadores (o sketches) en el orden de los trozos; se modifican.
+    :param fusionar: Función que suma el segundo resumen al primero. Por defecto, Counter.update.
+    :return: Resumen con la suma de todos.
+    """
+    if not resumenes:
+        return Counter()
+    while len(resumenes) > 1:
+        nivel = []
+        for i in range(0, len(resumenes) - 1, 2):
+            fusionar(resumenes[i], resumenes[i + 1])
+            nivel.append(resumenes[i])
+        if len(resumenes) % 2:
+            nivel.append(resumenes[-1])
+        resumenes = nivel
+    return resumenes[0]
+
+def ficheros_texto(ficheros: Union[str, Iterable[str]]) -> List[str]:
+    """
+    Devuelve la lista de ficheros a procesar: un fichero, todos los ficheros de un directorio
+    (recursivamente y ordenados por ruta) o una colección de rutas en el orden dado.
+    """
+    if isinstance(ficheros, (str, Path)):
+        if os.path.isdir(ficheros):
+            return sorted(str(ruta) for ruta in Path(ficheros).rglob('*') if ruta.is_file())
+        return [str(ficheros)]
+    return [str(fichero) for fichero in ficheros]
+
+def contar_palabras_paralelo(ficheros: Union[str, Iterable[str]], procesos: Optional[int] = None,
+                             tam_trozo: int = TAM_TROZO, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS) -> Counter:
+    """
+    Cuenta las palabras de uno o varios ficheros repartiendo el trabajo entre varios procesos.
+
+    Los ficheros grandes se dividen en trozos (ver trozos_fichero) y los trozos de todos los ficheros
+    se reparten entre un pool de procesos; cada proceso cuenta sus trozos por separado y los contadores
+    se fusionan en árbol (ver fusionar_en_arbol). El resultado es el mismo, incluido el orden de las
+    palabras, que contar los ficheros uno tras otro con contar_palabras.
+
+    :param ficheros: Fichero, directorio o colección de ficheros (UTF-8).
+    :param procesos: Número de procesos; por defecto, uno por núcleo. Con 1 no se crea ningún pool.
+    :param tam_trozo: Tamaño aproximado en bytes de cada trozo.
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Contador de palabras.
+    """
+    trozos = [trozo for fichero in ficheros_texto(ficheros) for trozo in trozos_fichero(fichero, tam_trozo)]
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(trozos) <= 1:
+        contadores = [contar_trozo(trozo, tokenizador) for trozo in trozos]
+    else:
+        # Varios trozos por tarea cuando hay muchos ficheros pequeños, para no pagar un envío por fichero
+        por_tarea = max(1, len(trozos) // (4 * procesos))
+        with ProcessPoolExecutor(max_workers=min(procesos, len(trozos))) as pool:
+            contadores = list(pool.map(partial(contar_trozo, tokenizador=tokenizador), trozos, chunksize=por_tarea))
+    return fusionar_en_arbol(contadores)
+
+def crear_resumen(metodo: str, n: int, error: float, memoria: Optional[int] = None,
+                  probabilidad_fallo: float = 0.01) -> Union[SpaceSaving, CountMinSketch]:
+    """
+    Crea un resumen aproximado vacío para buscar las n palabras más frecuentes.
+
+    :param metodo: 'space_saving' (determinista) o 'count_min' (probabilista).
+    :param n: Número de palabras que se van a pedir; Count-Min conserva 4·n candidatas.
+    :param error: Error relativo máximo de las estimaciones.
+    :param memoria: Número máximo de contadores.
+    :param probabilidad_fallo: Solo para Count-Min: probabilidad de superar la cota de error.
+    :return: Resumen vacío.
+    :raise ValueError: Si el método no existe o los parámetros no son válidos.
+    """
+    if metodo == 'space_saving':
+        return SpaceSaving.desde_error(error, memoria)
+    if metodo == 'count_min':
+        return CountMinSketch.desde_error(error, probabilidad_fallo, memoria, candidatos=4 * n)
+    raise ValueError(f"Método desconocido: {metodo}. Opciones: {', '.join(METODOS_APROXIMADOS)}")
+
+def resumir_trozo(trozo: Trozo, metodo: str, n: int, error: float, memoria: Optional[int],
+                  probabilidad_fallo: float, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS
+                  ) -> Union[SpaceSaving, CountMinSketch]:
+    """
+    Resume las palabras de un trozo de fichero con un resumen aproximado nuevo (ver crear_resumen).
+    """
+    resumen = crear_resumen(metodo, n, error, memoria, probabilidad_fallo)
+    resumen.actualizar(palabras_trozo(trozo, tokenizador))
+    return resumen
+
+def mas_comunes_aproximado(ficheros: Union[str, Iterable[str]], n: int, metodo: str = 'space_saving',
+                           error: float = 1e-3, memoria: Optional[int] = None, probabilidad_fallo: float = 0.01,
+                           procesos: Optional[int] = 1, tam_trozo: int = TAM_TROZO,
+                           tokenizador: Tokenizador = TOKENIZADOR_PALABRAS) -> ResultadoAproximado:
+    """
+    Busca las n palabras más frecuentes con memoria acotada, usando Space-Saving o Count-Min en lugar
+    de un Counter con todo el vocabulario.
+
+    Con varios procesos cada trozo se resume por separado y los resúmenes se fusionan en árbol.
+
+    :param ficheros: Fichero, directorio o colección de ficheros (UTF-8).
+    :param n: Número de palabras a devolver.
+    :param metodo: 'space_saving' o 'count_min'.
+    :param error: Error relativo máximo de las estimaciones (respecto al total de palabras).
+    :param memoria: Número máximo de contadores de cada resumen.
+    :param probabilidad_fallo: Solo para Count-Min: probabilidad de superar la cota de error.
+    :param procesos: Número de procesos; None usa uno por núcleo.
+    :param tam_trozo: Tamaño aproximado en bytes de cada trozo.
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Palabras con su frecuencia estimada, el error de cada estimación y la garantía global.
+    """
+    trozos = [trozo for fichero in ficheros_texto(ficheros) for trozo in trozos_fichero(fichero, tam_trozo)]
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(trozos) <= 1:
+        # Un único resumen alimentado trozo a trozo: la memoria es la del resumen más un trozo
+        resumen = crear_resumen(metodo, n, error, memoria, probabilidad_fallo)
+        for trozo in trozos:
+            resumen.actualizar(palabras_trozo(trozo, tokenizador))
+        return resumen.mas_comunes(n)
+    resumir = partial(resumir_trozo, metodo=metodo, n=n, error=error, memoria=memoria,
+                      probabilidad_fallo=probabilidad_fallo, tokenizador=tokenizador)
+    por_tarea = max(1, len(trozos) // (4 * procesos))
+    with ProcessPoolExecutor(max_workers=min(procesos, len(trozos))) as pool:
+        resumenes = list(pool.map(resumir, trozos, chunksize=por_tarea))
+    return fusionar_en_arbol(resumenes, type(resumenes[0]).fusionar).mas_comunes(n)
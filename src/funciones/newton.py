@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+import numpy as np
+
+Funcion = Callable[[np.ndarray], np.ndarray]
+
+@dataclass(frozen=True)
+class ResultadoRaices:
+    raices: np.ndarray  # Última aproximación de cada punto inicial
+    convergido: np.ndarray  # True donde |f(x)| <= error
+    iteraciones: np.ndarray  # Iteraciones realizadas por cada punto inicial
+
+    @property
+    def todas_convergidas(self) -> bool:
+        return bool(self.convergido.all())
+
+def derivada_numerica(f: Funcion) -> Funcion:
+    """
+    Devuelve una aproximación de f' por diferencias centradas, con un paso proporcional a |x|.
+
+    :param f: Función vectorizada.
+    :return: Función vectorizada que aproxima la derivada.
+    """
+    def df(x: np.ndarray) -> np.ndarray:
+        h = np.cbrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(x))
+        return (f(x + h) - f(x - h)) / (2 * h)
+    return df
+
+def newton_raphson(f: Funcion, x0, df: Optional[Funcion] = None, error: float = 1e-12,
+                   max_iteraciones: int = 100, intervalo: Optional[Tuple] = None,
+                   tolerancia_derivada: float = 1e-14) -> ResultadoRaices:
+    """
+    Busca raíces de f con el método de Newton-Raphson partiendo de muchos puntos a la vez.
+
+    Todos los puntos iniciales se iteran juntos como un array de NumPy, pero cada uno deja de
+    actualizarse en cuanto |f(x)| <= error o al llegar a max_iteraciones. Cuando la derivada se
+    anula (o no es finita) se da un paso de secante con la iteración anterior; si se indica un
+    intervalo con cambio de signo, los pasos que no son válidos o salen del intervalo se sustituyen
+    por un paso de bisección, de modo que la convergencia queda garantizada.
+
+    :param f: Función vectorizada (recibe y devuelve arrays).
+    :param x0: Punto inicial o array de puntos iniciales.
+    :param df: Derivada vectorizada de f; si no se indica se aproxima numéricamente.
+    :param error: Error máximo admitido en |f(x)|.
+    :param max_iteraciones: Número máximo de iteraciones por punto.
+    :param intervalo: Par (a, b) de extremos (escalares o arrays) con f(a) y f(b) de distinto signo.
+    :param tolerancia_derivada: Por debajo de este valor absoluto la derivada se considera nula.
+    :return: Raíces aproximadas, máscara de convergencia e iteraciones por punto.
+    :raise ValueError: Si max_iteraciones es negativo o el intervalo no tiene cambio de signo.
+    """
+    if max_iteraciones < 0:
+        raise ValueError("El número máximo de iteraciones no puede ser negativo.")
+    df = df or derivada_numerica(f)
+    x = np.array(x0, dtype=float, ndmin=1)
+    forma = np.shape(x0)
+    n = x.size
+    x = x.ravel()
+    iteraciones = np.zeros(n, dtype=np.int64)
+    convergido = np.zeros(n, dtype=bool)
+
+    con_intervalo = intervalo is not None
+    if con_intervalo:
+        bajo = np.broadcast_to(np.asarray(intervalo[0], dtype=float), np.shape(x0)).ravel().copy()
+        alto = np.broadcast_to(np.asarray(intervalo[1], dtype=float), np.shape(x0)).ravel().copy()
+        f_bajo = f(bajo)
+        if np.any(np.sign(f_bajo) * np.sign(f(alto)) > 0):
+            raise ValueError("f tiene que cambiar de signo en el intervalo.")
+        # Los puntos iniciales fuera del intervalo empiezan en su punto medio
+        fuera = (x < np.minimum(bajo, alto)) | (x > np.maximum(bajo, alto))
+        x[fuera] = (bajo[fuera] + alto[fuera]) / 2
+
+    x_anterior = np.full(n, np.nan)
+    f_anterior = np.full(n, np.nan)
+    activos = np.arange(n)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        fx = f(x)
+        for _ in range(max_iteraciones + 1):
+            hecho = np.abs(fx) <= error
+            convergido[activos[hecho]] = True
+            seguir = ~hecho & np.isfinite(fx)
+            activos, fx = activos[seguir], fx[seguir]
+            if activos.size == 0 or iteraciones[activos[0]] == max_iteraciones:
+                break
+
+            xa = x[activos]
+            d = df(xa)
+            nuevo = xa - fx / d
+
+            # Derivada nula: paso de secante con la iteración anterior o, si no la hay,
+            # un pequeño desplazamiento para poder dar el paso de secante en la siguiente
+            nula = ~(np.abs(d) > tolerancia_derivada) | ~np.isfinite(nuevo)
+            if nula.any():
+                xp, fp = x_anterior[activos], f_anterior[activos]
+                secante = xa - fx * (xa - xp) / (fx - fp)
+                desplazado = xa + np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(xa))
+                nuevo = np.where(nula, np.where(np.isfinite(secante), secante, desplazado), nuevo)
+
+            if con_intervalo:
+                b, a = alto[activos], bajo[activos]
+                # El punto actual sustituye al extremo con el mismo signo de f
+                mismo_signo = np.sign(fx) == np.sign(f_bajo[activos])
+                a = np.where(mismo_signo, xa, a)
+                b = np.where(mismo_signo, b, xa)
+                bajo[activos], alto[activos] = a, b
+                f_bajo[activos] = np.where(mismo_signo, fx, f_bajo[activos])
+                fuera = ~np.isfinite(nuevo) | (nuevo < np.minimum(a, b)) | (nuevo > np.maximum(a, b))
+                nuevo = np.where(fuera, (a + b) / 2, nuevo)
+
+            x_anterior[activos], f_anterior[activos] = xa, fx
+            x[activos] = nuevo
+            iteraciones[activos] += 1
+            fx = f(nuevo)
+
+    return ResultadoRaices(x.reshape(forma), convergido.reshape(forma), iteraciones.reshape(forma))
@@ -0,0 +1,98 @@
+import math
+from typing import Optional, Tuple
+
+# Por debajo de este número de factores se multiplica directamente
+UMBRAL_PRODUCTO_DIRECTO = 64
+
+def _producto_binario(inicio: int, fin: int) -> int:
+    """
+    Producto de inicio·(inicio+1)·...·fin por división binaria: los factores se multiplican por mitades
+    para que los enteros grandes que se multiplican tengan tamaños parecidos.
+    """
+    if fin - inicio < UMBRAL_PRODUCTO_DIRECTO:
+        return math.prod(range(inicio, fin + 1))
+    medio = (inicio + fin) // 2
+    return _producto_binario(inicio, medio) * _producto_binario(medio + 1, fin)
+
+def producto_rango(inicio: int, fin: int, modulo: Optional[int] = None) -> int:
+    """
+    Producto de los enteros consecutivos inicio·(inicio+1)·...·fin. Incluye como casos particulares el
+    factorial descendente n·(n-1)·...·(n-k+1) = producto_rango(n-k+1, n).
+
+    :param inicio: Primer factor.
+    :param fin: Último factor. Si fin < inicio el producto es vacío y vale 1.
+    :param modulo: Si se indica, el resultado se calcula módulo este número.
+    :return: El producto exacto, o su resto módulo `modulo`.
+    :raise ValueError: Si el módulo no es positivo.
+    """
+    if modulo is not None and modulo <= 0:
+        raise ValueError("El módulo tiene que ser positivo.")
+    if fin < inicio:
+        return 1 % modulo if modulo is not None else 1
+    if inicio <= 0 <= fin:
+        return 0
+    if modulo is not None:
+        resultado = 1
+        for factor in range(inicio, fin + 1):
+            resultado = resultado * factor % modulo
+        return resultado
+    if inicio > 0:
+        return math.perm(fin, fin - inicio + 1)  # Ya usa división binaria internamente
+    # Todos los factores son negativos
+    signo = -1 if (fin - inicio + 1) % 2 else 1
+    return signo * _producto_binario(-fin, -inicio)
+
+def producto_rango_log(inicio: int, fin: int) -> Tuple[int, float]:
+    """
+    Producto de enteros consecutivos en escala logarítmica, para resultados demasiado grandes.
+
+    :param inicio: Primer factor.
+    :param fin: Último factor.
+    :return: Par (signo, logaritmo natural del valor absoluto); el producto vale signo·e^logaritmo.
+        Si el producto es 0 se devuelve (0, -inf).
+    """
+    if fin < inicio:
+        return 1, 0.0
+    if inicio <= 0 <= fin:
+        return 0, -math.inf
+    if inicio > 0:
+        return 1, math.lgamma(fin + 1) - math.lgamma(inicio)
+    signo = -1 if (fin - inicio + 1) % 2 else 1
+    return signo, math.lgamma(-inicio + 1) - math.lgamma(-fin)
+
+def producto_geometrico(a: int, r: int, k: int, modulo: Optional[int] = None) -> int:
+    """
+    Producto de los k primeros términos de la sucesión geométrica a, a·r, a·r^2, ... con la fórmula cerrada
+        a · a·r · ... · a·r^(k-1) = a^k · r^(k(k-1)/2)
+    que necesita dos potencias en lugar de k.
+
+    :param a: Primer término.
+    :param r: Razón.
+    :param k: Número de términos. Si k <= 0 el producto es vacío y vale 1.
+    :param modulo: Si se indica, el resultado se calcula módulo este número.
+    :return: El producto exacto, o su resto módulo `modulo`.
+    :raise ValueError: Si el módulo no es positivo.
+    """
+    if modulo is not None and modulo <= 0:
+        raise ValueError("El módulo tiene que ser positivo.")
+    if k <= 0:
+        return 1 % modulo if modulo is not None else 1
+    exponente_r = k * (k - 1) // 2
+    if modulo is not None:
+        return pow(a, k, modulo) * pow(r, exponente_r, modulo) % modulo
+    return a ** k * r ** exponente_r
+
+def producto_geometrico_log(a: float, r: float, k: int) -> Tuple[int, float]:
+    """
+    Producto de la sucesión geométrica en escala logarítmica (ver producto_geometrico).
+
+    :return: Par (signo, logaritmo natural del valor absoluto); si el producto es 0 se devuelve (0, -inf).
+    """
+    if k <= 0:
+        return 1, 0.0
+    exponente_r = k * (k - 1) // 2
+    if a == 0 or (r == 0 and exponente_r > 0):
+        return 0, -math.inf
+    signo = (-1 if a < 0 and k % 2 else 1) * (-1 if r < 0 and exponente_r % 2 else 1)
+    logaritmo = k * math.log(abs(a)) + (exponente_r * math.log(abs(r)) if exponente_r else 0.0)
+    return signo, logaritmo
@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import heapq
+import math
+
+import numpy as np
+
+@dataclass(frozen=True)
+class ResultadoAproximado:
+    palabras: List[Tuple[str, int]]  # (palabra, frecuencia estimada) de mayor a menor estimación
+    errores: List[int]  # Sobreestimación máxima de cada estimación
+    total: int  # Número de palabras leídas
+    error_maximo: float  # Cota de la sobreestimación de cualquier palabra
+    probabilidad_fallo: float  # Probabilidad de que alguna estimación supere la cota (0 si es determinista)
+
+    @property
+    def cotas_inferiores(self) -> List[Tuple[str, int]]:
+        """
+        Frecuencia mínima garantizada de cada palabra: estimación menos su error.
+        """
+        return [(palabra, estimacion - error) for (palabra, estimacion), error in zip(self.palabras, self.errores)]
+
+class SpaceSaving:
+    """
+    Resumen Space-Saving (Metwally, Agrawal y El Abbadi) para encontrar las palabras más frecuentes de
+    un flujo con memoria fija.
+
+    Guarda como mucho `capacidad` contadores. Cuando llega una palabra sin contador y no queda sitio,
+    la palabra con menor cuenta se sustituye por la nueva, que hereda esa cuenta como error. Las
+    estimaciones nunca quedan por debajo de la frecuencia real y la superan como mucho en
+    total / capacidad, así que cualquier palabra con frecuencia mayor que esa cota está en el resumen.
+    """
+    def __init__(self, capacidad: int):
+        if capacidad < 1:
+            raise ValueError("La capacidad tiene que ser mayor o igual que 1.")
+        self.capacidad: int = capacidad
+        self.total: int = 0
+        self.cuentas: Dict[str, int] = {}
+        self.errores: Dict[str, int] = {}
+        # Montículo de (cuenta, palabra) con una entrada por palabra; las cuentas solo crecen, así que
+        # una entrada puede estar atrasada y se corrige al llegar a la cima
+        self._monticulo: List[Tuple[int, str]] = []
+
+    @staticmethod
+    def of(capacidad: int) -> SpaceSaving:
+        """
+        Método de factoría para crear un resumen Space-Saving vacío.
+
+        :param capacidad: Número máximo de palabras con contador.
+        :return: Nuevo resumen.
+        """
+        return SpaceSaving(capacidad)
+
+    @staticmethod
+    def desde_error(error: float, memoria: Optional[int] = None) -> SpaceSaving:
+        """
+        Crea un resumen cuyas estimaciones sobrestiman como mucho en error·total.
+
+        :param error: Error relativo máximo (0 < error < 1).
+        :param memoria: Número máximo de contadores; si es menor que el necesario, manda la memoria y
+            la cota de error pasa a ser total / memoria.
+        :return: Nuevo resumen.
+        :raise ValueError: Si el error no está entre 0 y 1.
+        """
+        if not 0 < error < 1:
+            raise ValueError("El error tiene que estar entre 0 y 1.")
+        capacidad = math.ceil(1 / error)
+        if memoria is not None:
+            capacidad = min(capacidad, memoria)
+        return SpaceSaving(capacidad)
+
+    @property
+    def error_maximo(self) -> float:
+        return self.total / self.capacidad
+
+    def actualizar(self, palabras: Iterable[str]) -> None:
+        """
+        Añade palabras al resumen. Las repeticiones dentro del mismo lote se agrupan antes.
+
+        :param palabras: Palabras leídas.
+        """
+        for palabra, peso in Counter(palabras).items():
+            self.anadir(palabra, peso)
+
+    def anadir(self, palabra: str, peso: int = 1) -> None:
+        """
+        Añade `peso` apariciones de una palabra.
+        """
+        self.total += peso
+        if palabra in self.cuentas:
+            self.cuentas[palabra] += peso
+        elif len(self.cuentas) < self.capacidad:
+            self.cuentas[palabra] = peso
+            self.errores[palabra] = 0
+            heapq.heappush(self._monticulo, (peso, palabra))
+        else:
+            minimo, expulsada = self._expulsar_minimo()
+            del self.cuentas[expulsada], self.errores[expulsada]
+            self.cuentas[palabra] = minimo + peso
+            self.errores[palabra] = minimo
+            heapq.heappush(self._monticulo, (minimo + peso, palabra))
+
+    def _expulsar_minimo(self) -> Tuple[int, str]:
+        while True:
+            cuenta, palabra = self._monticulo[0]
+            actual = self.cuentas[palabra]
+            if actual == cuenta:
+                return heapq.heappop(self._monticulo)
+            heapq.heapreplace(self._monticulo, (actual, palabra))
+
+    def fusionar(self, otro: SpaceSaving) -> SpaceSaving:
+        """
+        Suma al resumen otro resumen con la misma capacidad, por ejemplo el de otro trozo del texto.
+
+        Una palabra que falta en un resumen lleno pudo aparecer hasta su cuenta mínima veces, así que
+        se le suma esa cuenta (también como error). Después se conservan las `capacidad` palabras con
+        mayor cuenta; la cota total / capacidad se mantiene.
+
+        :param otro: Resumen a sumar; no se modifica.
+        :return: Este mismo resumen.
+        :raise ValueError: Si las capacidades son distintas.
+        """
+        if otro.capacidad != self.capacidad:
+            raise ValueError("Solo se pueden fusionar resúmenes con la misma capacidad.")
+        minimo = min(self.cuentas.values()) if len(self.cuentas) == self.capacidad else 0
+        minimo_otro = min(otro.cuentas.values()) if len(otro.cuentas) == otro.capacidad else 0
+        cuentas, errores = {}, {}
+        for palabra in chain(self.cuentas, (p for p in otro.cuentas if p not in self.cuentas)):
+            cuentas[palabra] = self.cuentas.get(palabra, minimo) + otro.cuentas.get(palabra, minimo_otro)
+            errores[palabra] = self.errores.get(palabra, minimo) + otro.errores.get(palabra, minimo_otro)
+        if len(cuentas) > self.capacidad:
+            conservadas = set(p for p, _ in heapq.nlargest(self.capacidad, cuentas.items(), key=itemgetter(1)))
+            cuentas = {p: c for p, c in cuentas.items() if p in conservadas}
+        self.cuentas = cuentas
+        self.errores = {p: errores[p] for p in cuentas}
+        self.total += otro.total
+        self._monticulo = [(c, p) for p, c in cuentas.items()]
+        heapq.heapify(self._monticulo)
+        return self
+
+    def mas_comunes(self, n: int) -> ResultadoAproximado:
+        """
+        Devuelve las n palabras con mayor estimación junto con sus cotas de error.
+
+        :param n: Número de palabras.
+        :return: Resultado con las estimaciones y la garantía de error.
+        """
+        palabras = heapq.nlargest(n, self.cuentas.items(), key=itemgetter(1))
+        return ResultadoAproximado(palabras, [self.errores[p] for p, _ in palabras], self.total,
+                                   self.error_maximo, 0.0)
+
+class CountMinSketch:
+    """
+    Count-Min sketch (Cormode y Muthukrishnan) con un montículo de candidatos para las más frecuentes.
+
+    Es una matriz de `profundidad` filas por `ancho` columnas de contadores; cada palabra suma en una
+    columna de cada fila elegida por hash y su estimación es el mínimo de esas casillas. La estimación
+    nunca queda por debajo de la frecuencia real y, con probabilidad 1 - e^-profundidad, la supera como
+    mucho en e·total / ancho. Como la matriz no guarda las palabras, se conservan aparte las
+    `candidatos` palabras con mayor estimación.
+
+    Los hashes se calculan con blake2b, así que son los mismos en todos los procesos y dos sketches
+    con las mismas dimensiones y semilla se pueden sumar.
+    """
+    def __init__(self, ancho: int, profundidad: int, candidatos: int = 100, semilla: int = 0):
+        if ancho < 1 or profundidad < 1 or candidatos < 1:
+            raise ValueError("El ancho, la profundidad y los candidatos tienen que ser mayores o iguales que 1.")
+        self.ancho: int = ancho
+        self.profundidad: int = profundidad
+        self.num_candidatos: int = candidatos
+        self.semilla: int = semilla
+        self.total: int = 0
+        self.tabla: np.ndarray = np.zeros((profundidad, ancho), dtype=np.int64)
+        self.candidatos: Dict[str, int] = {}
+
+    @staticmethod
+    def of(ancho: int, profundidad: int, candidatos: int = 100, semilla: int = 0) -> CountMinSketch:
+        """
+        Método de factoría para crear un Count-Min sketch vacío.
+
+        :param ancho: Columnas de la matriz.
+        :param profundidad: Filas de la matriz (funciones hash).
+        :param candidatos: Número de palabras más frecuentes que se conservan.
+        :param semilla: Semilla de las funciones hash.
+        :return: Nuevo sketch.
+        """
+        return CountMinSketch(ancho, profundidad, candidatos, semilla)
+
+    @staticmethod
+    def desde_error(error: float, probabilidad_fallo: float = 0.01, memoria: Optional[int] = None,
+                    candidatos: int = 100, semilla: int = 0) -> CountMinSketch:
+        """
+        Crea un sketch cuyas estimaciones sobrestiman como mucho en error·total con la probabilidad dada.
+
+        :param error: Error relativo máximo (0 < error < 1).
+        :param probabilidad_fallo: Probabilidad admitida de superar la cota (0 < probabilidad_fallo < 1).
+        :param memoria: Número máximo de contadores de la matriz; si es menor que el necesario se reduce
+            el ancho y la cota de error crece en proporción.
+        :param candidatos: Número de palabras más frecuentes que se conservan.
+        :param semilla: Semilla de las funciones hash.
+        :return: Nuevo sketch.
+        :raise ValueError: Si el error o la probabilidad no están entre 0 y 1, o la memoria no da ni para una columna.
+        """
+        if not 0 < error < 1 or not 0 < probabilidad_fallo < 1:
+            raise ValueError("El error y la probabilidad de fallo tienen que estar entre 0 y 1.")
+        ancho = math.ceil(math.e / error)
+        profundidad = math.ceil(math.log(1 / probabilidad_fallo))
+        if memoria is not None:
+            if memoria < profundidad:
+                raise ValueError(f"Hacen falta al menos {profundidad} contadores para esa probabilidad de fallo.")
+            ancho = min(ancho, memoria // profundidad)
+        return CountMinSketch(ancho, profundidad, candidatos, semilla)
+
+    @property
+    def error_maximo(self) -> float:
+        return math.e * self.total / self.ancho
+
+    @property
+    def probabilidad_fallo(self) -> float:
+        return math.exp(-self.profundidad)
+
+    def _columnas(self, palabras: List[str]) -> np.ndarray:
+        """
+        Columna de cada palabra en cada fila, con doble hash: h1 + i·h2 (mod ancho).
+        """
+        clave = self.semilla.to_bytes(8, 'little', signed=True)
+        resumenes = b''.join(hashlib.blake2b(p.encode('utf-8'), digest_size=16, key=clave).digest()
+                             for p in palabras)
+        h = np.frombuffer(resumenes, dtype='<u8').reshape(-1, 2)
+        filas = np.arange(self.profundidad, dtype=np.uint64)
+        return ((h[:, :1] + filas * (h[:, 1:] | np.uint64(1))) % np.uint64(self.ancho)).astype(np.int64)
+
+    def estimar(self, palabras: List[str]) -> np.ndarray:
+        """
+        Estima la frecuencia de varias palabras.
+
+        :param palabras: Palabras a consultar.
+        :return: Array con la estimación de cada palabra.
+        """
+        if not palabras:
+            return np.empty(0, dtype=np.int64)
+        columnas = self._columnas(palabras)
+        return self.tabla[np.arange(self.profundidad), columnas].min(axis=1)
+
+    def actualizar(self, palabras: Iterable[str]) -> None:
+        """
+        Añade un lote de palabras: actualiza la matriz y recalcula los candidatos.
+
+        :param palabras: Palabras leídas.
+        """
+        cuentas = Counter(palabras)
+        if not cuentas:
+            return
+        nuevas = list(cuentas)
+        columnas = self._columnas(nuevas)
+        filas = np.broadcast_to(np.arange(self.profundidad), columnas.shape)
+        pesos = np.broadcast_to(np.fromiter(cuentas.values(), dtype=np.int64, count=len(nuevas))[:, None],
+                                columnas.shape)
+        np.add.at(self.tabla, (filas, columnas), pesos)
+        self.total += sum(cuentas.values())
+        self._recalcular_candidatos(nuevas)
+
+    def _recalcular_candidatos(self, nuevas: Iterable[str]) -> None:
+        # Las estimaciones de los candidatos antiguos también pueden haber crecido por colisiones
+        claves = list(chain(self.candidatos, (p for p in nuevas if p not in self.candidatos)))
+        estimaciones = self.estimar(claves).tolist()
+        mejores = heapq.nlargest(self.num_candidatos, zip(claves, estimaciones), key=itemgetter(1))
+        conservadas = set(p for p, _ in mejores)
+        self.candidatos = {p: e for p, e in zip(claves, estimaciones) if p in conservadas}
+
+    def fusionar(self, otro: CountMinSketch) -> CountMinSketch:
+        """
+        Suma al sketch otro sketch con las mismas dimensiones y semilla.
+
+        :param otro: Sketch a sumar; no se modifica.
+        :return: Este mismo sketch.
+        :raise ValueError: Si las dimensiones o la semilla no coinciden.
+        """
+        if (otro.ancho, otro.profundidad, otro.semilla) != (self.ancho, self.profundidad, self.semilla):
+            raise ValueError("Solo se pueden fusionar sketches con las mismas dimensiones y semilla.")
+        self.tabla += otro.tabla
+        self.total += otro.total
+        self._recalcular_candidatos(otro.candidatos)
+        return self
+
+    def mas_comunes(self, n: int) -> ResultadoAproximado:
+        """
+        Devuelve las n palabras candidatas con mayor estimación junto con la garantía de error.
+
+        :param n: Número de palabras (como mucho, el número de candidatos).
+        :return: Resultado con las estimaciones y la garantía de error.
+        """
+        palabras = heapq.nlargest(n, self.candidatos.items(), key=itemgetter(1))
+        cota = math.floor(self.error_maximo)
+        return ResultadoAproximado(palabras, [min(cota, e) for _, e in palabras], self.total,
+                                   self.error_maximo, self.probabilidad_fallo)
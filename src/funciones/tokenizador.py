@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+import re
+import string
+import unicodedata
+
+# Tamaño en caracteres de cada bloque leído de un fichero
+TAM_BLOQUE = 1 << 20
+# Espacios ASCII: un bloque se puede cortar en cualquiera de ellos sin partir una palabra de str.split()
+ESPACIOS = ' \n\t\r\x0b\x0c'
+
+PLEGADOS = ('minusculas', 'casefold', None)
+MODOS_PUNTUACION = ('ascii', 'unicode', None)
+
+# Todo lo que no es letra, número ni espacio (incluidos ¿ ¡ « » — …) y el guion bajo, que \w sí incluye
+NO_PALABRA = re.compile(r'[^\w\s]|_')
+NO_PALABRA_NO_ASCII = re.compile(r'[^\w\s\x00-\x7f]')
+# Los mismos caracteres restringidos a ASCII, que se pueden borrar sobre los bytes UTF-8
+PUNTUACION_ASCII = string.punctuation.encode('ascii')
+NO_PALABRA_ASCII = bytes(c for c in range(128) if NO_PALABRA.match(chr(c)))
+
+def _borrar_signo(coincidencia: re.Match) -> str:
+    # \w no incluye las marcas combinadas (categoría M), que forman parte de la letra anterior
+    signo = coincidencia.group()
+    return signo if unicodedata.category(signo).startswith('M') else ''
+
+class Tokenizador:
+    """
+    Divide texto en palabras (como str.split()) después de plegar mayúsculas y minúsculas y de quitar
+    los signos de puntuación, según la configuración:
+
+    - plegado: 'minusculas' (str.lower), 'casefold' (str.casefold, que además iguala ß y ss) o None.
+    - puntuacion: 'ascii' borra los signos de string.punctuation; 'unicode' borra cualquier carácter
+      que no sea letra, número ni espacio (¿, ¡, «, —, …) y el guion bajo; None no borra nada.
+
+    Los signos se borran, no separan palabras: "¿qué?" da "qué" y "a-b" da "ab". Los acentos y la ñ se
+    conservan. Con puntuación 'unicode' o plegado 'casefold' el texto se pasa antes a la forma NFC de
+    Unicode, así que "cafe" seguido de un acento combinado (U+0301) da la misma palabra que "café", y
+    las marcas combinadas sin forma compuesta no se borran como signos. Los demás modos no cambian la
+    forma Unicode del texto, como str.lower y string.punctuation. Los signos ASCII se borran con
+    bytes.translate sobre el texto en UTF-8 (los bytes ASCII nunca forman parte de un carácter
+    multibyte) y los demás con una expresión regular precompilada, solo si el texto tiene caracteres
+    no ASCII.
+    """
+    def __init__(self, plegado: Optional[str] = 'minusculas', puntuacion: Optional[str] = 'ascii',
+                 tam_bloque: int = TAM_BLOQUE):
+        if plegado not in PLEGADOS:
+            raise ValueError(f"Plegado desconocido: {plegado}. Opciones: {PLEGADOS}")
+        if puntuacion not in MODOS_PUNTUACION:
+            raise ValueError(f"Modo de puntuación desconocido: {puntuacion}. Opciones: {MODOS_PUNTUACION}")
+        if tam_bloque < 1:
+            raise ValueError("El tamaño de bloque tiene que ser positivo.")
+        self.plegado: Optional[str] = plegado
+        self.puntuacion: Optional[str] = puntuacion
+        self.tam_bloque: int = tam_bloque
+
+    @staticmethod
+    def of(plegado: Optional[str] = 'minusculas', puntuacion: Optional[str] = 'ascii',
+           tam_bloque: int = TAM_BLOQUE) -> Tokenizador:
+        """
+        Método de factoría para crear un tokenizador.
+
+        :param plegado: 'minusculas', 'casefold' o None.
+        :param puntuacion: 'ascii', 'unicode' o None.
+        :param tam_bloque: Número de caracteres leídos en cada bloque de un fichero.
+        :return: Nuevo tokenizador.
+        """
+        return Tokenizador(plegado, puntuacion, tam_bloque)
+
+    @property
+    def clave(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Configuración que determina las palabras obtenidas (no depende del tamaño de bloque).
+        """
+        return self.plegado, self.puntuacion
+
+    def __eq__(self, otro: object) -> bool:
+        return isinstance(otro, Tokenizador) and self.clave == otro.clave
+
+    def __hash__(self) -> int:
+        return hash(self.clave)
+
+    def __repr__(self) -> str:
+        return f"Tokenizador(plegado={self.plegado!r}, puntuacion={self.puntuacion!r})"
+
+    def normalizar(self, texto: str) -> str:
+        """
+        Pliega mayúsculas y borra los signos de puntuación, sin dividir el texto.
+        """
+        if (self.puntuacion == 'unicode' or self.plegado == 'casefold') and not texto.isascii():
+            texto = unicodedata.normalize('NFC', texto)
+        if self.plegado == 'minusculas':
+            texto = texto.lower()
+        elif self.plegado == 'casefold':
+            texto = texto.casefold()
+        if self.puntuacion is None:
+            return texto
+        borrar = PUNTUACION_ASCII if self.puntuacion == 'ascii' else NO_PALABRA_ASCII
+        texto = texto.encode('utf-8').translate(None, borrar).decode('utf-8')
+        if self.puntuacion == 'unicode' and not texto.isascii():
+            texto = NO_PALABRA_NO_ASCII.sub(_borrar_signo, texto)
+        return texto
+
+    def tokenizar(self, texto: str) -> List[str]:
+        """
+        Palabras de un texto completo.
+
+        :param texto: Texto a dividir.
+        :return: Lista de palabras en orden.
+        """
+        return self.normalizar(texto).split()
+
+    def bloques(self, fuente: Union[TextIO, Iterable[str]]) -> Iterator[List[str]]:
+        """
+        Devuelve perezosamente, bloque a bloque, las palabras de un fichero o de un flujo de trozos de texto.
+
+        Cada bloque se corta en su último espacio y el resto se arrastra al siguiente, así que ninguna
+        palabra queda partida y el resultado es el mismo que tokenizar el texto completo, pero la
+        memoria usada solo depende del tamaño de bloque.
+
+        :param fuente: Fichero abierto en modo texto (se lee en bloques de tam_bloque caracteres) o
+            cualquier iterable de cadenas, por ejemplo un flujo sin fin.
+        :return: Iterador de listas de palabras.
+        """
+        if hasattr(fuente, 'read'):
+            leer = fuente.read
+            fuente = iter(lambda: leer(self.tam_bloque), "")
+        pendiente = ""
+        for bloque in fuente:
+            texto = pendiente + bloque
+            corte = max(texto.rfind(espacio) for espacio in ESPACIOS)
+            if corte < 0:  # No hay ningún espacio: todo el bloque es parte de una palabra
+                pendiente = texto
+                continue
+            pendiente = texto[corte:]
+            yield self.tokenizar(texto[:corte])
+        if pendiente:
+            yield self.tokenizar(pendiente)
+
+    def tokens(self, fuente: Union[TextIO, Iterable[str]]) -> Iterator[str]:
+        """
+        Devuelve perezosamente las palabras de un fichero o flujo de texto de una en una (ver bloques).
+        """
+        for palabras in self.bloques(fuente):
+            yield from palabras
+
+# Palabras tal cual, separadas por espacios (str.split())
+TOKENIZADOR_ESPACIOS = Tokenizador(None, None)
+# Palabras en minúsculas y sin los signos de string.punctuation, como en palabrasMasComunes
+TOKENIZADOR_PALABRAS = Tokenizador('minusculas', 'ascii')
+# Palabras en minúsculas y sin ningún signo de puntuación Unicode (¿ ¡ « » …)
+TOKENIZADOR_UNICODE = Tokenizador('minusculas', 'unicode')
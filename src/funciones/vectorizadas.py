@@ -0,0 +1,46 @@
+from typing import Callable
+import numpy as np
+
+from funciones.funciones import producto_descendente, producto_geometrico, combinatorio, stirling
+from funciones.examen1 import p2, c2, s2
+from funciones.newton import newton_raphson
+
+def vectorizar(funcion: Callable, num_argumentos: int) -> Callable[..., np.ndarray]:
+    """
+    Convierte una función escalar en otra que acepta arrays de NumPy (con broadcasting) y devuelve
+    un array con un resultado por elemento.
+
+    Los resultados se guardan en arrays de tipo object para conservar los enteros exactos de Python,
+    que pueden superar los 64 bits. Si algún elemento no es válido se propaga el ValueError.
+
+    :param funcion: Función escalar pura.
+    :param num_argumentos: Número de argumentos de la función.
+    :return: Versión vectorizada de la función.
+    """
+    ufunc = np.frompyfunc(funcion, num_argumentos, 1)
+
+    def vectorizada(*argumentos) -> np.ndarray:
+        return np.asarray(ufunc(*argumentos), dtype=object)
+    vectorizada.__name__ = f"{funcion.__name__}_v"
+    vectorizada.__doc__ = f"Versión vectorizada de {funcion.__name__}."
+    return vectorizada
+
+producto_descendente_v = vectorizar(producto_descendente, 2)
+producto_geometrico_v = vectorizar(producto_geometrico, 3)
+combinatorio_v = vectorizar(combinatorio, 2)
+stirling_v = vectorizar(stirling, 2)
+p2_v = vectorizar(p2, 3)
+c2_v = vectorizar(c2, 2)
+s2_v = vectorizar(s2, 2)
+
+def newton_v(a: np.ndarray, error: float, max_iteraciones: int = 100) -> np.ndarray:
+    """
+    Versión vectorizada de newton para f(x) = 2x^2+2x-3: itera todos los valores iniciales a la vez
+    con newton_raphson y deja de actualizar cada uno en cuanto |f(x)| <= error.
+
+    :param a: Array de valores iniciales.
+    :param error: Error máximo admitido en |f(x)|.
+    :param max_iteraciones: Número máximo de iteraciones.
+    :return: Array de aproximaciones de la raíz (las que no convergen se quedan en su última iteración).
+    """
+    return newton_raphson(lambda x: 2*x**2 + 2*x - 3, a, lambda x: 4*x + 2, error, max_iteraciones).raices
@@ -0,0 +1,223 @@
+"""
+Generador de redes sintéticas para pruebas de escala.
+
+Escribe ficheros con el mismo formato que leen Red_social.parse (usuarios.txt y relaciones.txt)
+y RedGenica.parse (genes.txt y red_genes.txt). Las aristas se generan y se escriben una a una,
+por lo que no hace falta tener el grafo completo en memoria.
+
+Uso desde la línea de comandos:
+    python generador.py red_social usuarios.txt relaciones.txt --aristas 1000000 --topologia barabasi_albert
+    python generador.py red_genica genes.txt red_genes.txt --aristas 100000 --semilla 7
+    python generador.py red_genica genes.txt red_genes.txt --aristas 1000000 --aciclica
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import date, timedelta
+from typing import Iterator, Tuple, Optional
+import argparse
+import math
+import random
+
+TOPOLOGIAS = ('erdos_renyi', 'barabasi_albert', 'small_world')
+
+LETRAS_DNI = "TRWAGMYFPDXBNJZSQVHLCKE"
+NOMBRES = ("Ana", "Carlos", "David", "Elena", "Jorge", "Juan", "Laura", "Lucia", "Maria", "Pedro")
+APELLIDOS = ("Diaz", "Fernandez", "Gomez", "Hernandez", "Lopez", "Martinez", "Rodriguez", "Sanchez")
+TIPOS_GEN = ("oncogen", "supresor tumoral")
+
+def aristas_erdos_renyi(num_vertices: int, num_aristas: int, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    Genera las aristas de un grafo aleatorio G(n, p) con p elegido para obtener de media num_aristas.
+    Usa el método de saltos geométricos de Batagelj y Brandes, que no guarda las aristas ya generadas.
+
+    :param num_vertices: Número de vértices.
+    :param num_aristas: Número esperado de aristas.
+    :param rng: Generador de números aleatorios.
+    :return: Iterador de pares (origen, destino) con origen > destino.
+    """
+    p = num_aristas / (num_vertices * (num_vertices - 1) / 2)
+    if p >= 1:
+        for v in range(1, num_vertices):
+            for w in range(v):
+                yield v, w
+        return
+    log_q = math.log(1 - p)
+    v, w = 1, -1
+    while v < num_vertices:
+        w += 1 + int(math.log(1 - rng.random()) / log_q)
+        while w >= v and v < num_vertices:
+            w -= v
+            v += 1
+        if v < num_vertices:
+            yield v, w
+
+def aristas_barabasi_albert(num_vertices: int, num_aristas: int, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    Genera las aristas de un grafo de Barabási-Albert (enlace preferencial).
+
+    Cada vértice nuevo se enlaza con m = num_aristas / num_vertices vértices existentes elegidos con
+    probabilidad proporcional a su grado. Los grados se guardan en un árbol de Fenwick (un array de
+    num_vertices enteros), así que la memoria es O(n) aunque haya muchas más aristas que vértices, y
+    cada vértice se elige en O(log n) bajando por el árbol hasta el grado acumulado sorteado.
+
+    :param num_vertices: Número de vértices.
+    :param num_aristas: Número aproximado de aristas.
+    :param rng: Generador de números aleatorios.
+    :return: Iterador de pares (origen, destino).
+    """
+    m = max(1, min(num_vertices - 1, round(num_aristas / num_vertices)))
+    arbol = array('q', bytes(8 * (num_vertices + 1)))  # arbol[i]: suma de grados de (i - (i & -i), i]
+    saltos = [1 << k for k in reversed(range(num_vertices.bit_length()))]
+    total = 0
+
+    def sumar_grado(vertice: int, grado: int) -> None:
+        i = vertice + 1
+        while i <= num_vertices:
+            arbol[i] += grado
+            i += i & -i
+
+    objetivos = list(range(m))
+    for origen in range(m, num_vertices):
+        for destino in objetivos:
+            yield origen, destino
+            sumar_grado(destino, 1)
+        sumar_grado(origen, m)
+        total += 2 * m
+        elegidos = set()
+        while len(elegidos) < m:
+            # Bajada por el árbol hasta el primer vértice cuyo grado acumulado supera el valor sorteado
+            acumulado, posicion = rng.randrange(total), 0
+            for salto in saltos:
+                siguiente = posicion + salto
+                if siguiente <= num_vertices and arbol[siguiente] <= acumulado:
+                    posicion = siguiente
+                    acumulado -= arbol[siguiente]
+            elegidos.add(posicion)
+        objetivos = list(elegidos)
+
+def aristas_small_world(num_vertices: int, num_aristas: int, rng: random.Random,
+                        probabilidad: float = 0.1) -> Iterator[Tuple[int, int]]:
+    """
+    Genera las aristas de un grafo de mundo pequeño de Watts-Strogatz.
+
+    Parte de un anillo en el que cada vértice se une a sus k/2 siguientes y recablea cada arista con
+    la probabilidad dada. Puede producir alguna arista repetida, que los parsers simplemente sobrescriben.
+
+    :param num_vertices: Número de vértices.
+    :param num_aristas: Número aproximado de aristas.
+    :param rng: Generador de números aleatorios.
+    :param probabilidad: Probabilidad de recablear cada arista.
+    :return: Iterador de pares (origen, destino).
+    """
+    mitad_k = max(1, min((num_vertices - 1) // 2, round(num_aristas / num_vertices)))
+    for origen in range(num_vertices):
+        for salto in range(1, mitad_k + 1):
+            destino = (origen + salto) % num_vertices
+            if rng.random() < probabilidad:
+                destino = rng.randrange(num_vertices - 1)
+                if destino >= origen:
+                    destino += 1
+            yield origen, destino
+
+def aristas(topologia: str, num_vertices: int, num_aristas: int, rng: random.Random) -> Iterator[Tuple[int, int]]:
+    """
+    Devuelve el generador de aristas de la topología indicada.
+
+    :raise ValueError: Si la topología no existe o los tamaños no son válidos.
+    """
+    if num_vertices < 2:
+        raise ValueError("El grafo necesita al menos 2 vértices.")
+    if num_aristas < 1:
+        raise ValueError("El número de aristas tiene que ser positivo.")
+    if topologia == 'erdos_renyi':
+        return aristas_erdos_renyi(num_vertices, num_aristas, rng)
+    if topologia == 'barabasi_albert':
+        return aristas_barabasi_albert(num_vertices, num_aristas, rng)
+    if topologia == 'small_world':
+        return aristas_small_world(num_vertices, num_aristas, rng)
+    raise ValueError(f"Topología desconocida: {topologia}. Opciones: {', '.join(TOPOLOGIAS)}")
+
+def dni(i: int) -> str:
+    """
+    Devuelve un DNI válido y distinto para cada índice de 0 a 10^8 - 1, sin guardar los ya usados.
+    """
+    numero = (i * 48271 + 12345) % 10**8  # 48271 es primo con 10^8, así que la función es biyectiva
+    return f"{numero:08d}{LETRAS_DNI[numero % 23]}"
+
+def nombre_gen(i: int) -> str:
+    return f"GEN{i}"
+
+def generar_red_social(f_usuarios: str, f_relaciones: str, num_aristas: int, num_vertices: Optional[int] = None,
+                       topologia: str = 'erdos_renyi', semilla: Optional[int] = None) -> None:
+    """
+    Escribe una red social sintética en el formato de Red_social.parse.
+
+    :param f_usuarios: Fichero de usuarios a escribir.
+    :param f_relaciones: Fichero de relaciones a escribir.
+    :param num_aristas: Número aproximado de relaciones.
+    :param num_vertices: Número de usuarios (por defecto, una décima parte de las relaciones).
+    :param topologia: Una de TOPOLOGIAS.
+    :param semilla: Semilla para reproducir el mismo fichero.
+    """
+    rng = random.Random(semilla)
+    num_vertices = num_vertices or max(2, num_aristas // 10)
+    if num_vertices > 10**8:
+        raise ValueError("Como mucho se pueden generar 10^8 usuarios con DNI distinto.")
+    generador = aristas(topologia, num_vertices, num_aristas, rng)
+    inicio = date(1940, 1, 1)
+    with open(f_usuarios, "w", encoding="utf-8") as file:
+        for i in range(num_vertices):
+            fecha = inicio + timedelta(days=rng.randrange(65 * 365))
+            file.write(f"{dni(i)},{rng.choice(NOMBRES)},{rng.choice(APELLIDOS)},{fecha.isoformat()}\n")
+    with open(f_relaciones, "w", encoding="utf-8") as file:
+        for origen, destino in generador:
+            file.write(f"{dni(origen)},{dni(destino)},{rng.randint(1, 100)},{rng.randint(1, 365)}\n")
+
+def generar_red_genica(f_genes: str, f_relaciones: str, num_aristas: int, num_vertices: Optional[int] = None,
+                       topologia: str = 'erdos_renyi', semilla: Optional[int] = None, aciclica: bool = False) -> None:
+    """
+    Escribe una red génica sintética en el formato de RedGenica.parse.
+
+    :param f_genes: Fichero de genes a escribir.
+    :param f_relaciones: Fichero de relaciones entre genes a escribir.
+    :param num_aristas: Número aproximado de relaciones.
+    :param num_vertices: Número de genes (por defecto, una décima parte de las relaciones).
+    :param topologia: Una de TOPOLOGIAS.
+    :param semilla: Semilla para reproducir el mismo fichero.
+    :param aciclica: Si es True, cada relación va del gen con menor rango al de mayor rango en un
+        orden aleatorio de los genes, así que leída como red dirigida no tiene ciclos.
+    """
+    rng = random.Random(semilla)
+    num_vertices = num_vertices or max(2, num_aristas // 10)
+    generador = aristas(topologia, num_vertices, num_aristas, rng)
+    if aciclica:
+        rangos = list(range(num_vertices))
+        rng.shuffle(rangos)
+        generador = ((origen, destino) if rangos[origen] < rangos[destino] else (destino, origen)
+                     for origen, destino in generador if origen != destino)
+    with open(f_genes, "w", encoding="utf-8") as file:
+        for i in range(num_vertices):
+            loc = f"{rng.randint(1, 22)}{rng.choice('pq')}{rng.randint(11, 36)}.{rng.randint(1, 3)}"
+            file.write(f"{nombre_gen(i)},{rng.choice(TIPOS_GEN)},{rng.randint(0, 300)},{loc}\n")
+    with open(f_relaciones, "w", encoding="utf-8") as file:
+        for origen, destino in generador:
+            file.write(f"{nombre_gen(origen)},{nombre_gen(destino)},{rng.uniform(-1, 1):.2f}\n")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generador de redes sintéticas.")
+    parser.add_argument("tipo", choices=("red_social", "red_genica"))
+    parser.add_argument("f_vertices", help="Fichero de usuarios o de genes")
+    parser.add_argument("f_aristas", help="Fichero de relaciones")
+    parser.add_argument("--aristas", type=int, default=1000, help="Número aproximado de aristas (10^3 a 10^8)")
+    parser.add_argument("--vertices", type=int, default=None, help="Número de vértices")
+    parser.add_argument("--topologia", choices=TOPOLOGIAS, default='erdos_renyi')
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--aciclica", action="store_true", help="Relaciones génicas sin ciclos (red_genica)")
+    args = parser.parse_args()
+
+    if args.tipo == "red_social":
+        generar_red_social(args.f_vertices, args.f_aristas, args.aristas, args.vertices, args.topologia, args.semilla)
+    else:
+        generar_red_genica(args.f_vertices, args.f_aristas, args.aristas, args.vertices, args.topologia, args.semilla,
+                           args.aciclica)
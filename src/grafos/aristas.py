@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from typing import TypeVar, Generic, Dict, List, Set, Optional, Callable, Union
+import numpy as np
+
+from grafo import Grafo
+
+V = TypeVar('V')  # Tipo de los vértices
+E = TypeVar('E')  # Tipo de las aristas
+
+Predicado = Union[str, Callable[[Dict[str, np.ndarray]], np.ndarray]]
+
+class TablaAristas(Generic[V, E]):
+    """
+    Tabla de aristas de un grafo con los atributos numéricos guardados por columnas.
+
+    Las aristas se ordenan por vértice de origen (formato CSR): las de un vértice i ocupan las
+    posiciones desplazamientos[i]:desplazamientos[i+1] de todos los arrays.
+    """
+    def __init__(self, grafo: Grafo[V, E]):
+        self.es_dirigido: bool = grafo.es_dirigido
+        self.vertices: List[V] = list(grafo.adyacencias.keys())
+        self.indices: Dict[V, int] = {v: i for i, v in enumerate(self.vertices)}
+        self.aristas: List[E] = []
+
+        desplazamientos = [0]
+        destinos: List[int] = []
+        for destinos_vertice in grafo.adyacencias.values():
+            for destino, arista in destinos_vertice.items():
+                destinos.append(self.indices[destino])
+                self.aristas.append(arista)
+            desplazamientos.append(len(destinos))
+        self.desplazamientos: np.ndarray = np.array(desplazamientos, dtype=np.int64)
+        self.destinos: np.ndarray = np.array(destinos, dtype=np.int64)
+        self.columnas: Dict[str, np.ndarray] = TablaAristas._columnas(self.aristas)
+
+    @staticmethod
+    def of(grafo: Grafo[V, E]) -> TablaAristas[V, E]:
+        """
+        Método de factoría para crear la tabla de aristas de un grafo.
+
+        :param grafo: Grafo del que se extraen las aristas. Cambios posteriores no se reflejan en la tabla.
+        :return: Nueva tabla de aristas.
+        """
+        return TablaAristas(grafo)
+
+    @staticmethod
+    def _columnas(aristas: List[E]) -> Dict[str, np.ndarray]:
+        """
+        Extrae una columna por cada atributo numérico de las aristas. Si las aristas son números
+        se devuelve una única columna llamada 'peso'.
+        """
+        if not aristas:
+            return {}
+        muestra = aristas[0]
+        if isinstance(muestra, (int, float)) and not isinstance(muestra, bool):
+            return {'peso': np.array(aristas)}
+        if not is_dataclass(muestra):
+            return {}
+        columnas = {}
+        for campo in fields(muestra):
+            if not campo.name.startswith("_") and isinstance(getattr(muestra, campo.name), (int, float)):
+                columnas[campo.name] = np.array([getattr(a, campo.name) for a in aristas])
+        return columnas
+
+    @property
+    def num_aristas(self) -> int:
+        return len(self.destinos)
+
+    def mascara(self, predicado: Predicado) -> np.ndarray:
+        """
+        Calcula en una sola pasada vectorizada qué aristas cumplen un predicado.
+
+        :param predicado: Expresión sobre los nombres de las columnas, por ejemplo "dias_activa > 30"
+            o "abs(conexion) > 0.5", o bien una función que recibe el diccionario de columnas.
+        :return: Array booleano alineado con la tabla de aristas.
+        :raise ValueError: Si el predicado no produce un booleano por arista.
+        """
+        if isinstance(predicado, str):
+            entorno = {'__builtins__': {}, 'np': np, 'abs': np.abs}
+            resultado = eval(predicado, entorno, dict(self.columnas))
+        else:
+            resultado = predicado(self.columnas)
+        resultado = np.asarray(resultado)
+        if resultado.dtype != np.bool_ or resultado.shape != self.destinos.shape:
+            raise ValueError("El predicado debe devolver un valor booleano por cada arista.")
+        return resultado
+
+    def filter_edges(self, predicado: Predicado) -> VistaAristas[V, E]:
+        """
+        Devuelve una vista del grafo con solo las aristas que cumplen el predicado, sin copiar el grafo.
+
+        :param predicado: Expresión o función sobre las columnas (ver mascara).
+        :return: Vista filtrada que se puede recorrer con bfs o dfs.
+        """
+        return VistaAristas(self, self.mascara(predicado))
+
+class VistaAristas(Generic[V, E]):
+    """
+    Vista de solo lectura de una tabla de aristas en la que solo son visibles las aristas marcadas
+    en una máscara booleana. Ofrece la parte de la interfaz de Grafo que usan los recorridos.
+    """
+    def __init__(self, tabla: TablaAristas[V, E], mascara: np.ndarray):
+        self.tabla: TablaAristas[V, E] = tabla
+        self.mascara_aristas: np.ndarray = mascara
+        self.es_dirigido: bool = tabla.es_dirigido
+
+    @property
+    def num_aristas(self) -> int:
+        return int(np.count_nonzero(self.mascara_aristas))
+
+    def filter_edges(self, predicado: Predicado) -> VistaAristas[V, E]:
+        """
+        Aplica un filtro adicional sobre la vista.
+
+        :param predicado: Expresión o función sobre las columnas (ver TablaAristas.mascara).
+        :return: Nueva vista con las aristas que cumplen ambos filtros.
+        """
+        return VistaAristas(self.tabla, self.mascara_aristas & self.tabla.mascara(predicado))
+
+    def _posiciones(self, vertice: V) -> np.ndarray:
+        i = self.tabla.indices.get(vertice)
+        if i is None:
+            return np.empty(0, dtype=np.int64)
+        inicio, fin = self.tabla.desplazamientos[i], self.tabla.desplazamientos[i + 1]
+        return inicio + np.flatnonzero(self.mascara_aristas[inicio:fin])
+
+    def successors(self, vertice: V) -> Set[V]:
+        """
+        Devuelve los sucesores de un vértice a través de las aristas visibles.
+
+        :param vertice: Vértice del que se buscan los sucesores.
+        :return: Conjunto de sucesores.
+        """
+        vertices = self.tabla.vertices
+        return {vertices[j] for j in self.tabla.destinos[self._posiciones(vertice)].tolist()}
+
+    def edge_weight(self, origen: V, destino: V) -> Optional[E]:
+        """
+        Devuelve la arista visible entre dos vértices.
+
+        :param origen: Vértice de origen.
+        :param destino: Vértice de destino.
+        :return: Arista, o None si no existe o está filtrada.
+        """
+        j = self.tabla.indices.get(destino)
+        for posicion in self._posiciones(origen).tolist():
+            if self.tabla.destinos[posicion] == j:
+                return self.tabla.aristas[posicion]
+        return None
+
+    def edge_exists(self, origen: V, destino: V) -> bool:
+        """
+        Verifica si existe una arista visible entre dos vértices.
+        """
+        return self.edge_weight(origen, destino) is not None
+
+    def vertices(self) -> Set[V]:
+        """
+        Devuelve el conjunto de vértices (el filtro solo afecta a las aristas).
+        """
+        return set(self.tabla.vertices)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TypeVar, Generic, Any, Dict, Hashable, List, Optional, Set, Tuple
+
+import recorridos
+from grafo import Grafo
+
+V = TypeVar('V')  # Tipo de los vértices
+
+ALGORITMOS = ('bfs', 'dfs')  # Funciones de recorridos.py que se pueden cachear
+
+class CacheCaminos(Generic[V]):
+    """
+    Caché LRU de consultas de caminos sobre un grafo, con clave (origen, destino, algoritmo, versión).
+
+    Cada cambio del grafo (add_vertex, add_edge) aumenta grafo.version; en la siguiente consulta la
+    caché ve que la versión ha cambiado y se vacía, porque ninguna entrada anterior sirve ya. Los
+    cambios hechos sin pasar por esos métodos (por ejemplo, tocando adyacencias a mano) no se detectan.
+
+    Cuando desde un mismo origen se piden caminos bfs a umbral_arbol destinos distintos, se guarda
+    el árbol completo del BFS desde ese origen (recorridos.bfs_arbol), que responde a cualquier
+    destino con el mismo camino que bfs. La capacidad se mide en vértices guardados: un camino ocupa
+    su longitud y un árbol, el número de vértices alcanzados.
+
+    Uso:
+        cache = CacheCaminos.of(red)
+        cache.camino(a, b)  # Igual que recorridos.bfs(red, a, b)
+    """
+    def __init__(self, grafo: Grafo[V, Any], capacidad: int = 1_000_000, umbral_arbol: Optional[int] = 3):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la caché tiene que ser positiva.")
+        self.grafo: Grafo[V, Any] = grafo
+        self.capacidad: int = capacidad
+        self.umbral_arbol: Optional[int] = umbral_arbol  # None para no guardar árboles
+        self.version: int = getattr(grafo, 'version', 0)
+        self._entradas: OrderedDict[Tuple[Hashable, ...], Tuple[Any, int]] = OrderedDict()  # Clave -> (valor, tamaño)
+        self._ocupado: int = 0
+        self._destinos_por_origen: Dict[V, int] = {}  # Consultas bfs falladas por origen en esta versión
+        self._sin_arbol: Set[V] = set()  # Orígenes cuyo árbol no cabe en la caché
+        self.aciertos: int = 0
+        self.aciertos_arbol: int = 0
+        self.fallos: int = 0
+        self.invalidaciones: int = 0
+
+    @staticmethod
+    def of(grafo: Grafo[V, Any], capacidad: int = 1_000_000, umbral_arbol: Optional[int] = 3) -> CacheCaminos[V]:
+        """
+        Método de factoría para crear una caché de caminos.
+
+        :param grafo: Grafo sobre el que se hacen las consultas.
+        :param capacidad: Número máximo de vértices guardados entre todos los caminos y árboles.
+        :param umbral_arbol: Destinos distintos pedidos desde un origen a partir de los que se guarda
+            su árbol BFS, o None para no guardar árboles.
+        :return: Caché vacía.
+        :raise ValueError: Si la capacidad no es positiva.
+        """
+        return CacheCaminos(grafo, capacidad, umbral_arbol)
+
+    def camino(self, origen: V, destino: V, algoritmo: str = 'bfs') -> List[V]:
+        """
+        Devuelve el camino de origen a destino calculado con recorridos.bfs o recorridos.dfs, o el de
+        la caché si ya se había pedido en la versión actual del grafo.
+
+        :param origen: Vértice inicial.
+        :param destino: Vértice de destino.
+        :param algoritmo: 'bfs' o 'dfs'.
+        :return: Lista de vértices del camino, o [] si no hay camino.
+        :raise ValueError: Si el algoritmo no existe.
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo desconocido: {algoritmo}. Opciones: {ALGORITMOS}")
+        self._comprobar_version()
+        clave = (origen, destino, algoritmo, self.version)
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return list(entrada[0])
+        clave_arbol = (origen, None, 'bfs_arbol', self.version)
+        if algoritmo == 'bfs' and clave_arbol in self._entradas:
+            self._entradas.move_to_end(clave_arbol)
+            self.aciertos_arbol += 1
+            return recorridos.reconstruir_camino(self._entradas[clave_arbol][0], destino)
+        self.fallos += 1
+        if algoritmo == 'bfs' and self.umbral_arbol is not None and origen not in self._sin_arbol:
+            pedidos = self._destinos_por_origen.get(origen, 0) + 1
+            self._destinos_por_origen[origen] = pedidos
+            if pedidos >= self.umbral_arbol:
+                arbol = recorridos.bfs_arbol(self.grafo, origen)
+                if len(arbol) <= self.capacidad:
+                    self._guardar(clave_arbol, arbol, len(arbol))
+                else:
+                    self._sin_arbol.add(origen)
+                return recorridos.reconstruir_camino(arbol, destino)
+        camino = getattr(recorridos, algoritmo)(self.grafo, origen, destino)
+        self._guardar(clave, camino, max(1, len(camino)))
+        return list(camino)
+
+    def _comprobar_version(self) -> None:
+        version = getattr(self.grafo, 'version', 0)
+        if version != self.version:
+            self.version = version
+            if self._entradas or self._destinos_por_origen:
+                self.invalidaciones += 1
+            self.vaciar()
+
+    def _guardar(self, clave: Tuple[Hashable, ...], valor: Any, tamano: int) -> None:
+        if tamano > self.capacidad:
+            return
+        self._entradas[clave] = (valor, tamano)
+        self._ocupado += tamano
+        while self._ocupado > self.capacidad:
+            _, (_, expulsado) = self._entradas.popitem(last=False)
+            self._ocupado -= expulsado
+
+    def vaciar(self) -> None:
+        """
+        Borra todas las entradas (las estadísticas se mantienen).
+        """
+        self._entradas.clear()
+        self._destinos_por_origen.clear()
+        self._sin_arbol.clear()
+        self._ocupado = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    @property
+    def estadisticas(self) -> Dict[str, float]:
+        consultas = self.aciertos + self.aciertos_arbol + self.fallos
+        return {'aciertos': self.aciertos, 'aciertos_arbol': self.aciertos_arbol, 'fallos': self.fallos,
+                'invalidaciones': self.invalidaciones, 'entradas': len(self._entradas), 'vertices': self._ocupado,
+                'tasa_aciertos': (self.aciertos + self.aciertos_arbol) / consultas if consultas else 0.0}
@@ -0,0 +1,295 @@
+from __future__ import annotations
+
+from multiprocessing import resource_tracker, shared_memory
+from typing import TypeVar, Generic, Any, Dict, List, Optional, Set, Tuple
+import heapq
+import pickle
+import struct
+
+import numpy as np
+
+from aristas import TablaAristas
+from grafo import Grafo
+from recorridos import reconstruir_camino
+
+V = TypeVar('V')  # Tipo de los vértices
+E = TypeVar('E')  # Tipo de las aristas
+
+MAGICO = b'GRAFOCSR'
+VERSION_FORMATO = 1
+CABECERA = struct.Struct('<8sQ')  # Número mágico y longitud de los metadatos
+ALINEACION = 64
+
+def _alinear(posicion: int) -> int:
+    return -(-posicion // ALINEACION) * ALINEACION
+
+def _adjuntar_segmento(nombre: str) -> shared_memory.SharedMemory:
+    """
+    Abre un segmento existente sin registrarlo en el resource_tracker de este proceso: si no, al
+    terminar un proceso que solo lo usa se borraría el segmento de todos (antes de Python 3.13).
+    """
+    try:
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    except TypeError:
+        registrar = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=nombre)
+        finally:
+            resource_tracker.register = registrar
+
+class GrafoCompartido(Generic[V]):
+    """
+    Grafo congelado en un segmento de memoria compartida (multiprocessing.shared_memory) para que
+    varios procesos lo consulten sin tener cada uno su propia copia.
+
+    El segmento contiene la estructura CSR (desplazamientos y destinos, ver TablaAristas), una columna
+    por cada atributo numérico de las aristas y la tabla de vértices serializada con pickle. Al
+    adjuntarse, los arrays son vistas de NumPy sobre el segmento (no se copian); solo la tabla de
+    vértices se reconstruye en cada proceso, y ocupa O(V) frente a las O(E) aristas.
+
+    Ciclo de vida: un proceso lo crea con crear(grafo), los demás se adjuntan con adjuntar(nombre) y
+    al terminar llaman a cerrar(); el creador llama a liberar() cuando ya nadie lo va a usar, lo que
+    además borra el segmento. Usado en un bloque with, al salir se cierra (o se libera, si es el creador).
+    Las aristas originales no se guardan, solo sus atributos numéricos.
+    """
+    def __init__(self, memoria: shared_memory.SharedMemory, propietario: bool):
+        self.memoria: shared_memory.SharedMemory = memoria
+        self.propietario: bool = propietario
+        magico, longitud = CABECERA.unpack_from(memoria.buf, 0)
+        if magico != MAGICO:
+            raise ValueError(f"El segmento {memoria.name} no contiene un grafo compartido.")
+        metadatos = pickle.loads(memoria.buf[CABECERA.size:CABECERA.size + longitud])
+        if metadatos['version'] != VERSION_FORMATO:
+            raise ValueError(f"Versión de formato no soportada: {metadatos['version']}")
+        self.es_dirigido: bool = metadatos['es_dirigido']
+        arrays = {nombre: np.ndarray(forma, dtype=np.dtype(tipo), buffer=memoria.buf, offset=desplazamiento)
+                  for nombre, (desplazamiento, tipo, forma) in metadatos['arrays'].items()}
+        self.desplazamientos: np.ndarray = arrays.pop('desplazamientos')
+        self.destinos: np.ndarray = arrays.pop('destinos')
+        self.columnas: Dict[str, np.ndarray] = arrays
+        inicio, longitud = metadatos['vertices']
+        self.vertices_lista: List[V] = pickle.loads(memoria.buf[inicio:inicio + longitud])
+        self.indices: Dict[V, int] = {v: i for i, v in enumerate(self.vertices_lista)}
+
+    @staticmethod
+    def crear(grafo: Grafo[V, Any], nombre: Optional[str] = None) -> GrafoCompartido[V]:
+        """
+        Copia un grafo en un segmento nuevo de memoria compartida.
+
+        :param grafo: Grafo a publicar; los cambios posteriores no se reflejan en el segmento.
+        :param nombre: Nombre del segmento; por defecto lo elige el sistema.
+        :return: Grafo compartido del que este proceso es el propietario.
+        """
+        tabla = TablaAristas.of(grafo)
+        arrays = {'desplazamientos': tabla.desplazamientos, 'destinos': tabla.destinos}
+        arrays.update((nombre_columna, np.ascontiguousarray(columna))
+                      for nombre_columna, columna in tabla.columnas.items() if columna.dtype.kind in 'biuf')
+        vertices = pickle.dumps(tabla.vertices, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Posiciones relativas al comienzo de los datos, que van detrás de la cabecera y los metadatos
+        relativas: Dict[str, Tuple[int, str, Tuple[int, ...]]] = {}
+        posicion = 0
+        for nombre_array, array in arrays.items():
+            relativas[nombre_array] = (posicion, array.dtype.str, array.shape)
+            posicion = _alinear(posicion + array.nbytes)
+        tam_datos = posicion + len(vertices)
+        # Los metadatos guardan posiciones absolutas, que dependen de la longitud de los propios metadatos
+        inicio_datos = 0
+        while True:
+            metadatos = {'version': VERSION_FORMATO, 'es_dirigido': grafo.es_dirigido,
+                         'arrays': {n: (inicio_datos + d, t, f) for n, (d, t, f) in relativas.items()},
+                         'vertices': (inicio_datos + posicion, len(vertices))}
+            serializados = pickle.dumps(metadatos)
+            if CABECERA.size + len(serializados) <= inicio_datos:
+                break
+            inicio_datos = _alinear(CABECERA.size + len(serializados))
+
+        memoria = shared_memory.SharedMemory(name=nombre, create=True, size=max(1, inicio_datos + tam_datos))
+        try:
+            CABECERA.pack_into(memoria.buf, 0, MAGICO, len(serializados))
+            memoria.buf[CABECERA.size:CABECERA.size + len(serializados)] = serializados
+            for nombre_array, array in arrays.items():
+                desplazamiento, tipo, forma = metadatos['arrays'][nombre_array]
+                np.ndarray(forma, dtype=np.dtype(tipo), buffer=memoria.buf, offset=desplazamiento)[...] = array
+            inicio, longitud = metadatos['vertices']
+            memoria.buf[inicio:inicio + longitud] = vertices
+            return GrafoCompartido(memoria, propietario=True)
+        except BaseException:
+            memoria.close()
+            memoria.unlink()
+            raise
+
+    @staticmethod
+    def adjuntar(nombre: str) -> GrafoCompartido[V]:
+        """
+        Se adjunta a un grafo compartido creado por otro proceso, sin copiar las aristas.
+
+        :param nombre: Nombre del segmento (atributo nombre del grafo creado).
+        :return: Grafo compartido de solo lectura.
+        :raise FileNotFoundError: Si no existe el segmento.
+        :raise ValueError: Si el segmento no contiene un grafo compartido.
+        """
+        memoria = _adjuntar_segmento(nombre)
+        try:
+            return GrafoCompartido(memoria, propietario=False)
+        except BaseException:
+            memoria.close()
+            raise
+
+    @property
+    def nombre(self) -> str:
+        return self.memoria.name
+
+    @property
+    def num_aristas(self) -> int:
+        return len(self.destinos)
+
+    def cerrar(self) -> None:
+        """
+        Deja de usar el segmento en este proceso. Antes hay que soltar las vistas obtenidas de él
+        (por ejemplo, los arrays devueltos por vecinos).
+        """
+        if self.memoria is None:
+            return
+        self.desplazamientos = self.destinos = None
+        self.columnas = {}
+        self.memoria.close()
+        self.memoria = None
+
+    def liberar(self) -> None:
+        """
+        Cierra el segmento y lo borra del sistema. Los procesos que ya estaban adjuntos pueden seguir
+        usándolo hasta que lo cierren, pero ya no se puede adjuntar ninguno más.
+
+        :raise ValueError: Si este proceso no es el que creó el segmento.
+        """
+        if not self.propietario:
+            raise ValueError("Solo el proceso que creó el grafo compartido lo puede liberar.")
+        if self.memoria is None:
+            return
+        memoria = self.memoria
+        self.cerrar()
+        memoria.unlink()
+
+    def __enter__(self) -> GrafoCompartido[V]:
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        if self.propietario:
+            self.liberar()
+        else:
+            self.cerrar()
+
+    def vecinos(self, i: int) -> np.ndarray:
+        """
+        Índices de los sucesores del vértice número i (vista sobre el segmento).
+        """
+        return self.destinos[self.desplazamientos[i]:self.desplazamientos[i + 1]]
+
+    def successors(self, vertice: V) -> Set[V]:
+        """
+        Devuelve los sucesores de un vértice, como Grafo.successors, para usar los recorridos de
+        recorridos.py sobre el grafo compartido.
+        """
+        i = self.indices.get(vertice)
+        if i is None:
+            return set()
+        vertices = self.vertices_lista
+        return {vertices[j] for j in self.vecinos(i).tolist()}
+
+    def vertices(self) -> Set[V]:
+        return set(self.vertices_lista)
+
+    def edge_exists(self, origen: V, destino: V) -> bool:
+        i, j = self.indices.get(origen), self.indices.get(destino)
+        return i is not None and j is not None and bool(np.any(self.vecinos(i) == j))
+
+    def _camino(self, inicio: V, destino: V, profundidad: bool) -> List[V]:
+        if inicio not in self.indices or destino not in self.indices:
+            return []
+        origen, objetivo = self.indices[inicio], self.indices[destino]
+        desplazamientos, destinos = self.desplazamientos, self.destinos
+        pendientes: List[int] = [origen]
+        predecesores: Dict[int, Optional[int]] = {origen: None}
+        visitados: Set[int] = set()
+        siguiente = 0  # En anchura, los pendientes se consumen por delante como en una cola
+        while siguiente < len(pendientes):
+            if profundidad:
+                i = pendientes.pop()
+            else:
+                i = pendientes[siguiente]
+                siguiente += 1
+            if i == objetivo:
+                break
+            if i in visitados:
+                continue
+            visitados.add(i)
+            vecinos = destinos[desplazamientos[i]:desplazamientos[i + 1]].tolist()
+            # En profundidad se apilan en orden inverso para procesarlos en orden, como recorridos.dfs
+            for j in (reversed(vecinos) if profundidad else vecinos):
+                if j not in predecesores:
+                    pendientes.append(j)
+                    predecesores[j] = i
+        vertices = self.vertices_lista
+        return [vertices[i] for i in reconstruir_camino(predecesores, objetivo)]
+
+    def bfs(self, inicio: V, destino: V) -> List[V]:
+        """
+        Camino con menos aristas entre dos vértices, recorriendo los arrays del segmento.
+
+        :param inicio: Vértice inicial.
+        :param destino: Vértice de destino.
+        :return: Lista de vértices del camino, o [] si no hay camino.
+        """
+        return self._camino(inicio, destino, profundidad=False)
+
+    def dfs(self, inicio: V, destino: V) -> List[V]:
+        """
+        Camino entre dos vértices encontrado con un recorrido en profundidad (como recorridos.dfs).
+
+        :param inicio: Vértice inicial.
+        :param destino: Vértice de destino.
+        :return: Lista de vértices del camino, o [] si no hay camino.
+        """
+        return self._camino(inicio, destino, profundidad=True)
+
+    def dijkstra(self, inicio: V, destino: V, columna: str = 'peso') -> Tuple[Optional[float], List[V]]:
+        """
+        Camino de menor coste entre dos vértices usando como peso una columna de atributos de las aristas.
+
+        :param inicio: Vértice inicial.
+        :param destino: Vértice de destino.
+        :param columna: Atributo numérico de las aristas que se usa como peso ('peso' si las aristas son números).
+        :return: Par (coste, camino); (None, []) si no hay camino.
+        :raise ValueError: Si la columna no existe o tiene pesos negativos.
+        """
+        if columna not in self.columnas:
+            raise ValueError(f"No existe la columna {columna}. Columnas: {', '.join(self.columnas)}")
+        pesos = self.columnas[columna]
+        if pesos.size and pesos.min() < 0:
+            raise ValueError("Dijkstra no admite pesos negativos.")
+        if inicio not in self.indices or destino not in self.indices:
+            return None, []
+        origen, objetivo = self.indices[inicio], self.indices[destino]
+        desplazamientos, destinos = self.desplazamientos, self.destinos
+        distancias: Dict[int, float] = {origen: 0}
+        predecesores: Dict[int, Optional[int]] = {origen: None}
+        monticulo: List[Tuple[float, int]] = [(0, origen)]
+        cerrados: Set[int] = set()
+        while monticulo:
+            distancia, i = heapq.heappop(monticulo)
+            if i in cerrados:
+                continue
+            if i == objetivo:
+                vertices = self.vertices_lista
+                return distancia, [vertices[k] for k in reconstruir_camino(predecesores, objetivo)]
+            cerrados.add(i)
+            inicio_i, fin_i = desplazamientos[i], desplazamientos[i + 1]
+            for j, peso in zip(destinos[inicio_i:fin_i].tolist(), pesos[inicio_i:fin_i].tolist()):
+                nueva = distancia + peso
+                if j not in cerrados and nueva < distancias.get(j, float('inf')):
+                    distancias[j] = nueva
+                    predecesores[j] = i
+                    heapq.heappush(monticulo, (nueva, j))
+        return None, []
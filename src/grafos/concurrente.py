@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TypeVar, Generic, Dict, Iterable, Iterator, Optional, Set, Tuple
+import threading
+
+from grafo import Grafo
+
+V = TypeVar('V')  # Tipo de los vértices
+E = TypeVar('E')  # Tipo de las aristas
+
+class Instantanea(Grafo[V, E]):
+    """
+    Versión inmutable de un grafo publicada por GrafoConcurrente.
+
+    Es un Grafo normal para las consultas (successors, bfs, dfs...), pero no admite cambios: sus
+    diccionarios de adyacencia no se modifican nunca, así que se puede recorrer desde cualquier hilo
+    sin cerrojos mientras se publican versiones nuevas.
+    """
+    def __init__(self, es_dirigido: bool, adyacencias: Dict[V, Dict[V, E]], version: int):
+        super().__init__(es_dirigido)
+        self.adyacencias = adyacencias
+        self.version: int = version
+
+    def add_vertex(self, vertice: V) -> None:
+        raise ValueError("Una instantánea no se puede modificar; usa GrafoConcurrente.lote().")
+
+    def add_edge(self, origen: V, destino: V, arista: E) -> None:
+        raise ValueError("Una instantánea no se puede modificar; usa GrafoConcurrente.lote().")
+
+    def add_index(self, nombre, indice) -> None:
+        raise ValueError("Una instantánea no se puede modificar; usa GrafoConcurrente.lote().")
+
+class Lote(Generic[V, E]):
+    """
+    Cambios pendientes de publicar sobre una instantánea, con copia en escritura: el diccionario de
+    vértices se copia una vez por lote y el de adyacencias de un vértice solo la primera vez que el
+    lote lo modifica. Los demás diccionarios se comparten con la instantánea anterior.
+    """
+    def __init__(self, base: Instantanea[V, E]):
+        self.base: Instantanea[V, E] = base
+        self.es_dirigido: bool = base.es_dirigido
+        self.adyacencias: Optional[Dict[V, Dict[V, E]]] = None
+        self.copiados: Set[V] = set()  # Vértices cuyas adyacencias ya son una copia propia del lote
+        self.cambios: int = 0
+        self.publicada: Optional[Instantanea[V, E]] = None  # Instantánea creada al cerrar el lote
+
+    def _destinos(self, vertice: V) -> Dict[V, E]:
+        if self.adyacencias is None:
+            self.adyacencias = dict(self.base.adyacencias)
+        if vertice not in self.copiados:
+            self.adyacencias[vertice] = dict(self.adyacencias.get(vertice, {}))
+            self.copiados.add(vertice)
+        return self.adyacencias[vertice]
+
+    def add_vertex(self, vertice: V) -> None:
+        """
+        Añade un vértice si no existe (como Grafo.add_vertex).
+        """
+        actuales = self.base.adyacencias if self.adyacencias is None else self.adyacencias
+        if vertice not in actuales:
+            self._destinos(vertice)
+            self.cambios += 1
+
+    def add_edge(self, origen: V, destino: V, arista: E) -> None:
+        """
+        Añade una arista (como Grafo.add_edge): en un grafo no dirigido, en ambos sentidos.
+        """
+        self.add_vertex(destino)
+        self._destinos(origen)[destino] = arista
+        if not self.es_dirigido:
+            self._destinos(destino)[origen] = arista
+        self.cambios += 1
+
+    def publicar(self) -> Instantanea[V, E]:
+        """
+        Crea la instantánea con los cambios del lote, o devuelve la base si no hay ninguno.
+        """
+        if self.adyacencias is None:
+            self.publicada = self.base
+        else:
+            self.publicada = Instantanea(self.es_dirigido, self.adyacencias, self.base.version + 1)
+        return self.publicada
+
+class GrafoConcurrente(Generic[V, E]):
+    """
+    Grafo para un servidor con muchos hilos lectores y algún hilo escritor.
+
+    Los lectores piden una instantánea y hacen sobre ella todas las consultas que quieran: nunca
+    esperan a un cerrojo ni ven cambios a medias, porque la instantánea no cambia. Los escritores
+    agrupan los cambios en un lote (de uno en uno, con un cerrojo entre escritores) y al terminar se
+    publica la nueva versión cambiando una sola referencia, lo que es atómico en Python.
+
+    Solo se copian las adyacencias; los índices secundarios y los datos propios de subclases de Grafo
+    (como los agregados de Red_social) no forman parte de las instantáneas.
+
+    Uso:
+        grafo = GrafoConcurrente.of(red)
+        with grafo.lote() as lote:  # Hilo escritor
+            lote.add_edge(a, b, relacion)
+        bfs(grafo.instantanea(), a, b)  # Hilos lectores
+    """
+    def __init__(self, grafo: Optional[Grafo[V, E]] = None, es_dirigido: bool = True):
+        if grafo is not None:
+            es_dirigido = grafo.es_dirigido
+            # Se copia cada diccionario para que cambios posteriores en el grafo original no se vean
+            adyacencias = {vertice: dict(destinos) for vertice, destinos in grafo.adyacencias.items()}
+        else:
+            adyacencias = {}
+        self._actual: Instantanea[V, E] = Instantanea(es_dirigido, adyacencias, 0)
+        self._escritura: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def of(grafo: Optional[Grafo[V, E]] = None, es_dirigido: bool = True) -> GrafoConcurrente[V, E]:
+        """
+        Método de factoría para crear un grafo concurrente.
+
+        :param grafo: Grafo con el contenido inicial; se copia. Si es None el grafo empieza vacío.
+        :param es_dirigido: Si el grafo es dirigido, cuando no se da un grafo inicial.
+        :return: Nuevo grafo concurrente en la versión 0.
+        """
+        return GrafoConcurrente(grafo, es_dirigido)
+
+    @property
+    def version(self) -> int:
+        return self._actual.version
+
+    def instantanea(self) -> Instantanea[V, E]:
+        """
+        Devuelve la última versión publicada, que no cambia aunque se publiquen otras después.
+        """
+        return self._actual
+
+    @contextmanager
+    def lote(self) -> Iterator[Lote[V, E]]:
+        """
+        Abre un lote de cambios. Al salir del bloque with se publican todos a la vez; si hay una
+        excepción se descartan. Mientras el lote está abierto los demás escritores esperan.
+        """
+        with self._escritura:
+            lote = Lote(self._actual)
+            yield lote
+            self._actual = lote.publicar()
+
+    def add_vertex(self, vertice: V) -> None:
+        """
+        Añade un vértice en un lote propio.
+        """
+        with self.lote() as lote:
+            lote.add_vertex(vertice)
+
+    def add_edge(self, origen: V, destino: V, arista: E) -> None:
+        """
+        Añade una arista en un lote propio. Para muchos cambios es mucho más barato usar lote().
+        """
+        with self.lote() as lote:
+            lote.add_edge(origen, destino, arista)
+
+    def add_edges(self, aristas: Iterable[Tuple[V, V, E]]) -> Instantanea[V, E]:
+        """
+        Añade varias aristas en un solo lote.
+
+        :param aristas: Ternas (origen, destino, arista).
+        :return: La instantánea publicada.
+        """
+        with self.lote() as lote:
+            for origen, destino, arista in aristas:
+                lote.add_edge(origen, destino, arista)
+        return lote.publicada
@@ -0,0 +1,440 @@
+"""
+Grafo en disco para redes que no caben en memoria.
+
+GrafoExterno.construir lee un fichero de relaciones (con el formato de Red_social.parse o de
+RedGenica.parse) por bloques y construye en un directorio la estructura CSR en ficheros binarios:
+
+    claves.bin           Claves de los vértices (DNI, nombre del gen...), ordenadas, de ancho fijo.
+    posiciones.bin       Posición en bytes de la línea de cada vértice en el fichero de vértices.
+    desplazamientos.bin  Las aristas del vértice i son las posiciones desplazamientos[i]:desplazamientos[i+1].
+    destinos.bin         Vértice de destino de cada arista; las de un vértice, ordenadas por destino.
+    <columna>.bin        Un atributo numérico de cada arista (interacciones, dias_activa, conexion...).
+    meta.json            Número de vértices y aristas, tipos y columnas.
+
+Las aristas se ordenan con una ordenación externa por distribución: en una primera pasada se
+reparten en cubetas por rangos de vértice de origen, cada una del tamaño de la memoria indicada, y
+después se ordena cada cubeta en memoria y se añade al final de los ficheros. Así la memoria usada
+depende de `memoria_mb` y del número de vértices, no del de aristas. Como en los parsers, si una
+relación aparece varias veces se queda la última.
+
+GrafoExterno.abrir proyecta los ficheros en memoria con np.memmap y ofrece la parte de la interfaz de
+Grafo que usan los recorridos (successors, edge_weight...), con los vértices identificados por su
+clave. Una caché LRU guarda los sucesores de los vértices consultados más a menudo.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Set as ConjuntoAbstracto
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import json
+import os
+import shutil
+
+import numpy as np
+
+from red_social import Relacion, Usuario
+
+VERSION_EXTERNO = 1
+TAM_LECTURA = 8 << 20  # Bytes de fichero de texto que se procesan de una vez
+MAX_CUBETAS = 512  # Ficheros de cubeta abiertos a la vez como mucho
+
+COLUMNAS_RED_SOCIAL: Tuple[Tuple[str, str], ...] = (('interacciones', '<i4'), ('dias_activa', '<i4'))
+COLUMNAS_RED_GENICA: Tuple[Tuple[str, str], ...] = (('conexion', '<f8'),)
+
+def _bloques_lineas(fichero: str, tam_lectura: int = TAM_LECTURA) -> Iterator[Tuple[int, bytes]]:
+    """
+    Lee un fichero en bloques de líneas completas.
+
+    :return: Iterador de pares (posición del bloque en el fichero, bytes del bloque).
+    """
+    posicion, pendiente = 0, b""
+    with open(fichero, 'rb') as file:
+        while True:
+            datos = file.read(tam_lectura)
+            if not datos:
+                break
+            datos = pendiente + datos
+            corte = datos.rfind(b'\n') + 1
+            if corte == 0:
+                pendiente = datos
+                continue
+            yield posicion, datos[:corte]
+            posicion += corte
+            pendiente = datos[corte:]
+    if pendiente:
+        yield posicion, pendiente
+
+def _campos(datos: bytes, num_campos: int) -> List[bytes]:
+    """
+    Divide un bloque de líneas 'a,b,c' en la lista plana de sus campos, sin las líneas vacías.
+    """
+    campos = datos.replace(b',', b' ').split()
+    if len(campos) % num_campos:
+        raise ValueError(f"Hay líneas que no tienen {num_campos} campos.")
+    return campos
+
+class GrafoExterno:
+    """
+    Grafo de solo lectura guardado en disco (ver la documentación del módulo).
+    """
+    def __init__(self, directorio: str, capacidad_cache: int = 1_000_000):
+        with open(os.path.join(directorio, 'meta.json'), encoding='utf-8') as file:
+            meta = json.load(file)
+        if meta['version'] != VERSION_EXTERNO:
+            raise ValueError(f"Versión de formato no soportada: {meta['version']}")
+        self.directorio: str = directorio
+        self.es_dirigido: bool = meta['es_dirigido']
+        self.num_vertices: int = meta['num_vertices']
+        self.num_aristas: int = meta['num_aristas']
+        self.fichero_vertices: Optional[str] = meta['fichero_vertices']
+        self.tipo_arista: Optional[str] = meta['tipo_arista']
+
+        def proyectar(nombre: str, tipo: str, tamano: int) -> np.ndarray:
+            if tamano == 0:  # np.memmap no admite ficheros vacíos
+                return np.zeros(0, dtype=tipo)
+            return np.memmap(os.path.join(directorio, nombre + '.bin'), dtype=tipo, mode='r', shape=(tamano,))
+
+        self.claves: np.ndarray = proyectar('claves', meta['tipo_claves'], self.num_vertices)
+        self.posiciones: np.ndarray = proyectar('posiciones', '<i8', self.num_vertices)
+        self.desplazamientos: np.ndarray = proyectar('desplazamientos', '<i8', self.num_vertices + 1)
+        self.destinos: np.ndarray = proyectar('destinos', meta['tipo_ids'], self.num_aristas)
+        self.columnas: Dict[str, np.ndarray] = {nombre: proyectar(nombre, tipo, self.num_aristas)
+                                                for nombre, tipo in meta['columnas']}
+        # Caché LRU de sucesores por vértice; la capacidad se mide en aristas guardadas
+        self.capacidad_cache: int = capacidad_cache
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._aristas_en_cache: int = 0
+        self.aciertos: int = 0
+        self.fallos: int = 0
+
+    @staticmethod
+    def abrir(directorio: str, capacidad_cache: int = 1_000_000) -> GrafoExterno:
+        """
+        Abre un grafo construido con construir.
+
+        :param directorio: Directorio con los ficheros del grafo.
+        :param capacidad_cache: Número máximo de aristas en la caché de sucesores.
+        :return: Grafo en disco.
+        """
+        return GrafoExterno(directorio, capacidad_cache)
+
+    @staticmethod
+    def construir(f_relaciones: str, directorio: str, f_vertices: Optional[str] = None, es_dirigido: bool = False,
+                  columnas: Sequence[Tuple[str, str]] = COLUMNAS_RED_SOCIAL, tipo_arista: Optional[str] = 'relacion',
+                  memoria_mb: int = 512, tam_lectura: int = TAM_LECTURA) -> GrafoExterno:
+        """
+        Construye el grafo en disco a partir de un fichero de relaciones 'origen,destino,columna1,...'.
+
+        :param f_relaciones: Fichero de relaciones.
+        :param directorio: Directorio de salida; se crea si no existe.
+        :param f_vertices: Fichero de vértices (una línea por vértice que empieza por su clave). Si es
+            None los vértices son los que aparecen en las relaciones.
+        :param es_dirigido: Si es False cada relación se guarda en los dos sentidos.
+        :param columnas: Nombre y tipo de NumPy de cada columna numérica de las relaciones.
+        :param tipo_arista: 'relacion' para que edge_weight devuelva objetos Relacion; None para tuplas.
+        :param memoria_mb: Memoria aproximada para ordenar cada cubeta de aristas.
+        :param tam_lectura: Bytes de texto que se procesan de una vez.
+        :return: Grafo abierto.
+        :raise ValueError: Si alguna relación tiene un vértice que no está en el fichero de vértices.
+        """
+        os.makedirs(directorio, exist_ok=True)
+        num_campos = 2 + len(columnas)
+        claves, posiciones = GrafoExterno._claves_vertices(f_relaciones, f_vertices, num_campos, tam_lectura)
+        num_vertices = len(claves)
+        tipo_ids = np.dtype('<i4') if num_vertices < 2**31 else np.dtype('<i8')
+        claves.tofile(os.path.join(directorio, 'claves.bin'))
+        posiciones.tofile(os.path.join(directorio, 'posiciones.bin'))
+
+        registro = np.dtype([('origen', '<i8'), ('destino', tipo_ids), ('orden', '<i8')]
+                            + [(nombre, tipo) for nombre, tipo in columnas])
+        # Número de cubetas: las aristas estimadas (con la longitud media de las líneas del primer
+        # MB, más un margen) entre las que caben en memoria, dejando sitio para la ordenación
+        with open(f_relaciones, 'rb') as file:
+            muestra = file.read(1 << 20)
+        bytes_por_linea = len(muestra) / max(1, muestra.count(b'\n'))
+        estimadas = int(1.5 * os.path.getsize(f_relaciones) / max(1.0, bytes_por_linea)) * (1 if es_dirigido else 2)
+        por_cubeta = max(1, (memoria_mb << 20) // (3 * registro.itemsize))
+        num_cubetas = int(min(MAX_CUBETAS, max(1, -(-estimadas // por_cubeta)), max(1, num_vertices)))
+        tam_rango = max(1, -(-num_vertices // num_cubetas))
+
+        temporal = os.path.join(directorio, 'cubetas')
+        os.makedirs(temporal, exist_ok=True)
+        try:
+            GrafoExterno._repartir(f_relaciones, temporal, claves, registro, columnas, es_dirigido,
+                                   num_cubetas, tam_rango, tam_lectura)
+            num_aristas = GrafoExterno._ordenar_cubetas(directorio, temporal, registro, columnas,
+                                                        num_cubetas, tam_rango, num_vertices)
+        finally:
+            shutil.rmtree(temporal, ignore_errors=True)
+
+        meta = {'version': VERSION_EXTERNO, 'es_dirigido': es_dirigido, 'num_vertices': num_vertices,
+                'num_aristas': num_aristas, 'tipo_claves': claves.dtype.str, 'tipo_ids': tipo_ids.str,
+                'columnas': [list(c) for c in columnas], 'tipo_arista': tipo_arista,
+                'fichero_vertices': os.path.abspath(f_vertices) if f_vertices else None}
+        with open(os.path.join(directorio, 'meta.json'), 'w', encoding='utf-8') as file:
+            json.dump(meta, file)
+        return GrafoExterno(directorio)
+
+    @staticmethod
+    def _claves_vertices(f_relaciones: str, f_vertices: Optional[str], num_campos: int,
+                         tam_lectura: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devuelve las claves de los vértices ordenadas y la posición de la línea de cada uno en el
+        fichero de vértices (-1 si no hay fichero). Si una clave se repite se queda la última línea.
+        """
+        claves: List[np.ndarray] = []
+        posiciones: List[np.ndarray] = []
+        if f_vertices is not None:
+            for inicio, datos in _bloques_lineas(f_vertices, tam_lectura):
+                lineas = datos.split(b'\n')
+                longitudes = np.fromiter((len(linea) + 1 for linea in lineas), dtype=np.int64, count=len(lineas))
+                comienzos = inicio + np.concatenate(([0], np.cumsum(longitudes[:-1])))
+                no_vacias = [i for i, linea in enumerate(lineas) if linea.strip()]
+                claves.append(np.array([lineas[i].split(b',', 1)[0].strip() for i in no_vacias], dtype=bytes))
+                posiciones.append(comienzos[no_vacias])
+        else:
+            for _, datos in _bloques_lineas(f_relaciones, tam_lectura):
+                campos = _campos(datos, num_campos)
+                claves.append(np.unique(np.array(campos[0::num_campos] + campos[1::num_campos], dtype=bytes)))
+                # Se juntan las claves de los bloques cuando ocupan más que las ya únicas, para que la
+                # memoria dependa del número de vértices y no del de relaciones
+                if len(claves) > 1 and sum(map(len, claves[1:])) > len(claves[0]):
+                    claves = [np.unique(np.concatenate(claves))]
+            posiciones = [np.full(sum(map(len, claves)), -1, dtype=np.int64)]
+        if not claves:
+            return np.zeros(0, dtype='S1'), np.zeros(0, dtype=np.int64)
+        todas = np.concatenate(claves)
+        todas_posiciones = np.concatenate(posiciones)
+        # np.unique se queda con la primera aparición: se aplica al revés para quedarse con la última
+        unicas, indices = np.unique(todas[::-1], return_index=True)
+        return unicas, todas_posiciones[::-1][indices]
+
+    @staticmethod
+    def _repartir(f_relaciones: str, temporal: str, claves: np.ndarray, registro: np.dtype,
+                  columnas: Sequence[Tuple[str, str]], es_dirigido: bool, num_cubetas: int, tam_rango: int,
+                  tam_lectura: int) -> None:
+        """
+        Primera pasada de la ordenación externa: convierte cada relación en un registro binario y lo
+        añade a la cubeta del rango de su vértice de origen.
+        """
+        num_campos = 2 + len(columnas)
+        cubetas = [open(os.path.join(temporal, f'{i}.bin'), 'wb') for i in range(num_cubetas)]
+        try:
+            orden = 0
+            for _, datos in _bloques_lineas(f_relaciones, tam_lectura):
+                campos = _campos(datos, num_campos)
+                n = len(campos) // num_campos
+                extremos = []
+                for desplazamiento in (0, 1):
+                    buscadas = np.array(campos[desplazamiento::num_campos], dtype=bytes)
+                    ids = np.searchsorted(claves, buscadas)
+                    ids[ids == len(claves)] = 0
+                    desconocidas = claves[ids] != buscadas if len(claves) else np.ones(n, dtype=bool)
+                    if desconocidas.any():
+                        clave = buscadas[np.flatnonzero(desconocidas)[0]].decode('utf-8')
+                        raise ValueError(f"El vértice {clave} no está en el fichero de vértices.")
+                    extremos.append(ids)
+                bloque = np.empty(n if es_dirigido else 2 * n, dtype=registro)
+                bloque['orden'][:n] = np.arange(orden, orden + n)
+                bloque['origen'][:n], bloque['destino'][:n] = extremos
+                for i, (nombre, tipo) in enumerate(columnas):
+                    bloque[nombre][:n] = np.array(campos[2 + i::num_campos]).astype(tipo)
+                if not es_dirigido:
+                    bloque[n:] = bloque[:n]
+                    bloque['origen'][n:], bloque['destino'][n:] = extremos[1], extremos[0]
+                orden += n
+                cubeta = bloque['origen'] // tam_rango
+                por_cubeta = np.argsort(cubeta, kind='stable')
+                bloque, cubeta = bloque[por_cubeta], cubeta[por_cubeta]
+                limites = np.searchsorted(cubeta, np.arange(num_cubetas + 1))
+                for i in np.flatnonzero(np.diff(limites)).tolist():
+                    bloque[limites[i]:limites[i + 1]].tofile(cubetas[i])
+        finally:
+            for file in cubetas:
+                file.close()
+
+    @staticmethod
+    def _ordenar_cubetas(directorio: str, temporal: str, registro: np.dtype, columnas: Sequence[Tuple[str, str]],
+                         num_cubetas: int, tam_rango: int, num_vertices: int) -> int:
+        """
+        Segunda pasada: ordena cada cubeta en memoria por (origen, destino), quita las relaciones
+        repetidas (se queda la última) y la añade al final de los ficheros de la estructura CSR.
+
+        :return: Número total de aristas.
+        """
+        salidas = {nombre: open(os.path.join(directorio, nombre + '.bin'), 'wb')
+                   for nombre in ['destinos', 'desplazamientos'] + [nombre for nombre, _ in columnas]}
+        try:
+            total = 0
+            np.zeros(1, dtype='<i8').tofile(salidas['desplazamientos'])
+            for i in range(num_cubetas):
+                base, fin = i * tam_rango, min(num_vertices, (i + 1) * tam_rango)
+                if base >= fin:
+                    break
+                bloque = np.fromfile(os.path.join(temporal, f'{i}.bin'), dtype=registro)
+                os.remove(os.path.join(temporal, f'{i}.bin'))
+                bloque = bloque[np.lexsort((bloque['orden'], bloque['destino'], bloque['origen']))]
+                # De cada grupo con el mismo origen y destino se queda el último (mayor orden)
+                ultimos = np.ones(len(bloque), dtype=bool)
+                ultimos[:-1] = (bloque['origen'][:-1] != bloque['origen'][1:]) | (bloque['destino'][:-1] != bloque['destino'][1:])
+                bloque = bloque[ultimos]
+                bloque['destino'].tofile(salidas['destinos'])
+                for nombre, _ in columnas:
+                    bloque[nombre].tofile(salidas[nombre])
+                grados = np.bincount(bloque['origen'] - base, minlength=fin - base)
+                (total + np.cumsum(grados)).astype('<i8').tofile(salidas['desplazamientos'])
+                total += len(bloque)
+            return total
+        finally:
+            for file in salidas.values():
+                file.close()
+
+    def __contains__(self, vertice: str) -> bool:
+        return self.indice(vertice) is not None
+
+    def indice(self, vertice: str) -> Optional[int]:
+        """
+        Número del vértice con una clave, buscándolo por bisección en las claves ordenadas.
+        """
+        clave = vertice.encode('utf-8')
+        i = int(np.searchsorted(self.claves, clave))
+        if i < self.num_vertices and self.claves[i] == clave:
+            return i
+        return None
+
+    def clave(self, i: int) -> str:
+        return self.claves[i].decode('utf-8')
+
+    def vecinos(self, i: int) -> np.ndarray:
+        """
+        Números de los sucesores del vértice número i, pasando por la caché LRU.
+        """
+        vecinos = self._cache.get(i)
+        if vecinos is not None:
+            self.aciertos += 1
+            self._cache.move_to_end(i)
+            return vecinos
+        self.fallos += 1
+        vecinos = np.array(self.destinos[self.desplazamientos[i]:self.desplazamientos[i + 1]])
+        if len(vecinos) <= self.capacidad_cache:
+            self._cache[i] = vecinos
+            self._aristas_en_cache += len(vecinos)
+            while self._aristas_en_cache > self.capacidad_cache:
+                _, expulsados = self._cache.popitem(last=False)
+                self._aristas_en_cache -= len(expulsados)
+        return vecinos
+
+    def successors(self, vertice: str) -> Set[str]:
+        """
+        Devuelve las claves de los sucesores de un vértice, como Grafo.successors.
+        """
+        i = self.indice(vertice)
+        if i is None:
+            return set()
+        return {clave.decode('utf-8') for clave in self.claves[self.vecinos(i)].tolist()}
+
+    def predecessors(self, vertice: str) -> Set[str]:
+        """
+        Devuelve los predecesores de un vértice. En un grafo dirigido recorre todas las aristas por bloques.
+        """
+        if not self.es_dirigido:
+            return self.successors(vertice)
+        j = self.indice(vertice)
+        if j is None:
+            return set()
+        origenes: Set[str] = set()
+        paso = 1 << 24
+        for inicio in range(0, self.num_aristas, paso):
+            posiciones = inicio + np.flatnonzero(self.destinos[inicio:inicio + paso] == j)
+            for i in (np.searchsorted(self.desplazamientos, posiciones, side='right') - 1).tolist():
+                origenes.add(self.clave(i))
+        return origenes
+
+    def _posicion_arista(self, origen: str, destino: str) -> Optional[int]:
+        i, j = self.indice(origen), self.indice(destino)
+        if i is None or j is None:
+            return None
+        vecinos = self.vecinos(i)
+        k = int(np.searchsorted(vecinos, j))
+        if k < len(vecinos) and vecinos[k] == j:
+            return int(self.desplazamientos[i]) + k
+        return None
+
+    def edge_exists(self, origen: str, destino: str) -> bool:
+        return self._posicion_arista(origen, destino) is not None
+
+    def edge_weight(self, origen: str, destino: str) -> Any:
+        """
+        Devuelve la arista entre dos vértices: una Relacion si el grafo es una red social, o una tupla
+        con los valores de las columnas; None si no existe.
+        """
+        posicion = self._posicion_arista(origen, destino)
+        if posicion is None:
+            return None
+        valores = tuple(columna[posicion].item() for columna in self.columnas.values())
+        if self.tipo_arista == 'relacion':
+            return Relacion(posicion + 1, *valores)
+        return valores
+
+    def vertices(self) -> VistaVertices:
+        """
+        Devuelve el conjunto de las claves de los vértices, como Grafo.vertices, pero sin cargarlas en memoria.
+        """
+        return VistaVertices(self)
+
+    def linea_vertice(self, vertice: str) -> Optional[str]:
+        """
+        Lee del fichero de vértices la línea de un vértice, o None si no hay fichero o no existe.
+        """
+        i = self.indice(vertice)
+        if i is None or self.fichero_vertices is None or self.posiciones[i] < 0:
+            return None
+        with open(self.fichero_vertices, 'rb') as file:
+            file.seek(int(self.posiciones[i]))
+            return file.readline().decode('utf-8').strip()
+
+    def usuario(self, dni: str) -> Optional[Usuario]:
+        """
+        Devuelve el Usuario de una red social a partir de su línea en el fichero de usuarios.
+        """
+        linea = self.linea_vertice(dni)
+        if linea is None:
+            return None
+        dni, nombre, apellidos, fecha_str = linea.split(",")
+        return Usuario.of(dni, nombre, apellidos, date.fromisoformat(fecha_str))
+
+    @property
+    def estadisticas_cache(self) -> Dict[str, float]:
+        consultas = self.aciertos + self.fallos
+        return {'aciertos': self.aciertos, 'fallos': self.fallos, 'vertices': len(self._cache),
+                'aristas': self._aristas_en_cache, 'tasa_aciertos': self.aciertos / consultas if consultas else 0.0}
+
+class VistaVertices(ConjuntoAbstracto):
+    """
+    Conjunto de solo lectura de las claves de los vértices de un GrafoExterno, leído de claves.bin
+    cuando se usa: `in` busca por bisección, len es el número de vértices y al recorrerlo se decodifican
+    las claves en orden, por bloques. Las operaciones de conjuntos (==, <=, &, |...) vienen de
+    collections.abc.Set y devuelven un set normal.
+    """
+    def __init__(self, grafo: GrafoExterno):
+        self.grafo: GrafoExterno = grafo
+
+    def __contains__(self, vertice: object) -> bool:
+        return isinstance(vertice, str) and vertice in self.grafo
+
+    def __len__(self) -> int:
+        return self.grafo.num_vertices
+
+    def __iter__(self) -> Iterator[str]:
+        claves = self.grafo.claves
+        for inicio in range(0, len(claves), 1 << 16):
+            for clave in claves[inicio:inicio + (1 << 16)].tolist():
+                yield clave.decode('utf-8')
+
+    @classmethod
+    def _from_iterable(cls, vertices: Iterable[str]) -> Set[str]:
+        return set(vertices)
+
+    def __repr__(self) -> str:
+        return f"VistaVertices({self.grafo.directorio!r}, {len(self)} vértices)"
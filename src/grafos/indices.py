@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort_right
+from operator import itemgetter
+from typing import TypeVar, Generic, Callable, Dict, Iterator, List, Optional, Tuple
+
+K = TypeVar('K')  # Tipo de las claves
+T = TypeVar('T')  # Tipo de los valores indexados
+
+# Con más valores pendientes que este se reordena todo de una vez en lugar de insertarlos uno a uno
+MAX_INSERCIONES = 64
+
+class Indice(ABC, Generic[K, T]):
+    """
+    Índice secundario sobre una colección de valores (por ejemplo, los vértices de un grafo), por una
+    clave calculada a partir de cada valor. La clave de un valor no puede cambiar mientras está en el índice.
+    """
+    def __init__(self, clave: Callable[[T], K]):
+        self.clave: Callable[[T], K] = clave
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def anadir(self, valor: T) -> None:
+        pass
+
+    @abstractmethod
+    def eliminar(self, valor: T) -> bool:
+        """
+        Quita un valor del índice.
+
+        :param valor: Valor a quitar (se compara con ==).
+        :return: True si estaba en el índice.
+        """
+        pass
+
+    @abstractmethod
+    def iguales(self, clave: K) -> List[T]:
+        """
+        Devuelve los valores con una clave dada, en el orden en que se añadieron.
+        """
+        pass
+
+    def get(self, clave: K, defecto: Optional[T] = None) -> Optional[T]:
+        """
+        Devuelve el primer valor añadido con una clave dada, o defecto si no hay ninguno.
+        """
+        valores = self.iguales(clave)
+        return valores[0] if valores else defecto
+
+class IndiceHash(Indice[K, T]):
+    """
+    Índice por igualdad de clave con un diccionario: cada consulta cuesta O(1).
+    """
+    def __init__(self, clave: Callable[[T], K]):
+        super().__init__(clave)
+        self._valores: Dict[K, List[T]] = {}
+        self._tamano: int = 0
+
+    @staticmethod
+    def of(clave: Callable[[T], K]) -> IndiceHash[K, T]:
+        """
+        Método de factoría para crear un índice hash vacío.
+
+        :param clave: Función que calcula la clave de un valor.
+        :return: Nuevo índice.
+        """
+        return IndiceHash(clave)
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def anadir(self, valor: T) -> None:
+        self._valores.setdefault(self.clave(valor), []).append(valor)
+        self._tamano += 1
+
+    def eliminar(self, valor: T) -> bool:
+        clave = self.clave(valor)
+        valores = self._valores.get(clave, [])
+        if valor not in valores:
+            return False
+        valores.remove(valor)
+        if not valores:
+            del self._valores[clave]
+        self._tamano -= 1
+        return True
+
+    def iguales(self, clave: K) -> List[T]:
+        return list(self._valores.get(clave, ()))
+
+class IndiceOrdenado(Indice[K, T]):
+    """
+    Índice secundario ordenado: guarda valores ordenados por una clave calculada a partir de cada
+    valor, para responder consultas de rango con búsqueda binaria en lugar de recorrer todos los valores.
+
+    Las inserciones se acumulan en una lista de pendientes y los borrados se apuntan como marcas, y
+    ambos se aplican en la siguiente consulta, así que cargar (y sustituir) muchos valores seguidos
+    cuesta O(n log n) en total. Los valores tienen que ser hashables. Los valores con la misma clave
+    se devuelven en el orden en que se añadieron.
+    """
+    def __init__(self, clave: Callable[[T], K]):
+        super().__init__(clave)
+        self._claves: List[K] = []
+        self._valores: List[T] = []
+        self._pendientes: List[Tuple[K, T]] = []
+        self._cuentas: Dict[T, int] = {}  # Apariciones de cada valor que siguen en el índice
+        self._eliminados: Dict[T, int] = {}  # Apariciones borradas que aún no se han quitado de las listas
+        self._tamano: int = 0
+
+    @staticmethod
+    def of(clave: Callable[[T], K]) -> IndiceOrdenado[K, T]:
+        """
+        Método de factoría para crear un índice ordenado vacío.
+
+        :param clave: Función que calcula la clave de ordenación de un valor; la clave no puede cambiar
+            mientras el valor está en el índice.
+        :return: Nuevo índice.
+        """
+        return IndiceOrdenado(clave)
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def __iter__(self) -> Iterator[T]:
+        self._ordenar()
+        return iter(self._valores)
+
+    def anadir(self, valor: T) -> None:
+        """
+        Añade un valor al índice.
+        """
+        self._pendientes.append((self.clave(valor), valor))
+        self._cuentas[valor] = self._cuentas.get(valor, 0) + 1
+        self._tamano += 1
+
+    def eliminar(self, valor: T) -> bool:
+        cuenta = self._cuentas.get(valor, 0)
+        if cuenta == 0:
+            return False
+        if cuenta == 1:
+            del self._cuentas[valor]
+        else:
+            self._cuentas[valor] = cuenta - 1
+        self._eliminados[valor] = self._eliminados.get(valor, 0) + 1
+        self._tamano -= 1
+        return True
+
+    def _purgar(self) -> None:
+        """
+        Quita de las listas las apariciones marcadas como borradas: primero de los pendientes (las
+        más recientes) y después de la parte ordenada, con búsqueda binaria si son pocas o
+        reconstruyendo las listas de una pasada si son muchas.
+        """
+        eliminados = self._eliminados
+        pendientes = []
+        for clave, valor in reversed(self._pendientes):
+            if eliminados.get(valor):
+                eliminados[valor] -= 1
+                if not eliminados[valor]:
+                    del eliminados[valor]
+            else:
+                pendientes.append((clave, valor))
+        pendientes.reverse()
+        self._pendientes = pendientes
+        if sum(eliminados.values()) <= MAX_INSERCIONES:
+            for valor, veces in eliminados.items():
+                clave = self.clave(valor)
+                for _ in range(veces):
+                    i = bisect_left(self._claves, clave)
+                    while self._valores[i] != valor:
+                        i += 1
+                    del self._claves[i]
+                    del self._valores[i]
+        else:
+            claves, valores = [], []
+            for clave, valor in zip(self._claves, self._valores):
+                if eliminados.get(valor):
+                    eliminados[valor] -= 1
+                else:
+                    claves.append(clave)
+                    valores.append(valor)
+            self._claves, self._valores = claves, valores
+        eliminados.clear()
+
+    def _ordenar(self) -> None:
+        if self._eliminados:
+            self._purgar()
+        if not self._pendientes:
+            return
+        if len(self._pendientes) <= MAX_INSERCIONES:
+            for clave, valor in self._pendientes:
+                posicion = bisect_right(self._claves, clave)
+                self._claves.insert(posicion, clave)
+                self._valores.insert(posicion, valor)
+        else:
+            # La ordenación es estable y aprovecha que la parte ya ordenada es un tramo ordenado
+            pares = list(zip(self._claves, self._valores))
+            pares.extend(self._pendientes)
+            pares.sort(key=itemgetter(0))
+            self._claves = [clave for clave, _ in pares]
+            self._valores = [valor for _, valor in pares]
+        self._pendientes = []
+
+    def rango(self, desde: Optional[K] = None, hasta: Optional[K] = None) -> List[T]:
+        """
+        Devuelve los valores cuya clave está entre dos límites, ambos incluidos, ordenados por clave.
+
+        :param desde: Límite inferior; None si no hay.
+        :param hasta: Límite superior; None si no hay.
+        :return: Lista de valores.
+        """
+        self._ordenar()
+        inicio = 0 if desde is None else bisect_left(self._claves, desde)
+        fin = len(self._claves) if hasta is None else bisect_right(self._claves, hasta)
+        return self._valores[inicio:fin]
+
+    def iguales(self, clave: K) -> List[T]:
+        return self.rango(clave, clave)
+
+class _NodoPrefijo:
+    __slots__ = ('hijos', 'valores')
+
+    def __init__(self):
+        self.hijos: Dict[str, _NodoPrefijo] = {}
+        self.valores: list = []
+
+class IndicePrefijo(Indice[str, T]):
+    """
+    Índice de claves de texto en un árbol de prefijos (trie): buscar los valores cuya clave empieza por
+    un prefijo cuesta lo que recorrer el prefijo más lo que ocupan los resultados, sin comparar con el
+    resto de claves.
+    """
+    def __init__(self, clave: Callable[[T], str]):
+        super().__init__(clave)
+        self.raiz: _NodoPrefijo = _NodoPrefijo()
+        self._tamano: int = 0
+
+    @staticmethod
+    def of(clave: Callable[[T], str]) -> IndicePrefijo[T]:
+        """
+        Método de factoría para crear un índice de prefijos vacío.
+
+        :param clave: Función que calcula la clave (una cadena) de un valor.
+        :return: Nuevo índice.
+        """
+        return IndicePrefijo(clave)
+
+    def __len__(self) -> int:
+        return self._tamano
+
+    def _nodo(self, texto: str) -> Optional[_NodoPrefijo]:
+        nodo = self.raiz
+        for caracter in texto:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return None
+        return nodo
+
+    def anadir(self, valor: T) -> None:
+        nodo = self.raiz
+        for caracter in self.clave(valor):
+            siguiente = nodo.hijos.get(caracter)
+            if siguiente is None:
+                siguiente = nodo.hijos[caracter] = _NodoPrefijo()
+            nodo = siguiente
+        nodo.valores.append(valor)
+        self._tamano += 1
+
+    def eliminar(self, valor: T) -> bool:
+        clave = self.clave(valor)
+        camino = [self.raiz]
+        for caracter in clave:
+            nodo = camino[-1].hijos.get(caracter)
+            if nodo is None:
+                return False
+            camino.append(nodo)
+        if valor not in camino[-1].valores:
+            return False
+        camino[-1].valores.remove(valor)
+        self._tamano -= 1
+        # Se podan los nodos que se han quedado sin valores ni hijos
+        for i in range(len(clave), 0, -1):
+            if camino[i].valores or camino[i].hijos:
+                break
+            del camino[i - 1].hijos[clave[i - 1]]
+        return True
+
+    def iguales(self, clave: str) -> List[T]:
+        nodo = self._nodo(clave)
+        return list(nodo.valores) if nodo is not None else []
+
+    def con_prefijo(self, prefijo: str) -> List[T]:
+        """
+        Devuelve los valores cuya clave empieza por un prefijo, ordenados por clave.
+
+        :param prefijo: Prefijo buscado; con "" se devuelven todos los valores.
+        :return: Lista de valores.
+        """
+        nodo = self._nodo(prefijo)
+        if nodo is None:
+            return []
+        valores: List[T] = []
+        pila = [nodo]
+        while pila:
+            nodo = pila.pop()
+            valores.extend(nodo.valores)
+            # Los hijos se apilan en orden inverso para visitarlos en orden alfabético
+            pila.extend(nodo.hijos[caracter] for caracter in sorted(nodo.hijos, reverse=True))
+        return valores
+
+class ValoresOrdenados(Generic[K]):
+    """
+    Multiconjunto de claves ordenadas con inserción y borrado por búsqueda binaria, para mantener
+    mínimos y máximos que pueden cambiar al quitar un valor.
+    """
+    def __init__(self):
+        self.claves: List[K] = []
+
+    def __len__(self) -> int:
+        return len(self.claves)
+
+    def anadir(self, clave: K) -> None:
+        insort_right(self.claves, clave)
+
+    def eliminar(self, clave: K) -> None:
+        """
+        :raise ValueError: Si la clave no está.
+        """
+        posicion = bisect_left(self.claves, clave)
+        if posicion == len(self.claves) or self.claves[posicion] != clave:
+            raise ValueError(f"La clave {clave} no está.")
+        del self.claves[posicion]
+
+    @property
+    def minimo(self) -> Optional[K]:
+        return self.claves[0] if self.claves else None
+
+    @property
+    def maximo(self) -> Optional[K]:
+        return self.claves[-1] if self.claves else None
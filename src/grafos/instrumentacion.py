@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from functools import wraps
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Tuple
+import inspect
+import os
+import sys
+
+import recorridos
+from grafo import Grafo
+from red_social import Red_social
+try:
+    from defensa_3 import RedGenica
+except ImportError: # Ejecutado desde grafos: defensa_3/ se añade al final de la ruta
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'defensa_3'))
+    from defensa_3 import RedGenica
+
+METODOS_GRAFO = ('add_vertex', 'add_edge', 'successors', 'predecessors', 'edge_weight', 'vertices',
+                 'edge_exists', 'subgraph', 'inverse_graph')
+
+# La clase Grafo de grafos y, si RedGenica hereda de la copia de defensa_3/grafo.py, también esa
+CLASES_GRAFO: Tuple[type, ...] = tuple(dict.fromkeys(
+    [Grafo] + [clase for clase in RedGenica.__mro__ if clase.__name__ == 'Grafo']))
+
+# Objetivos por defecto: pares (propietario, nombre del atributo) que se sustituyen al activar
+OBJETIVOS_POR_DEFECTO: List[Tuple[Any, str]] = (
+    [(clase, metodo) for clase in CLASES_GRAFO for metodo in METODOS_GRAFO]
+    + [(recorridos, 'bfs'), (recorridos, 'dfs'), (Red_social, 'parse'), (RedGenica, 'parse')]
+)
+
+# Funciones cuyas llamadas se consideran consultas: dentro de ellas se cuentan vértices y aristas
+CONSULTAS = ('bfs', 'dfs')
+
+class Contador:
+    """
+    Número de llamadas a una función y tiempo acumulado en las llamadas muestreadas.
+    """
+    def __init__(self):
+        self.llamadas: int = 0
+        self.muestras: int = 0
+        self.tiempo: float = 0.0
+
+    @property
+    def tiempo_estimado(self) -> float:
+        """
+        Tiempo total estimado, extrapolando el de las llamadas muestreadas a todas las llamadas.
+        """
+        if self.muestras == 0:
+            return 0.0
+        return self.tiempo * self.llamadas / self.muestras
+
+class Instrumentacion:
+    """
+    Capa de instrumentación opcional para Grafo (las dos copias, si RedGenica usa la de defensa_3),
+    los recorridos y los parsers de Red_social y RedGenica.
+
+    Mientras no está activa no modifica nada, así que no tiene ningún coste. Al activarla sustituye los
+    métodos y funciones objetivo por envolturas que cuentan las llamadas y miden el tiempo de una de
+    cada `muestreo` llamadas. Dentro de bfs y dfs cuenta además los vértices expandidos (llamadas a
+    successors) y las aristas relajadas (sucesores devueltos).
+
+    Las funciones importadas con "from recorridos import bfs" antes de activar conservan la referencia
+    original; para medirlas hay que llamarlas como recorridos.bfs.
+    """
+    def __init__(self, muestreo: int = 1, objetivos: Optional[List[Tuple[Any, str]]] = None):
+        if muestreo < 1:
+            raise ValueError("El muestreo tiene que ser mayor o igual que 1.")
+        self.muestreo: int = muestreo
+        # Sin repetidos: un objetivo sustituido dos veces no se podría restaurar
+        self.objetivos: List[Tuple[Any, str]] = list(dict.fromkeys(objetivos or OBJETIVOS_POR_DEFECTO))
+        self.contadores: Dict[str, Contador] = {}
+        self.consultas: Dict[str, Dict[str, int]] = {}
+        self._originales: List[Tuple[Any, str, Any]] = []
+        self._consulta_actual: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def of(muestreo: int = 1, objetivos: Optional[List[Tuple[Any, str]]] = None) -> Instrumentacion:
+        """
+        Método de factoría para crear una instrumentación (inactiva).
+
+        :param muestreo: Se mide el tiempo de una de cada `muestreo` llamadas; 1 mide todas.
+        :param objetivos: Pares (clase o módulo, nombre) a instrumentar. Por defecto, OBJETIVOS_POR_DEFECTO.
+        :return: Nueva instrumentación.
+        """
+        return Instrumentacion(muestreo, objetivos)
+
+    @property
+    def activa(self) -> bool:
+        return bool(self._originales)
+
+    def activar(self) -> None:
+        """
+        Sustituye los objetivos por sus envolturas instrumentadas.
+        """
+        if self.activa:
+            return
+        for propietario, nombre in self.objetivos:
+            original = inspect.getattr_static(propietario, nombre)
+            es_estatico = isinstance(original, staticmethod)
+            funcion = original.__func__ if es_estatico else original
+            etiqueta = f"{getattr(propietario, '__name__', propietario)}.{nombre}"
+            envoltura = self._envolver(funcion, etiqueta, nombre)
+            self._originales.append((propietario, nombre, propietario.__dict__.get(nombre)))
+            setattr(propietario, nombre, staticmethod(envoltura) if es_estatico else envoltura)
+
+    def desactivar(self) -> None:
+        """
+        Restaura los métodos y funciones originales. Los contadores se conservan.
+        """
+        for propietario, nombre, original in reversed(self._originales):
+            if original is None:  # El atributo era heredado
+                delattr(propietario, nombre)
+            else:
+                setattr(propietario, nombre, original)
+        self._originales = []
+
+    def reiniciar(self) -> None:
+        """
+        Pone a cero todos los contadores.
+        """
+        for contador in self.contadores.values():  # Las envolturas activas guardan referencias a ellos
+            contador.llamadas = contador.muestras = 0
+            contador.tiempo = 0.0
+        self.consultas = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Devuelve una copia de las medidas acumuladas.
+
+        :return: Diccionario con una entrada por función instrumentada (llamadas, muestras, tiempo estimado
+            en segundos) y otra entrada 'consultas' con los vértices expandidos y aristas relajadas por recorrido.
+        """
+        resultado: Dict[str, Dict[str, Any]] = {
+            etiqueta: {'llamadas': c.llamadas, 'muestras': c.muestras, 'tiempo': c.tiempo_estimado}
+            for etiqueta, c in self.contadores.items()
+        }
+        resultado['consultas'] = {nombre: dict(datos) for nombre, datos in self.consultas.items()}
+        return resultado
+
+    def _envolver(self, funcion, etiqueta: str, nombre: str):
+        contador = self.contadores.setdefault(etiqueta, Contador())
+        muestreo = self.muestreo
+
+        if nombre == 'successors':
+            @wraps(funcion)
+            def envoltura_successors(*args, **kwargs):
+                contador.llamadas += 1
+                if contador.llamadas % muestreo:
+                    resultado = funcion(*args, **kwargs)
+                else:
+                    inicio = perf_counter()
+                    resultado = funcion(*args, **kwargs)
+                    contador.tiempo += perf_counter() - inicio
+                    contador.muestras += 1
+                consulta = self._consulta_actual
+                if consulta is not None:
+                    consulta['vertices_expandidos'] += 1
+                    consulta['aristas_relajadas'] += len(resultado)
+                return resultado
+            return envoltura_successors
+
+        if nombre in CONSULTAS:
+            @wraps(funcion)
+            def envoltura_consulta(*args, **kwargs):
+                consulta = self.consultas.setdefault(
+                    nombre, {'consultas': 0, 'vertices_expandidos': 0, 'aristas_relajadas': 0})
+                consulta['consultas'] += 1
+                anterior, self._consulta_actual = self._consulta_actual, consulta
+                contador.llamadas += 1
+                inicio = perf_counter()
+                try:
+                    return funcion(*args, **kwargs)
+                finally:
+                    # Las consultas son pocas y largas: se miden siempre
+                    contador.tiempo += perf_counter() - inicio
+                    contador.muestras += 1
+                    self._consulta_actual = anterior
+            return envoltura_consulta
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            contador.llamadas += 1
+            if contador.llamadas % muestreo:
+                return funcion(*args, **kwargs)
+            inicio = perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                contador.tiempo += perf_counter() - inicio
+                contador.muestras += 1
+        return envoltura
+
+    def __enter__(self) -> Instrumentacion:
+        self.activar()
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.desactivar()
+
+def medir(muestreo: int = 1, objetivos: Optional[List[Tuple[Any, str]]] = None) -> Instrumentacion:
+    """
+    Crea una instrumentación para usarla como gestor de contexto:
+
+        with medir(muestreo=100) as medida:
+            recorridos.bfs(rrss, a, b)
+        print(medida.snapshot())
+
+    :param muestreo: Se mide el tiempo de una de cada `muestreo` llamadas; 1 mide todas.
+    :param objetivos: Pares (clase o módulo, nombre) a instrumentar. Por defecto, OBJETIVOS_POR_DEFECTO.
+    :return: Instrumentación que se activa al entrar en el bloque with y se desactiva al salir.
+    """
+    return Instrumentacion.of(muestreo, objetivos)
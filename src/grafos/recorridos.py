@@ -33,13 +33,35 @@ def bfs(grafo: Grafo[V, E], inicio: V, destino: V) -> List[V]:
             visitados.add(vertice)
             
             for vecino in grafo.successors(vertice):  # Obtener vecinos del vértice
-                if vecino not in visitados and vecino not in cola:
+                if vecino not in predecesores:  # Un vértice ya descubierto está en la cola o visitado
                     cola.append(vecino)
                     predecesores[vecino] = vertice
     
     # Reconstruimos el camino desde el diccionario de predecesores
     return reconstruir_camino(predecesores, destino)
 
+def bfs_arbol(grafo: Grafo[V, E], inicio: V) -> Dict[V, V]:
+    """
+    Recorre en anchura todo lo alcanzable desde inicio y devuelve el árbol del recorrido. Los
+    predecesores son los mismos que usa bfs, así que reconstruir_camino(arbol, destino) es el camino
+    que devolvería bfs(grafo, inicio, destino) para cualquier destino.
+    
+    :param grafo: Grafo sobre el que realizar la búsqueda.
+    :param inicio: Vértice inicial.
+    :return: Diccionario de cada vértice alcanzado a su predecesor (None para inicio).
+    """
+    predecesores: Dict[V, V] = {inicio: None}
+    cola: deque[V] = deque([inicio])
+    
+    while cola:
+        vertice = cola.popleft()
+        for vecino in grafo.successors(vertice):
+            if vecino not in predecesores:
+                cola.append(vecino)
+                predecesores[vecino] = vertice
+    
+    return predecesores
+
 def dfs(grafo: Grafo[V, E], inicio: V, destino: V) -> List[V]:
     """
     Realiza un recorrido en profundidad (DFS) desde un vértice inicial hasta un vértice destino usando una Pila.
@@ -66,8 +88,8 @@ def dfs(grafo: Grafo[V, E], inicio: V, destino: V) -> List[V]:
             visitados.add(vertice)
             
             # Agregar vecinos en orden inverso para procesar en el orden correcto
-            for vecino in reversed(grafo.neighbors(vertice)):
-                if vecino not in visitados and vecino not in pila:
+            for vecino in reversed(list(grafo.successors(vertice))):
+                if vecino not in predecesores:  # Un vértice ya descubierto está en la pila o visitado
                     pila.append(vecino)
                     predecesores[vecino] = vertice
     
@@ -83,6 +105,8 @@ def reconstruir_camino(predecesores: Dict[V, V], destino: V) -> List[V]:
     :return: Lista de vértices en el camino desde el origen hasta el destino.
     """
     camino: List[V] = []
+    if destino not in predecesores:  # El destino no se ha alcanzado
+        return camino
     vertice_actual = destino
     
     while vertice_actual is not None:  # Reconstruir desde el destino hasta el inicio
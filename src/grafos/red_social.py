@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import date
 from grafo import Grafo  # Asegúrate de importar tu implementación de Grafo
+from indices import IndiceHash, IndiceOrdenado, IndicePrefijo, ValoresOrdenados
 from recorridos import bfs  # Asegúrate de tener el módulo de recorridos adecuado
 
 @dataclass(frozen=True)
@@ -35,18 +37,152 @@ class Relacion:
     def __str__(self) -> str:
         return f"Interacciones: {self.interacciones}, Días activa: {self.dias_activa}"
 
+# Relación junto con los usuarios que une, en el sentido en que se añadió
+Terna = Tuple[Usuario, Usuario, Relacion]
+
+def _dias_activa(terna: Terna) -> int:
+    return terna[2].dias_activa
+
+def _interacciones(terna: Terna) -> int:
+    return terna[2].interacciones
+
+@dataclass
+class AgregadosUsuario:
+    """
+    Resumen de las relaciones de un usuario, que se mantiene al añadir aristas.
+    """
+    grado: int = 0
+    interacciones: int = 0
+    dias_activa: ValoresOrdenados[int] = field(default_factory=ValoresOrdenados)
+
+    @property
+    def max_dias_activa(self) -> Optional[int]:
+        return self.dias_activa.maximo
+
+    def anadir(self, relacion: Relacion) -> None:
+        self.grado += 1
+        self.interacciones += relacion.interacciones
+        self.dias_activa.anadir(relacion.dias_activa)
+
+    def quitar(self, relacion: Relacion) -> None:
+        self.grado -= 1
+        self.interacciones -= relacion.interacciones
+        self.dias_activa.eliminar(relacion.dias_activa)
+
 class Red_social(Grafo[Usuario, Relacion]):
     """
     Representa una red social basada en el grafo genérico.
+
+    Además de las adyacencias mantiene, al añadir vértices y aristas, los agregados de cada usuario
+    (grado, interacciones totales y máximo de días activa de sus relaciones) e índices ordenados de
+    las relaciones por días activa y por interacciones, para responder consultas sin recorrer todas
+    las aristas. Los usuarios se indexan por nombre, por prefijo de apellidos y por fecha de nacimiento.
     """
     def __init__(self, es_dirigido: bool = False) -> None:
         super().__init__(es_dirigido)
         self.usuarios_dni: Dict[str, Usuario] = {}
+        self.agregados: Dict[Usuario, AgregadosUsuario] = {}
+        self.add_index('nombre', IndiceHash(attrgetter('nombre')))
+        self.add_index('apellidos', IndicePrefijo(attrgetter('apellidos')))
+        self.add_index('fecha_nacimiento', IndiceOrdenado(attrgetter('fecha_nacimiento')))
+        self.indice_dias_activa: IndiceOrdenado[int, Terna] = IndiceOrdenado(_dias_activa)
+        self.indice_interacciones: IndiceOrdenado[int, Terna] = IndiceOrdenado(_interacciones)
 
     @staticmethod
     def of(es_dirigido: bool = False) -> Red_social:
         return Red_social(es_dirigido)
 
+    def add_vertex(self, usuario: Usuario) -> None:
+        if usuario not in self.adyacencias:
+            super().add_vertex(usuario)
+            self.usuarios_dni[usuario.dni] = usuario
+            self.agregados[usuario] = AgregadosUsuario()
+
+    def add_edge(self, origen: Usuario, destino: Usuario, relacion: Relacion) -> None:
+        """
+        Añade una relación entre dos usuarios y actualiza los agregados y los índices. Si ya había
+        una relación entre ellos, se sustituye y deja de contar.
+        """
+        destinos = self.adyacencias.get(origen)
+        if destinos is not None and destino in destinos:
+            self._quitar_relacion(origen, destino, destinos[destino])
+        super().add_edge(origen, destino, relacion)
+        self.agregados[origen].anadir(relacion)
+        if destino != origen:
+            self.agregados[destino].anadir(relacion)
+        terna = (origen, destino, relacion)
+        self.indice_dias_activa.anadir(terna)
+        self.indice_interacciones.anadir(terna)
+
+    def _quitar_relacion(self, origen: Usuario, destino: Usuario, relacion: Relacion) -> None:
+        self.agregados[origen].quitar(relacion)
+        if destino != origen:
+            self.agregados[destino].quitar(relacion)
+        # En un grafo no dirigido la relación pudo añadirse en el otro sentido
+        for terna in ((origen, destino, relacion), (destino, origen, relacion)):
+            if self.indice_dias_activa.eliminar(terna):
+                self.indice_interacciones.eliminar(terna)
+                break
+
+    def agregados_usuario(self, usuario: Usuario) -> AgregadosUsuario:
+        """
+        Devuelve el grado, las interacciones totales y el máximo de días activa de las relaciones de
+        un usuario (en un grafo dirigido, las que salen y las que llegan a él).
+
+        :param usuario: Usuario de la red.
+        :return: Agregados del usuario; no se deben modificar.
+        """
+        return self.agregados[usuario]
+
+    def relaciones_por_dias_activa(self, minimo: Optional[int] = None, maximo: Optional[int] = None) -> List[Terna]:
+        """
+        Relaciones con días activa entre dos límites (incluidos), ordenadas por días activa.
+
+        :param minimo: Mínimo de días; None si no hay.
+        :param maximo: Máximo de días; None si no hay.
+        :return: Lista de ternas (origen, destino, relación).
+        """
+        return self.indice_dias_activa.rango(minimo, maximo)
+
+    def relaciones_por_interacciones(self, minimo: Optional[int] = None, maximo: Optional[int] = None) -> List[Terna]:
+        """
+        Relaciones con un número de interacciones entre dos límites (incluidos), ordenadas por interacciones.
+
+        :param minimo: Mínimo de interacciones; None si no hay.
+        :param maximo: Máximo de interacciones; None si no hay.
+        :return: Lista de ternas (origen, destino, relación).
+        """
+        return self.indice_interacciones.rango(minimo, maximo)
+
+    def usuarios_con_relaciones_activas(self, dias: int) -> Set[Usuario]:
+        """
+        Usuarios que tienen al menos una relación activa desde hace `dias` días o más.
+        """
+        return {usuario for origen, destino, _ in self.relaciones_por_dias_activa(dias)
+                for usuario in (origen, destino)}
+
+    def usuarios_nacidos_entre(self, desde: Optional[date] = None, hasta: Optional[date] = None) -> List[Usuario]:
+        """
+        Usuarios nacidos entre dos fechas (incluidas), ordenados por fecha de nacimiento.
+
+        :param desde: Primera fecha; None si no hay.
+        :param hasta: Última fecha; None si no hay.
+        :return: Lista de usuarios.
+        """
+        return self.index('fecha_nacimiento').rango(desde, hasta)
+
+    def usuarios_con_nombre(self, nombre: str) -> List[Usuario]:
+        """
+        Usuarios con un nombre dado, en el orden en que se añadieron.
+        """
+        return self.index('nombre').iguales(nombre)
+
+    def usuarios_con_apellidos(self, prefijo: str) -> List[Usuario]:
+        """
+        Usuarios cuyos apellidos empiezan por un prefijo, ordenados por apellidos.
+        """
+        return self.index('apellidos').con_prefijo(prefijo)
+
     @staticmethod
     def parse(f1: str, f2: str, es_dirigido: bool = False) -> Red_social:
         red = Red_social(es_dirigido)
@@ -58,7 +194,6 @@ class Red_social(Grafo[Usuario, Relacion]):
                 fecha_nacimiento = date.fromisoformat(fecha_str)
                 usuario = Usuario.of(dni, nombre, apellidos, fecha_nacimiento)
                 red.add_vertex(usuario)
-                red.usuarios_dni[dni] = usuario
         
         # Leer archivo de relaciones
         with open(f2, "r", encoding="utf-8") as file:
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import TypeVar, Generic, Dict, List, Tuple, Optional, Iterable
+import heapq
+import os
+
+from grafo import Grafo
+
+V = TypeVar('V')  # Tipo de los vértices
+E = TypeVar('E')  # Tipo de las aristas
+
+class IndiceVecindario(Generic[V]):
+    """
+    Vista compacta de un grafo para consultas de vecindario.
+
+    Cada vértice se numera con un entero y sus sucesores se guardan como un array ordenado de enteros,
+    de modo que las consultas no copian conjuntos de vértices en cada llamada.
+
+    Los vecinos comunes de a y b son los vértices v con aristas a -> v y v -> b, es decir, los
+    intermediarios de los caminos de dos saltos de a a b: en un grafo no dirigido son los vecinos que
+    comparten, y en uno dirigido, los sucesores de a que son predecesores de b. vecinos_comunes y
+    recomendar usan esta misma definición.
+    """
+    def __init__(self, grafo: Grafo[V, E]):
+        self.vertices: List[V] = list(grafo.adyacencias.keys())
+        self.indices: Dict[V, int] = {v: i for i, v in enumerate(self.vertices)}
+        self.adyacencias: List[array] = [
+            array('l', sorted(self.indices[d] for d in destinos))
+            for destinos in grafo.adyacencias.values()
+        ]
+        # Predecesores de cada vértice, también ordenados; en un grafo no dirigido son los sucesores
+        self.predecesores: List[array] = self.adyacencias
+        if grafo.es_dirigido:
+            self.predecesores = [array('l') for _ in self.vertices]
+            for v, destinos in enumerate(self.adyacencias):  # v crece, así que cada array queda ordenado
+                for w in destinos:
+                    self.predecesores[w].append(v)
+
+    @staticmethod
+    def of(grafo: Grafo[V, E]) -> IndiceVecindario[V]:
+        """
+        Método de factoría para crear el índice de vecindario de un grafo.
+
+        :param grafo: Grafo a indexar. Cambios posteriores en el grafo no se reflejan en el índice.
+        :return: Nuevo índice de vecindario.
+        """
+        return IndiceVecindario(grafo)
+
+    def k_hop(self, vertice: V, k: int) -> Dict[V, int]:
+        """
+        Devuelve los vértices alcanzables en como mucho k saltos desde un vértice.
+
+        :param vertice: Vértice de partida.
+        :param k: Número máximo de saltos.
+        :return: Diccionario vértice -> distancia en saltos (el vértice de partida no se incluye).
+        """
+        if k < 0:
+            raise ValueError("k tiene que ser mayor o igual que 0.")
+        origen = self.indices[vertice]
+        distancias: Dict[int, int] = {origen: 0}
+        frontera: List[int] = [origen]
+        for nivel in range(1, k + 1):
+            siguiente: List[int] = []
+            for v in frontera:
+                for w in self.adyacencias[v]:
+                    if w not in distancias:
+                        distancias[w] = nivel
+                        siguiente.append(w)
+            if not siguiente:
+                break
+            frontera = siguiente
+        del distancias[origen]
+        return {self.vertices[i]: d for i, d in distancias.items()}
+
+    def vecinos_comunes(self, a: V, b: V) -> int:
+        """
+        Cuenta los vecinos comunes de dos vértices (ver la documentación de la clase) intersecando los
+        sucesores de a con los predecesores de b, dos arrays ordenados.
+
+        :param a: Primer vértice.
+        :param b: Segundo vértice.
+        :return: Número de vértices v con aristas a -> v y v -> b.
+        """
+        xs = self.adyacencias[self.indices[a]]
+        ys = self.predecesores[self.indices[b]]
+        if len(xs) > len(ys):
+            xs, ys = ys, xs
+        if len(xs) * 8 < len(ys):
+            # Si una lista es mucho más corta, buscamos sus elementos en la otra por bisección
+            comunes = 0
+            inicio = 0
+            for x in xs:
+                inicio = bisect_left(ys, x, inicio)
+                if inicio == len(ys):
+                    break
+                if ys[inicio] == x:
+                    comunes += 1
+            return comunes
+        comunes = 0
+        i = j = 0
+        while i < len(xs) and j < len(ys):
+            if xs[i] == ys[j]:
+                comunes += 1
+                i += 1
+                j += 1
+            elif xs[i] < ys[j]:
+                i += 1
+            else:
+                j += 1
+        return comunes
+
+    def recomendar(self, vertice: V, n: int = 5, k: int = 2) -> List[Tuple[V, int]]:
+        """
+        Recomienda los vértices a como mucho k saltos que aún no están conectados con el vértice dado,
+        ordenados por número de vecinos comunes (los mismos que vecinos_comunes(vertice, candidato)).
+
+        Solo se mantiene un montículo con los n mejores candidatos; a igualdad de vecinos comunes
+        se prefiere el vértice que aparece antes en el grafo.
+
+        :param vertice: Vértice para el que se buscan recomendaciones.
+        :param n: Número máximo de recomendaciones.
+        :param k: Número máximo de saltos de los candidatos.
+        :return: Lista de pares (vértice, vecinos comunes) de mayor a menor.
+        """
+        if n <= 0:
+            return []
+        origen = self.indices[vertice]
+        vecinos = self.adyacencias[origen]
+        conectados = set(vecinos)
+        conectados.add(origen)
+
+        # Los vecinos comunes se cuentan recorriendo los sucesores de los sucesores (cada camino
+        # vertice -> v -> w suma uno a w), sin intersecar la lista de cada candidato por separado
+        comunes: Dict[int, int] = {}
+        for v in vecinos:
+            for w in self.adyacencias[v]:
+                if w not in conectados:
+                    comunes[w] = comunes.get(w, 0) + 1
+
+        candidatos: Iterable[Tuple[int, int]] = ((c, -w) for w, c in comunes.items())
+        if k > 2:
+            lejanos = (self.indices[v] for v, d in self.k_hop(vertice, k).items() if d > 2)
+            candidatos = chain(candidatos, ((0, -w) for w in lejanos))
+        elif k < 2:
+            candidatos = ()
+
+        mejores = heapq.nlargest(n, candidatos)
+        return [(self.vertices[-w], c) for c, w in mejores]
+
+# Índice compartido con los procesos trabajadores de recomendar_lote
+_indice_trabajador: Optional[IndiceVecindario] = None
+
+def _iniciar_trabajador(indice: IndiceVecindario) -> None:
+    global _indice_trabajador
+    _indice_trabajador = indice
+
+def _recomendar_trabajador(vertice, n: int, k: int):
+    return _indice_trabajador.recomendar(vertice, n, k)
+
+def recomendar_lote(indice: IndiceVecindario[V], vertices: List[V], n: int = 5, k: int = 2,
+                    procesos: Optional[int] = None) -> Dict[V, List[Tuple[V, int]]]:
+    """
+    Calcula las recomendaciones de muchos vértices repartiéndolas entre varios procesos.
+
+    :param indice: Índice de vecindario sobre el que se consulta.
+    :param vertices: Vértices para los que se quieren recomendaciones.
+    :param n: Número máximo de recomendaciones por vértice.
+    :param k: Número máximo de saltos de los candidatos.
+    :param procesos: Número de procesos; con 1 se calcula en el proceso actual.
+    :return: Diccionario vértice -> lista de pares (vértice recomendado, vecinos comunes).
+    """
+    if procesos == 1 or len(vertices) < 2:
+        return {v: indice.recomendar(v, n, k) for v in vertices}
+    procesos = procesos or os.cpu_count() or 1
+    tam_bloque = max(1, len(vertices) // (4 * procesos))
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(indice,)) as ejecutor:
+        resultados = ejecutor.map(_recomendar_trabajador, vertices, [n] * len(vertices), [k] * len(vertices),
+                                  chunksize=tam_bloque)
+        return dict(zip(vertices, resultados))
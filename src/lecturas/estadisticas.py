@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial, reduce
+from typing import List, Optional, Set, Tuple
+import mmap
+import os
+
+import numpy as np
+
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS, Tokenizador
+
+# Tamaño en bytes de cada bloque del fichero que se procesa de una vez con NumPy
+TAM_BLOQUE = 1 << 20
+
+# Bytes que str.strip() y str.split() consideran espacio en blanco dentro del rango ASCII
+ESPACIOS_ASCII = np.zeros(256, dtype=bool)
+ESPACIOS_ASCII[[9, 10, 11, 12, 13, 28, 29, 30, 31, 32]] = True
+
+@dataclass
+class EstadisticasLineas:
+    num_lineas: int = 0
+    total_caracteres: int = 0  # Suma de las longitudes de las líneas tras strip()
+    minimo: Optional[int] = None
+    maximo: Optional[int] = None
+    frecuencias_longitud: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))  # Posición = longitud
+    palabras: Optional[Set[str]] = None  # Palabras distintas, si se han pedido
+
+    @property
+    def media(self) -> Optional[float]:
+        if self.num_lineas == 0:
+            return None
+        return self.total_caracteres / self.num_lineas
+
+    def histograma(self, num_intervalos: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Agrupa las longitudes de línea en intervalos de igual anchura.
+
+        :param num_intervalos: Número de intervalos.
+        :return: Par (cuentas, bordes) como el de np.histogram.
+        """
+        longitudes = np.arange(self.frecuencias_longitud.size)
+        return np.histogram(longitudes, bins=num_intervalos, weights=self.frecuencias_longitud)
+
+    def fusionar(self, otro: EstadisticasLineas) -> EstadisticasLineas:
+        """
+        Suma las estadísticas de otra parte del fichero.
+
+        :param otro: Estadísticas a sumar; no se modifican.
+        :return: Estas mismas estadísticas.
+        """
+        self.num_lineas += otro.num_lineas
+        self.total_caracteres += otro.total_caracteres
+        if otro.minimo is not None:
+            self.minimo = otro.minimo if self.minimo is None else min(self.minimo, otro.minimo)
+            self.maximo = otro.maximo if self.maximo is None else max(self.maximo, otro.maximo)
+        tam = max(self.frecuencias_longitud.size, otro.frecuencias_longitud.size)
+        frecuencias = np.zeros(tam, dtype=np.int64)
+        frecuencias[:self.frecuencias_longitud.size] += self.frecuencias_longitud
+        frecuencias[:otro.frecuencias_longitud.size] += otro.frecuencias_longitud
+        self.frecuencias_longitud = frecuencias
+        if otro.palabras is not None:
+            self.palabras = otro.palabras if self.palabras is None else self.palabras | otro.palabras
+        return self
+
+def estadisticas_bloque(datos: np.ndarray, con_palabras: bool = False,
+                        tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS) -> EstadisticasLineas:
+    """
+    Calcula las estadísticas de un bloque de bytes UTF-8 formado por líneas completas.
+
+    Los fines de línea son '\n', '\r\n' y '\r', como al leer en modo texto. La longitud de cada línea
+    es la de linea.strip() en caracteres: es su número de bytes menos los bytes de continuación UTF-8,
+    que se cuentan con np.searchsorted. Solo en las líneas que empiezan o terminan con un espacio se
+    buscan el primer y el último byte que no lo son, y las pocas que empiezan o terminan con un
+    carácter no ASCII (que podría ser un espacio Unicode) se decodifican y se miden con str.strip().
+
+    :param datos: Array de bytes (uint8).
+    :param con_palabras: Si es True calcula también el conjunto de palabras distintas.
+    :param tokenizador: Tokenizador que define las palabras; por defecto, str.split().
+    :return: Estadísticas del bloque.
+    """
+    n = datos.size
+    es_n, es_r = datos == 10, datos == 13
+    if es_r.any():
+        anterior_es_r = np.zeros(n, dtype=bool)
+        anterior_es_r[1:] = es_r[:-1]
+        finales = np.flatnonzero(es_r | (es_n & ~anterior_es_r))  # En '\r\n' la línea termina en el '\r'
+        # La línea siguiente empieza después del fin de línea, que ocupa dos bytes si es '\r\n'
+        siguientes = finales + 1 + (es_r[finales] & np.append(es_n, False)[finales + 1])
+    else:
+        finales = np.flatnonzero(es_n)
+        siguientes = finales + 1
+    inicios = np.concatenate(([0], siguientes))
+    finales = np.concatenate((finales, [n]))
+    if inicios[-1] >= n:  # Después del último fin de línea no hay otra línea
+        inicios, finales = inicios[:-1], finales[:-1]
+
+    # Primer y último byte de cada línea tras quitar los espacios ASCII de los extremos
+    primeros, ultimos = inicios.copy(), finales - 1
+    no_vacias = np.flatnonzero(finales > inicios)
+    recortar = no_vacias[ESPACIOS_ASCII[datos[inicios[no_vacias]]] | ESPACIOS_ASCII[datos[finales[no_vacias] - 1]]]
+    if recortar.size:
+        no_espacio = np.flatnonzero(np.append(~ESPACIOS_ASCII[datos], True))  # Con un centinela en n
+        primero = np.searchsorted(no_espacio, inicios[recortar])
+        ultimo = np.searchsorted(no_espacio, finales[recortar]) - 1
+        vacias = primero > ultimo
+        primeros[recortar] = np.where(vacias, 0, no_espacio[primero])
+        ultimos[recortar] = np.where(vacias, -1, no_espacio[np.maximum(ultimo, 0)])
+    longitudes = ultimos - primeros + 1
+    continuacion = np.flatnonzero((datos >= 0x80) & (datos < 0xC0))
+    if continuacion.size:
+        # Los bytes que se quitan con strip() son ASCII, así que basta contar los de cada línea completa
+        longitudes -= np.diff(np.searchsorted(continuacion, np.append(inicios, n)))
+        con_contenido = np.flatnonzero(longitudes > 0)
+        no_ascii = (datos[primeros[con_contenido]] >= 0x80) | (datos[ultimos[con_contenido]] >= 0x80)
+        for k in con_contenido[no_ascii].tolist():
+            longitudes[k] = len(datos[inicios[k]:finales[k]].tobytes().decode('utf-8').strip())
+
+    estadisticas = EstadisticasLineas(num_lineas=int(inicios.size), total_caracteres=int(longitudes.sum()),
+                                      frecuencias_longitud=np.bincount(longitudes))
+    if inicios.size:
+        estadisticas.minimo, estadisticas.maximo = int(longitudes.min()), int(longitudes.max())
+    if con_palabras:
+        estadisticas.palabras = set(tokenizador.tokenizar(datos.tobytes().decode('utf-8')))
+    return estadisticas
+
+def _cortes(memoria: mmap.mmap, inicio: int, fin: int, tam_bloque: int) -> List[Tuple[int, int]]:
+    """
+    Divide los bytes inicio:fin en bloques de unos tam_bloque bytes que terminan justo después de un '\\n'.
+    """
+    cortes = []
+    while inicio < fin:
+        corte = min(inicio + tam_bloque, fin)
+        if corte < fin:
+            salto = memoria.rfind(b'\n', inicio, corte)
+            if salto < 0:  # Línea más larga que el bloque: llega hasta el siguiente salto
+                salto = memoria.find(b'\n', corte, fin)
+            corte = fin if salto < 0 else salto + 1
+        cortes.append((inicio, corte))
+        inicio = corte
+    return cortes
+
+def estadisticas_rango(fichero: str, inicio: int = 0, fin: Optional[int] = None, con_palabras: bool = False,
+                       tam_bloque: int = TAM_BLOQUE, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS
+                       ) -> EstadisticasLineas:
+    """
+    Calcula en una sola pasada las estadísticas de líneas (y opcionalmente las palabras distintas) de
+    los bytes inicio:fin de un fichero, proyectándolo en memoria con mmap y procesándolo por bloques.
+
+    :param fichero: Ruta del fichero (UTF-8).
+    :param inicio: Primer byte; tiene que ser el comienzo de una línea.
+    :param fin: Byte final (excluido); tiene que ser el final de una línea. Por defecto, el final del fichero.
+    :param con_palabras: Si es True calcula también el conjunto de palabras distintas.
+    :param tam_bloque: Tamaño aproximado en bytes de cada bloque.
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Estadísticas del rango.
+    """
+    estadisticas = EstadisticasLineas(palabras=set() if con_palabras else None)
+    tamano = os.path.getsize(fichero)
+    fin = tamano if fin is None else fin
+    if fin <= inicio:  # mmap no admite ficheros vacíos
+        return estadisticas
+    with open(fichero, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memoria:
+        for desde, hasta in _cortes(memoria, inicio, fin, tam_bloque):
+            # Se copia el bloque: un array que apuntase al mmap impediría cerrarlo si hay una excepción
+            datos = np.frombuffer(memoria[desde:hasta], dtype=np.uint8)
+            estadisticas.fusionar(estadisticas_bloque(datos, con_palabras, tokenizador))
+    return estadisticas
+
+def rangos_lineas(fichero: str, partes: int) -> List[Tuple[int, int]]:
+    """
+    Divide un fichero en como mucho `partes` rangos de bytes de tamaño parecido que empiezan y
+    terminan en un límite de línea.
+
+    :param fichero: Ruta del fichero.
+    :param partes: Número de rangos deseado.
+    :return: Lista de pares (inicio, fin) que cubren el fichero en orden.
+    """
+    tamano = os.path.getsize(fichero)
+    if tamano == 0:
+        return []
+    with open(fichero, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memoria:
+        return _cortes(memoria, 0, tamano, -(-tamano // max(1, partes)))
+
+def estadisticas_lineas(fichero: str, con_palabras: bool = False, procesos: Optional[int] = 1,
+                        tam_bloque: int = TAM_BLOQUE, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS
+                        ) -> EstadisticasLineas:
+    """
+    Calcula las estadísticas de las líneas de un fichero: número de líneas, longitud media, mínima y
+    máxima tras strip(), frecuencia de cada longitud y, si se pide, las palabras distintas.
+
+    Con varios procesos el fichero se divide en rangos de líneas completas (ver rangos_lineas), cada
+    proceso calcula las estadísticas de su rango y después se suman.
+
+    :param fichero: Ruta del fichero (UTF-8).
+    :param con_palabras: Si es True calcula también el conjunto de palabras distintas.
+    :param procesos: Número de procesos; None usa uno por núcleo.
+    :param tam_bloque: Tamaño aproximado en bytes de cada bloque.
+    :param tokenizador: Tokenizador que define las palabras.
+    :return: Estadísticas del fichero.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    rangos = rangos_lineas(fichero, procesos)
+    if procesos == 1 or len(rangos) <= 1:
+        return estadisticas_rango(fichero, con_palabras=con_palabras, tam_bloque=tam_bloque, tokenizador=tokenizador)
+    calcular = partial(estadisticas_rango, fichero, con_palabras=con_palabras, tam_bloque=tam_bloque,
+                       tokenizador=tokenizador)
+    with ProcessPoolExecutor(max_workers=len(rangos)) as pool:
+        partes = list(pool.map(calcular, *zip(*rangos)))
+    return reduce(EstadisticasLineas.fusionar, partes)
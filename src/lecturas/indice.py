@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sys
+
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS, Tokenizador
+
+# Se incrementa si cambia el formato guardado, para que los índices antiguos se reconstruyan
+VERSION_INDICE = 4
+EXTENSION_INDICE = ".indice"
+# Número máximo de índices que se mantienen cargados en el proceso; se descartan los usados hace más tiempo
+MAX_CARGADOS = 16
+
+class IndiceInvertido:
+    """
+    Índice invertido de un fichero de texto: para cada palabra (según el tokenizador; por defecto,
+    separando por espacios como str.split()) guarda las líneas en las que aparece y el número total de
+    apariciones. Guarda también la posición en bytes en la que empieza cada línea para poder leerlas
+    sin recorrer el fichero.
+
+    Las líneas se numeran desde 1 y terminan en '\\n', '\\r\\n' o '\\r', como al leer en modo texto.
+
+    En disco (fichero + ".indice") se guarda una línea de cabecera en JSON (versión, tokenizador,
+    firma, vocabulario, cuentas) seguida de los arrays de enteros en binario. Al cargarlo no se
+    ejecuta nada, a diferencia de pickle, así que un .indice manipulado como mucho da un índice
+    incorrecto o se descarta.
+    """
+    # Caché LRU de índices ya cargados en este proceso, por ruta absoluta del fichero y configuración del tokenizador
+    _cargados: OrderedDict[Tuple[str, tuple], IndiceInvertido] = OrderedDict()
+
+    def __init__(self, fichero: str, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS):
+        self.fichero: str = fichero
+        self.tokenizador: Tokenizador = tokenizador
+        self.firma: Tuple[int, int, int, int] = IndiceInvertido._firma(fichero)
+        self.cuentas: Dict[str, int] = {}
+        self.lineas_palabra: Dict[str, array] = {}
+        self.desplazamientos: array = array('q')
+
+        resumen = hashlib.blake2b(digest_size=16)
+        posicion = 0
+        numero = 0
+        with open(fichero, 'rb') as file:
+            for bloque in file:
+                resumen.update(bloque)
+                # bytes.splitlines corta también en los '\r' sueltos y deja junto cada '\r\n'
+                for linea in bloque.splitlines(keepends=True):
+                    numero += 1
+                    self.desplazamientos.append(posicion)
+                    posicion += len(linea)
+                    for palabra in tokenizador.tokenizar(linea.decode('utf-8')):
+                        self.cuentas[palabra] = self.cuentas.get(palabra, 0) + 1
+                        lineas = self.lineas_palabra.get(palabra)
+                        if lineas is None:
+                            self.lineas_palabra[palabra] = array('q', [numero])
+                        elif lineas[-1] != numero:
+                            lineas.append(numero)
+        self.resumen: bytes = resumen.digest()  # blake2b del contenido
+
+    @staticmethod
+    def of(fichero: str, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS) -> IndiceInvertido:
+        """
+        Método de factoría que construye el índice de un fichero leyéndolo entero.
+
+        :param fichero: Ruta del fichero (UTF-8).
+        :param tokenizador: Tokenizador que define las palabras.
+        :return: Nuevo índice, sin guardar en disco.
+        """
+        return IndiceInvertido(fichero, tokenizador)
+
+    @staticmethod
+    def cargar(fichero: str, persistir: bool = True, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS) -> IndiceInvertido:
+        """
+        Devuelve el índice de un fichero reconstruyéndolo solo si el fichero ha cambiado.
+
+        Se busca primero entre los índices ya cargados en el proceso y después en disco, junto al
+        fichero (fichero + ".indice"). El índice sirve si el fichero tiene la misma fecha de
+        modificación, tamaño, inodo y fecha de cambio (ctime) que cuando se construyó. Si alguno ha
+        cambiado pero el tamaño no (por ejemplo, al restaurar o copiar el fichero), se compara el
+        resumen blake2b del contenido y, si coincide, se sigue usando. Si no, o se pide otro
+        tokenizador, se vuelve a construir y se guarda.
+
+        :param fichero: Ruta del fichero (UTF-8).
+        :param persistir: Si es False no se lee ni se escribe el índice en disco.
+        :param tokenizador: Tokenizador que define las palabras.
+        :return: Índice actualizado.
+        """
+        clave = (os.path.abspath(fichero), tokenizador.clave)
+        firma = IndiceInvertido._firma(fichero)
+        cargados = IndiceInvertido._cargados
+        indice = cargados.get(clave)
+        if indice is not None and not indice._vigente(firma):
+            indice = None
+        if indice is None:
+            indice = IndiceInvertido._leer(fichero, firma, tokenizador) if persistir else None
+            if indice is None:
+                indice = IndiceInvertido(fichero, tokenizador)
+                if persistir:
+                    indice.guardar()
+            cargados[clave] = indice
+        cargados.move_to_end(clave)
+        while len(cargados) > MAX_CARGADOS:
+            cargados.popitem(last=False)
+        return indice
+
+    @staticmethod
+    def _firma(fichero: str) -> Tuple[int, int, int, int]:
+        estado = os.stat(fichero)
+        return estado.st_mtime_ns, estado.st_size, estado.st_ino, estado.st_ctime_ns
+
+    @staticmethod
+    def _resumen(fichero: str) -> bytes:
+        resumen = hashlib.blake2b(digest_size=16)
+        with open(fichero, 'rb') as file:
+            for bloque in iter(lambda: file.read(1 << 20), b''):
+                resumen.update(bloque)
+        return resumen.digest()
+
+    def _vigente(self, firma: Tuple[int, int, int, int]) -> bool:
+        """
+        Indica si el índice corresponde al fichero con esa firma. Si solo cambian la fecha, el inodo o
+        ctime se lee el fichero para comparar el resumen, y si es el mismo se actualiza la firma.
+        """
+        if self.firma == firma:
+            return True
+        if self.firma[1] != firma[1] or IndiceInvertido._resumen(self.fichero) != self.resumen:
+            return False
+        self.firma = firma
+        return True
+
+    @staticmethod
+    def _leer(fichero: str, firma: Tuple[int, int, int, int], tokenizador: Tokenizador) -> Optional[IndiceInvertido]:
+        try:
+            with open(fichero + EXTENSION_INDICE, 'rb') as file:
+                cabecera = json.loads(file.readline())
+                if cabecera['version'] != VERSION_INDICE or tuple(cabecera['tokenizador']) != tokenizador.clave:
+                    return None
+                palabras, longitudes = cabecera['palabras'], cabecera['longitudes']
+                desplazamientos, todas = array('q'), array('q')
+                desplazamientos.fromfile(file, cabecera['num_lineas'])
+                todas.fromfile(file, sum(longitudes))
+                if file.read(1) or len(palabras) != len(longitudes) or len(palabras) != len(cabecera['cuentas']):
+                    return None
+            indice = IndiceInvertido.__new__(IndiceInvertido)
+            indice.fichero, indice.tokenizador = fichero, tokenizador
+            indice.firma = tuple(cabecera['firma'])
+            indice.resumen = bytes.fromhex(cabecera['resumen'])
+        except (OSError, EOFError, ValueError, KeyError, TypeError):  # json.JSONDecodeError es un ValueError
+            return None
+        if cabecera['orden_bytes'] != sys.byteorder:
+            desplazamientos.byteswap()
+            todas.byteswap()
+        indice.desplazamientos = desplazamientos
+        indice.cuentas = dict(zip(palabras, cabecera['cuentas']))
+        indice.lineas_palabra = {}
+        inicio = 0
+        for palabra, longitud in zip(palabras, longitudes):
+            indice.lineas_palabra[palabra] = todas[inicio:inicio + longitud]
+            inicio += longitud
+        if indice.firma == firma:
+            return indice
+        if not indice._vigente(firma):
+            return None
+        indice.guardar()  # Con la firma nueva, para no volver a comparar el contenido
+        return indice
+
+    def guardar(self) -> None:
+        """
+        Guarda el índice junto al fichero. Se escribe en un fichero temporal que después se renombra,
+        para que nunca quede un índice a medio escribir. Si no se puede escribir no se guarda.
+        """
+        ruta = self.fichero + EXTENSION_INDICE
+        palabras = list(self.lineas_palabra)
+        cabecera = {'version': VERSION_INDICE, 'tokenizador': list(self.tokenizador.clave),
+                    'firma': list(self.firma), 'resumen': self.resumen.hex(), 'orden_bytes': sys.byteorder,
+                    'num_lineas': len(self.desplazamientos), 'palabras': palabras,
+                    'cuentas': [self.cuentas[palabra] for palabra in palabras],
+                    'longitudes': [len(self.lineas_palabra[palabra]) for palabra in palabras]}
+        try:
+            with open(ruta + ".tmp", 'wb') as file:
+                file.write(json.dumps(cabecera, ensure_ascii=False).encode('utf-8') + b'\n')
+                self.desplazamientos.tofile(file)
+                for palabra in palabras:
+                    self.lineas_palabra[palabra].tofile(file)
+            os.replace(ruta + ".tmp", ruta)
+        except OSError:
+            pass
+
+    @property
+    def num_lineas(self) -> int:
+        return len(self.desplazamientos)
+
+    def cuenta(self, palabra: str) -> int:
+        """
+        Número de veces que aparece una palabra.
+        """
+        return self.cuentas.get(palabra, 0)
+
+    def lineas(self, palabra: str) -> List[int]:
+        """
+        Números de las líneas en las que aparece una palabra completa, en orden.
+        """
+        return self.lineas_palabra.get(palabra, array('q')).tolist()
+
+    def cuentas_lote(self, palabras: Iterable[str]) -> Dict[str, int]:
+        """
+        Responde a muchas consultas de apariciones a la vez.
+
+        :param palabras: Palabras a consultar.
+        :return: Diccionario palabra -> número de apariciones.
+        """
+        cuentas = self.cuentas
+        return {palabra: cuentas.get(palabra, 0) for palabra in palabras}
+
+    def lineas_lote(self, palabras: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        Responde a muchas consultas de líneas a la vez.
+
+        :param palabras: Palabras a consultar.
+        :return: Diccionario palabra -> números de línea en orden.
+        """
+        return {palabra: self.lineas(palabra) for palabra in palabras}
+
+    def lineas_con(self, texto: str) -> List[int]:
+        """
+        Números de las líneas que contienen un texto, aunque sea dentro de una palabra (como `texto in linea`).
+
+        Si el texto no tiene espacios solo puede aparecer dentro de una palabra, así que basta con
+        recorrer el vocabulario en lugar del fichero. Si tiene espacios, o el tokenizador modifica las
+        palabras (y el vocabulario ya no es el texto original), se leen las líneas.
+
+        :param texto: Texto buscado.
+        :return: Números de línea en orden.
+        """
+        if not texto:
+            return list(range(1, self.num_lineas + 1))
+        if texto.split() == [texto] and self.tokenizador == TOKENIZADOR_ESPACIOS:
+            lineas = set()
+            for palabra, numeros in self.lineas_palabra.items():
+                if texto in palabra:
+                    lineas.update(numeros)
+            return sorted(lineas)
+        return [numero for numero, linea in enumerate(self.texto_lineas(range(1, self.num_lineas + 1)), 1)
+                if texto in linea]
+
+    def texto_lineas(self, numeros: Iterable[int]) -> List[str]:
+        """
+        Lee del fichero el texto de varias líneas usando sus posiciones guardadas.
+
+        :param numeros: Números de línea (desde 1).
+        :return: Texto de cada línea, sin el salto de línea final.
+        :raise ValueError: Si el fichero ha cambiado desde que se construyó el índice.
+        """
+        if not self._vigente(IndiceInvertido._firma(self.fichero)):
+            raise ValueError(f"El fichero {self.fichero} ha cambiado; hay que volver a cargar el índice.")
+        textos = []
+        with open(self.fichero, 'rb') as file:
+            for numero in numeros:
+                file.seek(self.desplazamientos[numero - 1])
+                lineas = file.readline().splitlines()  # Hasta el primer fin de línea, también '\r'
+                textos.append(lineas[0].decode('utf-8') if lineas else '')
+        return textos
@@ -1,40 +1,31 @@
+from lecturas.indice import IndiceInvertido
+from lecturas.estadisticas import EstadisticasLineas, estadisticas_lineas
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS # Mismas palabras en ejercicio_6, 7 y 8: str.split()
 def ejercicio_6():
     nombre_fichero = "fichero.txt"
-    separador:str = " "
-    with open(nombre_fichero, "r", encoding="utf-8") as archivo:
-        print("¿Qué palabra quieres contar cuántas veces está?")
-        palabra:str = input(" ")
-        contenido:str = archivo.read()
-        palabras:str = contenido.split(separador)
-        contador:int = palabras.count(palabra)
-        return contador
+    # El índice se guarda junto al fichero y solo se reconstruye si el fichero cambia
+    indice: IndiceInvertido = IndiceInvertido.cargar(nombre_fichero, tokenizador=TOKENIZADOR_ESPACIOS)
+    print("¿Qué palabra quieres contar cuántas veces está?")
+    palabra:str = input(" ")
+    contador:int = indice.cuenta(palabra)
+    return contador
 def ejercicio_7():
     nombre_fichero = "fichero.txt"
-    lineas:list = []
-    with open(nombre_fichero, "r", encoding="utf-8") as archivo:
-        print("¿Qué palabra quieres ver en qué líneas está?")
-        palabra_buscada:str = input(" ")
-        for linea in archivo:
-            if palabra_buscada in linea:
-                lineas.append(linea.strip())
+    indice: IndiceInvertido = IndiceInvertido.cargar(nombre_fichero, tokenizador=TOKENIZADOR_ESPACIOS)
+    print("¿Qué palabra quieres ver en qué líneas está?")
+    palabra_buscada:str = input(" ")
+    lineas:list = [linea.strip() for linea in indice.texto_lineas(indice.lineas_con(palabra_buscada))]
     return lineas
 def ejercicio_8():
     nombre_fichero = "fichero2.txt"
-    palabras_ = set()
-    with open(nombre_fichero, "r", encoding = "utf-8") as archivo:
-        for linea in archivo:
-            palabras = linea.split()
-            palabras_.update(palabras)
+    # Una sola pasada por bloques sobre el fichero proyectado en memoria
+    palabras_:set = estadisticas_lineas(nombre_fichero, con_palabras=True, tokenizador=TOKENIZADOR_ESPACIOS).palabras
     return f"Las palabras únicas en el fichero resources/archivo_palabras.txt son: {list(palabras_)}"
 def ejercicio_9():
-    total_longitud:int = 0
-    total_lineas:int = 0
     fichero:str = input("¿Qué archivo quieres revisar su longitud média? ¿vacio.csv o palabras_random.csv? ")
-    with open(fichero, "r", encoding="utf-8") as archivo:
-        for linea in archivo:
-            linea = linea.strip()
-            total_longitud += len(linea)
-            total_lineas += 1
+    estadisticas: EstadisticasLineas = estadisticas_lineas(fichero)
+    total_longitud:int = estadisticas.total_caracteres
+    total_lineas:int = estadisticas.num_lineas
     
     if total_lineas == 0:
         return f"Este archivo tiene 0 líneas."
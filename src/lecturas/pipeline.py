@@ -0,0 +1,381 @@
+"""
+Pipeline asíncrono para analizar muchos ficheros de texto guardados en almacenamiento lento (por
+ejemplo, un disco de red).
+
+Los ficheros se leen con asyncio, como mucho `max_abiertos` a la vez, y se cortan en bloques de
+líneas completas que pasan por una cola acotada a un grupo de trabajadores (procesos o hilos). Cuando
+la cola está llena los lectores esperan, así que la memoria usada no depende del tamaño de los
+ficheros. Cada bloque pasa por todas las etapas (conteo de palabras, búsqueda, estadísticas de
+líneas...) y los resultados parciales se fusionan en el orden de los ficheros y de los bloques.
+
+Uso:
+    resultados = procesar_ficheros(["a.txt", "b.txt"], [EtapaConteoPalabras(), EtapaBusqueda("python")])
+    resultados["conteo_palabras"].most_common(5)
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import asyncio
+import os
+
+import numpy as np
+
+from funciones.frecuencias import ficheros_texto
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS, TOKENIZADOR_PALABRAS, Tokenizador
+from lecturas.estadisticas import EstadisticasLineas, estadisticas_bloque
+
+TAM_BLOQUE = 1 << 20
+EJECUTORES = ('procesos', 'hilos')
+
+@dataclass(frozen=True)
+class Bloque:
+    fichero: str
+    orden_fichero: int  # Posición del fichero en la lista de entrada
+    numero: int  # Posición del bloque dentro del fichero
+    primera_linea: int  # Número (desde 1) de la primera línea del bloque
+    datos: bytes  # Líneas completas en UTF-8
+
+    @property
+    def texto(self) -> str:
+        return self.datos.decode('utf-8')
+
+def contar_lineas(datos: bytes) -> int:
+    """
+    Número de fines de línea ('\\n', '\\r\\n' o '\\r') de un bloque, como al leer en modo texto.
+    """
+    return datos.count(b'\n') + datos.count(b'\r') - datos.count(b'\r\n')
+
+def lineas_bloque(texto: str) -> List[str]:
+    """
+    Divide un bloque de líneas completas en líneas, sin los fines de línea.
+    """
+    lineas = texto.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if lineas and lineas[-1] == "":
+        lineas.pop()
+    return lineas
+
+class Etapa(ABC):
+    """
+    Operación que se aplica a cada bloque de texto del pipeline.
+
+    procesar se ejecuta en un trabajador (con el ejecutor de procesos la etapa se envía serializada
+    con pickle) y devuelve un resultado parcial del mismo tipo que inicial(). fusionar se ejecuta en el
+    bucle de eventos y suma a un acumulado un parcial, siempre en el orden de los ficheros y de los
+    bloques, así que una etapa puede depender de ese orden.
+    """
+    nombre: str = "etapa"
+
+    @abstractmethod
+    def inicial(self) -> Any:
+        pass
+
+    @abstractmethod
+    def procesar(self, bloque: Bloque) -> Any:
+        pass
+
+    @abstractmethod
+    def fusionar(self, acumulado: Any, parcial: Any) -> Any:
+        pass
+
+    def resultado(self, acumulado: Any) -> Any:
+        return acumulado
+
+class EtapaConteoPalabras(Etapa):
+    """
+    Cuenta las palabras; con el tokenizador por defecto da el mismo Counter que contar_palabras.
+    """
+    nombre = "conteo_palabras"
+
+    def __init__(self, tokenizador: Tokenizador = TOKENIZADOR_PALABRAS):
+        self.tokenizador: Tokenizador = tokenizador
+
+    def inicial(self) -> Counter:
+        return Counter()
+
+    def procesar(self, bloque: Bloque) -> Counter:
+        return Counter(self.tokenizador.tokenizar(bloque.texto))
+
+    def fusionar(self, acumulado: Counter, parcial: Counter) -> Counter:
+        acumulado.update(parcial)
+        return acumulado
+
+class EtapaBusqueda(Etapa):
+    """
+    Busca las líneas que contienen un texto, como lecturas.ejercicio_7.
+
+    El resultado es una lista de ternas (fichero, número de línea, línea sin espacios en los extremos).
+    """
+    nombre = "busqueda"
+
+    def __init__(self, texto: str):
+        self.texto: str = texto
+
+    def inicial(self) -> List[Tuple[str, int, str]]:
+        return []
+
+    def procesar(self, bloque: Bloque) -> List[Tuple[str, int, str]]:
+        return [(bloque.fichero, bloque.primera_linea + i, linea.strip())
+                for i, linea in enumerate(lineas_bloque(bloque.texto)) if self.texto in linea]
+
+    def fusionar(self, acumulado: List[Tuple[str, int, str]],
+                 parcial: List[Tuple[str, int, str]]) -> List[Tuple[str, int, str]]:
+        acumulado.extend(parcial)
+        return acumulado
+
+class EtapaEstadisticasLineas(Etapa):
+    """
+    Estadísticas de longitud de línea y, opcionalmente, palabras distintas (ver lecturas.estadisticas).
+    """
+    nombre = "estadisticas_lineas"
+
+    def __init__(self, con_palabras: bool = False, tokenizador: Tokenizador = TOKENIZADOR_ESPACIOS):
+        self.con_palabras: bool = con_palabras
+        self.tokenizador: Tokenizador = tokenizador
+
+    def inicial(self) -> EstadisticasLineas:
+        return EstadisticasLineas(palabras=set() if self.con_palabras else None)
+
+    def procesar(self, bloque: Bloque) -> EstadisticasLineas:
+        return estadisticas_bloque(np.frombuffer(bloque.datos, dtype=np.uint8), self.con_palabras, self.tokenizador)
+
+    def fusionar(self, acumulado: EstadisticasLineas, parcial: EstadisticasLineas) -> EstadisticasLineas:
+        return acumulado.fusionar(parcial)
+
+def procesar_bloque(etapas: Sequence[Etapa], bloque: Bloque) -> List[Any]:
+    """
+    Aplica todas las etapas a un bloque. Se ejecuta en los trabajadores.
+    """
+    return [etapa.procesar(bloque) for etapa in etapas]
+
+class SistemaFicheros:
+    """
+    Acceso a los ficheros locales. Las llamadas bloqueantes se ejecutan en hilos para no detener el
+    bucle de eventos mientras se espera al disco.
+    """
+    async def abrir(self, ruta: str):
+        return await asyncio.to_thread(open, ruta, 'rb')
+
+    async def leer(self, file, n: int) -> bytes:
+        return await asyncio.to_thread(file.read, n)
+
+    async def cerrar(self, file) -> None:
+        await asyncio.to_thread(file.close)
+
+class SistemaFicherosLento(SistemaFicheros):
+    """
+    Simula un almacenamiento lento sobre los ficheros locales: cada apertura y cada lectura esperan una
+    latencia fija y, si se indica, el tiempo de transferir los datos con un ancho de banda limitado por
+    fichero. Registra cuántos ficheros llegan a estar abiertos a la vez, para comprobar la concurrencia.
+    """
+    def __init__(self, latencia: float = 0.01, mb_por_segundo: Optional[float] = None):
+        self.latencia: float = latencia
+        self.mb_por_segundo: Optional[float] = mb_por_segundo
+        self.abiertos: int = 0
+        self.max_abiertos: int = 0
+        self.bytes_leidos: int = 0
+
+    async def abrir(self, ruta: str):
+        await asyncio.sleep(self.latencia)
+        file = await super().abrir(ruta)
+        self.abiertos += 1
+        self.max_abiertos = max(self.max_abiertos, self.abiertos)
+        return file
+
+    async def leer(self, file, n: int) -> bytes:
+        datos = await super().leer(file, n)
+        transferencia = len(datos) / (self.mb_por_segundo * (1 << 20)) if self.mb_por_segundo else 0.0
+        await asyncio.sleep(self.latencia + transferencia)
+        self.bytes_leidos += len(datos)
+        return datos
+
+    async def cerrar(self, file) -> None:
+        await super().cerrar(file)
+        self.abiertos -= 1
+
+@dataclass
+class _EstadoFichero:
+    acumulados: List[Any]
+    siguiente: int = 0  # Siguiente bloque que se puede fusionar
+    total: Optional[int] = None  # Número de bloques, cuando el lector termina
+    pendientes: Dict[int, List[Any]] = field(default_factory=dict)  # Bloques procesados fuera de orden
+
+class _FusionOrdenada:
+    """
+    Fusiona los parciales de cada fichero en orden de bloque y, cuando un fichero está completo y
+    todos los anteriores también, lo suma al resultado global. Así el resultado es el mismo que
+    procesando los ficheros uno detrás de otro, y solo se guardan los bloques que llegan adelantados.
+    """
+    def __init__(self, etapas: Sequence[Etapa]):
+        self.etapas: Sequence[Etapa] = etapas
+        self.globales: List[Any] = [etapa.inicial() for etapa in etapas]
+        self.ficheros: Dict[int, _EstadoFichero] = {}
+        self.siguiente_fichero: int = 0
+
+    def _estado(self, orden: int) -> _EstadoFichero:
+        if orden not in self.ficheros:
+            self.ficheros[orden] = _EstadoFichero([etapa.inicial() for etapa in self.etapas])
+        return self.ficheros[orden]
+
+    def anadir(self, orden: int, numero: int, parciales: List[Any]) -> None:
+        estado = self._estado(orden)
+        estado.pendientes[numero] = parciales
+        while estado.siguiente in estado.pendientes:
+            for i, (etapa, parcial) in enumerate(zip(self.etapas, estado.pendientes.pop(estado.siguiente))):
+                estado.acumulados[i] = etapa.fusionar(estado.acumulados[i], parcial)
+            estado.siguiente += 1
+        self._cerrar_ficheros()
+
+    def terminar_fichero(self, orden: int, total: int) -> None:
+        self._estado(orden).total = total
+        self._cerrar_ficheros()
+
+    def _cerrar_ficheros(self) -> None:
+        while True:
+            estado = self.ficheros.get(self.siguiente_fichero)
+            if estado is None or estado.total is None or estado.siguiente < estado.total:
+                return
+            for i, etapa in enumerate(self.etapas):
+                self.globales[i] = etapa.fusionar(self.globales[i], estado.acumulados[i])
+            del self.ficheros[self.siguiente_fichero]
+            self.siguiente_fichero += 1
+
+    def resultados(self) -> Dict[str, Any]:
+        return {etapa.nombre: etapa.resultado(acumulado) for etapa, acumulado in zip(self.etapas, self.globales)}
+
+class Pipeline:
+    """
+    Pipeline de lectura asíncrona y procesamiento en paralelo (ver la documentación del módulo).
+    """
+    def __init__(self, etapas: Sequence[Etapa], max_abiertos: int = 4, tam_cola: int = 8,
+                 tam_bloque: int = TAM_BLOQUE, trabajadores: Optional[int] = None, ejecutor: str = 'procesos',
+                 sistema: Optional[SistemaFicheros] = None):
+        nombres = [etapa.nombre for etapa in etapas]
+        if not etapas or len(set(nombres)) != len(nombres):
+            raise ValueError("Hace falta al menos una etapa y sus nombres no se pueden repetir.")
+        if max_abiertos < 1 or tam_cola < 1 or tam_bloque < 1:
+            raise ValueError("max_abiertos, tam_cola y tam_bloque tienen que ser positivos.")
+        if ejecutor not in EJECUTORES:
+            raise ValueError(f"Ejecutor desconocido: {ejecutor}. Opciones: {', '.join(EJECUTORES)}")
+        self.etapas: List[Etapa] = list(etapas)
+        self.max_abiertos: int = max_abiertos
+        self.tam_cola: int = tam_cola
+        self.tam_bloque: int = tam_bloque
+        self.trabajadores: int = trabajadores or os.cpu_count() or 1
+        self.ejecutor: str = ejecutor
+        self.sistema: SistemaFicheros = sistema or SistemaFicheros()
+        # Medidas de la última ejecución
+        self.bloques: int = 0
+        self.max_bloques_en_memoria: int = 0
+        self._en_memoria: int = 0
+
+    @staticmethod
+    def of(etapas: Sequence[Etapa], max_abiertos: int = 4, tam_cola: int = 8, tam_bloque: int = TAM_BLOQUE,
+           trabajadores: Optional[int] = None, ejecutor: str = 'procesos',
+           sistema: Optional[SistemaFicheros] = None) -> Pipeline:
+        """
+        Método de factoría para crear un pipeline.
+
+        :param etapas: Etapas que se aplican a cada bloque; sus nombres son las claves del resultado.
+        :param max_abiertos: Número máximo de ficheros que se leen a la vez.
+        :param tam_cola: Número máximo de bloques leídos que esperan a un trabajador.
+        :param tam_bloque: Número de bytes de cada lectura; los bloques se ajustan a líneas completas.
+        :param trabajadores: Número de trabajadores; por defecto, uno por núcleo.
+        :param ejecutor: 'procesos' o 'hilos'.
+        :param sistema: Acceso a los ficheros; por defecto, el sistema de ficheros local.
+        :return: Nuevo pipeline.
+        """
+        return Pipeline(etapas, max_abiertos, tam_cola, tam_bloque, trabajadores, ejecutor, sistema)
+
+    def _crear_ejecutor(self) -> Executor:
+        if self.ejecutor == 'procesos':
+            return ProcessPoolExecutor(max_workers=self.trabajadores)
+        return ThreadPoolExecutor(max_workers=self.trabajadores)
+
+    async def ejecutar(self, ficheros: Union[str, Iterable[str]]) -> Dict[str, Any]:
+        """
+        Procesa los ficheros con todas las etapas.
+
+        Como mucho hay en memoria tam_cola bloques en la cola, uno por trabajador en proceso y uno por
+        lector esperando a entrar en la cola, más los parciales que llegan antes que los anteriores.
+
+        :param ficheros: Fichero, directorio o colección de ficheros (UTF-8).
+        :return: Diccionario con el resultado de cada etapa por su nombre.
+        """
+        ficheros = ficheros_texto(ficheros)
+        cola: asyncio.Queue = asyncio.Queue(self.tam_cola)
+        semaforo = asyncio.Semaphore(self.max_abiertos)
+        fusion = _FusionOrdenada(self.etapas)
+        bucle = asyncio.get_running_loop()
+        procesar = partial(procesar_bloque, tuple(self.etapas))
+        self.bloques = self.max_bloques_en_memoria = self._en_memoria = 0
+
+        async def encolar(bloque: Bloque) -> None:
+            self._en_memoria += 1
+            self.max_bloques_en_memoria = max(self.max_bloques_en_memoria, self._en_memoria)
+            await cola.put(bloque)  # Si la cola está llena el lector espera: contrapresión
+
+        async def leer(orden: int, fichero: str) -> None:
+            numero, linea, pendiente = 0, 1, b""
+            async with semaforo:
+                file = await self.sistema.abrir(fichero)
+                try:
+                    while True:
+                        datos = await self.sistema.leer(file, self.tam_bloque)
+                        if not datos:
+                            break
+                        datos = pendiente + datos
+                        corte = datos.rfind(b'\n') + 1
+                        if corte == 0:  # Línea más larga que el bloque: se sigue leyendo
+                            pendiente = datos
+                            continue
+                        datos, pendiente = datos[:corte], datos[corte:]
+                        await encolar(Bloque(fichero, orden, numero, linea, datos))
+                        numero, linea = numero + 1, linea + contar_lineas(datos)
+                    if pendiente:
+                        await encolar(Bloque(fichero, orden, numero, linea, pendiente))
+                        numero += 1
+                finally:
+                    await self.sistema.cerrar(file)
+            fusion.terminar_fichero(orden, numero)
+
+        async def consumir(ejecutor: Executor) -> None:
+            while True:
+                bloque = await cola.get()
+                if bloque is None:
+                    return
+                parciales = await bucle.run_in_executor(ejecutor, procesar, bloque)
+                self._en_memoria -= 1
+                self.bloques += 1
+                fusion.anadir(bloque.orden_fichero, bloque.numero, parciales)
+
+        with self._crear_ejecutor() as ejecutor:
+            lectura = asyncio.ensure_future(asyncio.gather(*(leer(i, f) for i, f in enumerate(ficheros))))
+            consumidores = [asyncio.ensure_future(consumir(ejecutor)) for _ in range(self.trabajadores)]
+            hechas, pendientes = await asyncio.wait([lectura, *consumidores], return_when=asyncio.FIRST_COMPLETED)
+            if lectura not in hechas or lectura.exception() is not None:
+                # Un consumidor solo termina antes que los lectores si ha fallado
+                for tarea in pendientes:
+                    tarea.cancel()
+                await asyncio.gather(*pendientes, return_exceptions=True)
+                fallida = lectura if lectura in hechas else next(iter(hechas))
+                raise fallida.exception()
+            for _ in consumidores:
+                await cola.put(None)
+            await asyncio.gather(*consumidores)
+        return fusion.resultados()
+
+def procesar_ficheros(ficheros: Union[str, Iterable[str]], etapas: Sequence[Etapa], **opciones) -> Dict[str, Any]:
+    """
+    Ejecuta un pipeline sobre los ficheros desde código síncrono.
+
+    :param ficheros: Fichero, directorio o colección de ficheros (UTF-8).
+    :param etapas: Etapas a aplicar.
+    :param opciones: Parámetros de Pipeline (max_abiertos, tam_cola, tam_bloque, trabajadores, ejecutor, sistema).
+    :return: Diccionario con el resultado de cada etapa por su nombre.
+    """
+    return asyncio.run(Pipeline.of(etapas, **opciones).ejecutar(ficheros))
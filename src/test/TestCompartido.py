@@ -0,0 +1,74 @@
+"""
+Prueba del grafo en memoria compartida: el proceso principal publica la red social y varios procesos
+se adjuntan al mismo segmento y calculan caminos, que tienen que coincidir con los del grafo original.
+
+Uso (desde src/test): python TestCompartido.py
+"""
+from multiprocessing import get_context
+import heapq
+import os
+import random
+import sys
+
+GRAFOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'grafos')
+sys.path.insert(0, GRAFOS)
+
+from compartido import GrafoCompartido  # noqa: E402
+from recorridos import bfs  # noqa: E402
+from red_social import Red_social  # noqa: E402
+
+NUM_PROCESOS = 4
+
+def coste_minimo(red, inicio, destino):
+    distancias, monticulo, cerrados = {inicio: 0}, [(0, 0, inicio)], set()
+    orden = 0
+    while monticulo:
+        distancia, _, vertice = heapq.heappop(monticulo)
+        if vertice == destino:
+            return distancia
+        if vertice in cerrados:
+            continue
+        cerrados.add(vertice)
+        for vecino, relacion in red.adyacencias[vertice].items():
+            nueva = distancia + relacion.dias_activa
+            if nueva < distancias.get(vecino, float('inf')):
+                distancias[vecino] = nueva
+                orden += 1
+                heapq.heappush(monticulo, (nueva, orden, vecino))
+    return None
+
+def consultar(nombre, pares):
+    with GrafoCompartido.adjuntar(nombre) as grafo:
+        resultados = []
+        for origen, destino in pares:
+            camino_bfs = grafo.bfs(origen, destino)
+            camino_dfs = grafo.dfs(origen, destino)
+            coste, camino = grafo.dijkstra(origen, destino, 'dias_activa')
+            for c in (camino_bfs, camino_dfs, camino):
+                assert not c or all(grafo.edge_exists(a, b) for a, b in zip(c, c[1:]))
+            resultados.append((len(camino_bfs), bool(camino_dfs), coste))
+        return os.getpid(), resultados
+
+if __name__ == '__main__':
+    red = Red_social.parse(os.path.join(GRAFOS, 'usuarios.txt'), os.path.join(GRAFOS, 'relaciones.txt'))
+    usuarios = list(red.adyacencias)
+    random.seed(0)
+    pares = [tuple(random.sample(usuarios, 2)) for _ in range(40)]
+    esperados = [(len(bfs(red, o, d)), bool(bfs(red, o, d)), coste_minimo(red, o, d)) for o, d in pares]
+
+    with GrafoCompartido.crear(red) as compartido:
+        bloques = [pares[i::NUM_PROCESOS] for i in range(NUM_PROCESOS)]
+        with get_context('spawn').Pool(NUM_PROCESOS) as pool:
+            respuestas = pool.starmap(consultar, [(compartido.nombre, bloque) for bloque in bloques])
+        for i, (pid, resultados) in enumerate(respuestas):
+            assert pid != os.getpid()
+            assert resultados == esperados[i::NUM_PROCESOS], (resultados, esperados[i::NUM_PROCESOS])
+        nombre = compartido.nombre
+        print(f"{NUM_PROCESOS} procesos adjuntos a {nombre}: {len(pares)} consultas correctas.")
+
+    # Tras liberar el segmento ya no se puede adjuntar ningún proceso
+    try:
+        GrafoCompartido.adjuntar(nombre)
+        raise AssertionError("El segmento debería haberse borrado.")
+    except FileNotFoundError:
+        print("Segmento liberado.")
@@ -0,0 +1,95 @@
+"""
+Prueba de la instrumentación de grafos: los contadores de llamadas, muestras y consultas tienen que
+cuadrar con lo que se ha ejecutado, y al desactivarla todos los métodos y funciones tienen que volver
+a ser exactamente los originales (los heredados, sin quedar copiados en la subclase).
+
+Uso (desde src/test): python TestInstrumentacion.py
+"""
+import inspect
+import os
+import sys
+import tempfile
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SRC, 'grafos'))
+sys.path.append(os.path.join(SRC, 'defensa_3'))
+
+import recorridos  # noqa: E402
+from defensa_3 import RedGenica  # noqa: E402
+from instrumentacion import CLASES_GRAFO, OBJETIVOS_POR_DEFECTO, Instrumentacion, medir  # noqa: E402
+from red_social import Red_social  # noqa: E402
+
+USUARIOS = """45718832U,Carlos,Lopez,1995-01-04
+25143909I,Laura,Gomez,1994-04-07
+41378362N,Ana,Diaz,1996-06-11
+93645126S,Juan,Sanchez,1993-09-23
+"""
+RELACIONES = """45718832U,25143909I,5,30
+25143909I,41378362N,2,10
+41378362N,93645126S,7,1
+"""
+GENES = """BRCA1,supresor tumoral,12,17q21
+TP53,supresor tumoral,30,17p13.1
+KRAS,oncogen,9,12p12.1
+"""
+RED_GENES = """BRCA1,TP53,0.5
+TP53,KRAS,-0.3
+"""
+
+def escribir(directorio: str, nombre: str, texto: str) -> str:
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'w') as file:
+        file.write(texto)
+    return ruta
+
+def atributos(objetivos) -> list:
+    return [(propietario, nombre, inspect.getattr_static(propietario, nombre), nombre in propietario.__dict__)
+            for propietario, nombre in objetivos]
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        f_usuarios = escribir(directorio, 'usuarios.txt', USUARIOS)
+        f_relaciones = escribir(directorio, 'relaciones.txt', RELACIONES)
+        f_genes = escribir(directorio, 'genes.txt', GENES)
+        f_red_genes = escribir(directorio, 'red_genes.txt', RED_GENES)
+        # Además de los objetivos, los métodos heredados de las subclases no pueden quedar copiados en ellas
+        objetivos = OBJETIVOS_POR_DEFECTO + [(Red_social, 'successors'), (RedGenica, 'successors')]
+        antes = atributos(objetivos)
+
+        # Inactiva no cambia nada
+        instrumentacion = Instrumentacion.of(muestreo=2)
+        assert not instrumentacion.activa and atributos(objetivos) == antes
+
+        with instrumentacion as medida:
+            assert medida.activa
+            red = Red_social.parse(f_usuarios, f_relaciones)
+            genes = RedGenica.parse(f_genes, f_red_genes)
+            usuarios = list(red.adyacencias)
+            camino = recorridos.bfs(red, usuarios[0], usuarios[-1])
+            assert genes.edge_exists(genes.gen('BRCA1'), genes.gen('TP53'))
+        assert len(camino) == 4
+        medidas = medida.snapshot()
+        assert medidas['Red_social.parse']['llamadas'] == 1 and medidas['RedGenica.parse']['llamadas'] == 1
+        assert medidas['recorridos.bfs']['llamadas'] == medidas['recorridos.bfs']['muestras'] == 1
+        # Con muestreo 2 se mide una de cada dos llamadas
+        sucesores = medidas['Grafo.successors']
+        assert sucesores['llamadas'] >= 3 and sucesores['muestras'] == sucesores['llamadas'] // 2, sucesores
+        assert medidas['Grafo.edge_exists']['llamadas'] >= 1  # Llamada sobre la RedGenica
+        consulta = medidas['consultas']['bfs']
+        assert consulta['consultas'] == 1 and 1 <= consulta['vertices_expandidos'] <= len(usuarios)
+        assert consulta['aristas_relajadas'] >= consulta['vertices_expandidos']
+
+        # Al salir todo vuelve a ser lo original y los contadores se conservan hasta reiniciar
+        assert not medida.activa
+        assert atributos(objetivos) == antes
+        recorridos.bfs(red, usuarios[0], usuarios[-1])
+        assert medida.snapshot()['recorridos.bfs']['llamadas'] == 1
+        medida.reiniciar()
+        assert medida.snapshot()['recorridos.bfs']['llamadas'] == 0
+
+        # Objetivos repetidos se sustituyen una sola vez, así que también se restauran
+        dfs = recorridos.dfs
+        with medir(objetivos=[(recorridos, 'dfs'), (recorridos, 'dfs')]) as medida:
+            recorridos.dfs(red, usuarios[0], usuarios[-1])
+        assert recorridos.dfs is dfs and medida.snapshot()['recorridos.dfs']['llamadas'] == 1
+    print(f"Instrumentación de {len(CLASES_GRAFO)} clase(s) Grafo comprobada y restaurada.")
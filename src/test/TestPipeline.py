@@ -0,0 +1,48 @@
+"""
+Prueba del pipeline asíncrono sobre un almacenamiento lento simulado (SistemaFicherosLento): nunca
+puede haber más ficheros abiertos a la vez que el límite, y el conteo de palabras tiene que ser el
+mismo que el de contar_palabras fichero a fichero.
+
+Uso (desde src/test): python TestPipeline.py
+"""
+from collections import Counter
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funciones.frecuencias import contar_palabras  # noqa: E402
+from lecturas.pipeline import EtapaConteoPalabras, Pipeline, SistemaFicherosLento  # noqa: E402
+
+NUM_FICHEROS = 12
+LIMITE = 3
+PALABRAS = ("hola", "Mundo", "café", "python,", "datos.", "¿qué?", "grafo", "red")
+
+def escribir_ficheros(directorio: str) -> None:
+    rng = random.Random(0)
+    for i in range(NUM_FICHEROS):
+        with open(os.path.join(directorio, f"fichero{i}.txt"), 'w', encoding='utf-8') as file:
+            for _ in range(rng.randint(0, 400)):
+                file.write(" ".join(rng.choice(PALABRAS) for _ in range(rng.randint(0, 12))) + "\n")
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        escribir_ficheros(directorio)
+        esperado = Counter()
+        for nombre in os.listdir(directorio):
+            contar_palabras(os.path.join(directorio, nombre), contador=esperado)
+
+        for ejecutor in ('hilos', 'procesos'):
+            sistema = SistemaFicherosLento(latencia=0.002, mb_por_segundo=5)
+            pipeline = Pipeline.of([EtapaConteoPalabras()], max_abiertos=LIMITE, tam_cola=4, tam_bloque=512,
+                                   trabajadores=2, ejecutor=ejecutor, sistema=sistema)
+            resultados = asyncio.run(pipeline.ejecutar(directorio))
+            assert 1 <= sistema.max_abiertos <= LIMITE, sistema.max_abiertos
+            assert sistema.abiertos == 0
+            assert sistema.bytes_leidos == sum(os.path.getsize(os.path.join(directorio, nombre))
+                                               for nombre in os.listdir(directorio))
+            assert resultados["conteo_palabras"] == esperado
+            print(f"{ejecutor}: {pipeline.bloques} bloques, como mucho {sistema.max_abiertos} ficheros abiertos.")
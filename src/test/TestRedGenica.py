@@ -0,0 +1,53 @@
+"""
+Prueba de RedGenica.parse con localizaciones cromosómicas de todo tipo: rangos ('17q21-q22'),
+el cromosoma mitocondrial ('MT') o localizaciones desconocidas se tienen que poder cargar, y el
+índice por localización tiene que ordenar las bandas dígito a dígito.
+
+Uso (desde src/test): python TestRedGenica.py
+"""
+import os
+import sys
+import tempfile
+
+DEFENSA_3 = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'defensa_3')
+sys.path.insert(0, DEFENSA_3)
+
+from defensa_3 import RedGenica  # noqa: E402
+
+GENES = """BRCA1,supresor tumoral,12,17q21-q22
+TP53,supresor tumoral,30,17p13.1
+ERBB2,oncogen,5,17q12
+NF1,supresor tumoral,7,17q11.2
+MYO15A,oncogen,1,17p11.2
+RARA,oncogen,2,17q21.2
+GRB7,oncogen,0,17q3
+MTND1,oncogen,4,MT
+AR,oncogen,3,Xq12
+DMD,supresor tumoral,2,Xp21.2-p21.1
+KRAS,oncogen,9,unknown
+"""
+
+RELACIONES = """BRCA1,TP53,0.5
+MTND1,KRAS,-0.3
+DMD,AR,0.1
+"""
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directorio:
+        f_genes, f_relaciones = os.path.join(directorio, 'genes.txt'), os.path.join(directorio, 'red_genes.txt')
+        with open(f_genes, 'w') as file:
+            file.write(GENES)
+        with open(f_relaciones, 'w') as file:
+            file.write(RELACIONES)
+        red = RedGenica.parse(f_genes, f_relaciones)
+
+    assert len(red.vertices()) == len(GENES.splitlines())
+    assert red.edge_exists(red.gen('MTND1'), red.gen('KRAS'))
+
+    nombres = [gen.nombre for gen in red.genes_en_rango('17', '17')]
+    assert nombres == ['MYO15A', 'TP53', 'NF1', 'ERBB2', 'BRCA1', 'RARA', 'GRB7'], nombres
+    nombres = [gen.nombre for gen in red.genes_en_rango('17q2', '17q2')]
+    assert nombres == ['BRCA1', 'RARA'], nombres
+    nombres = [gen.nombre for gen in red.genes_en_rango('X')]
+    assert nombres == ['DMD', 'AR', 'MTND1', 'KRAS'], nombres  # Las localizaciones sin formato, al final
+    print(f"{len(red.vertices())} genes cargados y ordenados por localización.")
@@ -0,0 +1,32 @@
+"""
+Prueba del Tokenizador con texto Unicode descompuesto (NFD): con puntuación 'unicode' o plegado
+'casefold', "cafe" seguido del acento combinado U+0301 tiene que dar la misma palabra que "café" y las
+marcas combinadas no se borran como signos; los demás modos dejan el texto en la forma en que viene.
+
+Uso (desde src/test): python TestTokenizador.py
+"""
+import io
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from funciones.tokenizador import TOKENIZADOR_ESPACIOS, TOKENIZADOR_PALABRAS, TOKENIZADOR_UNICODE, Tokenizador  # noqa: E402
+
+CAFE_NFD = "cafe\u0301"  # "cafe" + acento agudo combinado
+CAFE_NFC = "caf\u00e9"  # "café" con la é compuesta
+
+if __name__ == '__main__':
+    texto = f"¿{CAFE_NFD.upper()}? {CAFE_NFD}, «{CAFE_NFC}» x\u0301 नमस्ते"
+    assert TOKENIZADOR_UNICODE.tokenizar(texto) == [CAFE_NFC, CAFE_NFC, CAFE_NFC, "x\u0301", "नमस्ते"]
+    assert Tokenizador.of('casefold', 'unicode').tokenizar(CAFE_NFD) == [CAFE_NFC]
+    assert Tokenizador.of('casefold', None).tokenizar(CAFE_NFD) == [CAFE_NFC]
+    # El preajuste de contar_palabras (str.lower y string.punctuation) no iguala NFD y NFC
+    assert TOKENIZADOR_PALABRAS.tokenizar(texto) == ["¿" + CAFE_NFD, CAFE_NFD, "«" + CAFE_NFC + "»", "x\u0301", "नमस्ते"]
+    # Sin plegado ni puntuación las palabras quedan tal cual, como con str.split()
+    assert TOKENIZADOR_ESPACIOS.tokenizar(texto) == texto.split()
+    # Por bloques, aunque el corte caiga justo antes del acento combinado
+    for tam_bloque in (1, 3, 4, 5, 64):
+        tokenizador = Tokenizador.of('minusculas', 'unicode', tam_bloque)
+        assert list(tokenizador.tokens(io.StringIO(texto))) == TOKENIZADOR_UNICODE.tokenizar(texto), tam_bloque
+    print("Texto NFD y marcas combinadas tokenizados igual que el texto compuesto.")